@@ -0,0 +1,84 @@
+"""Scalar and batched numeric kernels for the behavior state machine."""
+from typing import Callable, Tuple
+from concurrent.futures import Executor
+import math
+import numpy as np
+
+# pursue_step outcomes
+PURSUE_MOVE = 0
+PURSUE_LOST = 1
+PURSUE_ATTACK = 2
+
+PursueStep = Callable[[float, float, float, float, float], Tuple[float, float, float, int]]
+
+def make_pursue_step(out2: float, att2: float, speed: float) -> PursueStep:
+    """
+    Build a pursuit step specialized for one behavior type's parameters.
+
+    Args:
+        out2: Squared distance at which the target is lost
+        att2: Squared attack range
+        speed: Movement speed
+
+    Returns:
+        step(px, py, tx, ty, dt) -> (new_x, new_y, dist, outcome), where dist
+        is the distance before moving, or infinity once the target is lost
+    """
+    hypot = math.hypot
+    inf = math.inf
+
+    def step(px: float, py: float, tx: float, ty: float, dt: float) -> Tuple[float, float, float, int]:
+        dx = tx - px
+        dy = ty - py
+        d2 = dx * dx + dy * dy
+        if d2 > out2:
+            return px, py, inf, PURSUE_LOST
+        dist = hypot(dx, dy)
+        if d2 <= att2:
+            return px, py, dist, PURSUE_ATTACK
+        scale = speed * dt / dist
+        return px + dx * scale, py + dy * scale, dist, PURSUE_MOVE
+
+    return step
+
+def wander_step(px: float, py: float, dir_x: float, dir_y: float,
+                speed: float, dt: float) -> Tuple[float, float]:
+    """Advance a wanderer one tick along its heading."""
+    step = speed * dt
+    return px + dir_x * step, py + dir_y * step
+
+def pursue_batch(px: np.ndarray, py: np.ndarray, tx: np.ndarray, ty: np.ndarray,
+                 has_target: np.ndarray, speed: np.ndarray, out2: np.ndarray,
+                 att2: np.ndarray, dt: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Advance many pursuers one tick with array operations.
+
+    Returns:
+        (new_x, new_y, dist, outcome) arrays; pursuers without a target are lost
+    """
+    dx = np.where(has_target, tx - px, 0.0)
+    dy = np.where(has_target, ty - py, 0.0)
+    d2 = dx * dx + dy * dy
+    
+    outcome = np.where(d2 > out2, PURSUE_LOST,
+                       np.where(d2 <= att2, PURSUE_ATTACK, PURSUE_MOVE))
+    outcome[~has_target] = PURSUE_LOST
+    
+    # Step movers along the normalized direction to their target
+    dist = np.hypot(dx, dy)
+    step = np.divide(speed * dt, dist, out=np.zeros(len(px)), where=dist > 0)
+    return px + dx * step, py + dy * step, dist, outcome
+
+def pursue_batch_parallel(executor: Executor, chunks: int, px: np.ndarray, py: np.ndarray,
+                          tx: np.ndarray, ty: np.ndarray, has_target: np.ndarray,
+                          speed: np.ndarray, out2: np.ndarray, att2: np.ndarray,
+                          dt: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Run pursue_batch over contiguous slices on an executor and stitch the results."""
+    bounds = np.linspace(0, len(px), chunks + 1).astype(int)
+    futures = [
+        executor.submit(pursue_batch, px[a:b], py[a:b], tx[a:b], ty[a:b], has_target[a:b],
+                        speed[a:b], out2[a:b], att2[a:b], dt)
+        for a, b in zip(bounds[:-1], bounds[1:])
+    ]
+    parts = [future.result() for future in futures]
+    return tuple(np.concatenate([part[k] for part in parts]) for k in range(4))
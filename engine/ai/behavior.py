@@ -1,28 +1,68 @@
 """NPC behavior system implementation."""
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+from typing import Dict, Any, Callable, Mapping, Optional, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import math
 import logging
+import os
+import random
+import numpy as np
 from ..ecs.entity import Entity
-from ..ecs.component import AI, Position, Physical
+from ..ecs.component import AI, Position, BehaviorStateId
 from ..config.config_manager import ConfigManager
-import random
-from typing import Tuple
+from ._kernels import (make_pursue_step, wander_step, pursue_batch, pursue_batch_parallel,
+                       PURSUE_MOVE, PURSUE_LOST, PURSUE_ATTACK)
+
+__all__ = [
+    'BehaviorContext', 'BehaviorState', 'IdleState', 'WanderingState',
+    'PursuingState', 'AttackingState', 'BehaviorSystem'
+]
 
-# Set up logging with more verbose output
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Behavior types that look for targets while idle
+_DETECTING_TYPES = frozenset(('hunt', 'guard'))
+
+# Pursuing groups at least this large are advanced with array operations
+BATCH_MIN_SIZE = 32
+
+# Batches at least this large split their array math across worker threads
+PARALLEL_MIN_SIZE = 8192
+
+# Unit headings for wandering, indexed by a 10-bit random sample
+_HEADING_BITS = 10
+_HEADING_COS = tuple(math.cos(2 * math.pi * i / (1 << _HEADING_BITS)) for i in range(1 << _HEADING_BITS))
+_HEADING_SIN = tuple(math.sin(2 * math.pi * i / (1 << _HEADING_BITS)) for i in range(1 << _HEADING_BITS))
+
 class BehaviorContext:
-    """Context data for behavior execution."""
-    entity: Entity
-    world: Any
-    dt: float
-    config: Dict[str, Any]
+    """Context data for behavior execution, reused across ticks for one entity."""
+    __slots__ = ('entity', 'world', 'dt', 'config', 'params', 'speed',
+                 'detection_range', 'det2', 'att2', 'out2',
+                 'max_idle_time', 'max_wander_time', 'attack_cooldown',
+                 'frame', 'range_check_interval', 'pursue')
+    
+    def __init__(self, entity: Entity, world: Any, dt: float, config: Dict[str, Any],
+                 pursue: Optional[Callable] = None):
+        self.entity = entity
+        self.world = world
+        self.dt = dt
+        self.config = config
+        
+        # Flatten the hot parameters so states avoid nested dict lookups
+        params = config['parameters']
+        self.params = params
+        self.speed = params.get('speed', 0.0)
+        self.detection_range = params.get('detection_range', 0.0)
+        self.det2 = self.detection_range ** 2
+        self.att2 = params.get('attack_range', 1.5) ** 2
+        self.out2 = (self.detection_range * 1.5) ** 2
+        self.max_idle_time = params.get('max_idle_time', float('inf'))
+        self.max_wander_time = params.get('max_wander_time', float('inf'))
+        self.attack_cooldown = params.get('attack_cooldown', 0.0)
+        self.range_check_interval = params.get('range_check_interval', 2)
+        self.frame = 0
+        
+        # Pursuit step with this behavior's thresholds baked in
+        self.pursue = pursue or make_pursue_step(self.out2, self.att2, self.speed)
     
 class BehaviorState:
     """Base class for behavior states."""
@@ -37,10 +77,10 @@ class BehaviorState:
         """Called when exiting this state."""
         pass
         
-    def update(self) -> Optional[str]:
+    def update(self) -> Optional[BehaviorStateId]:
         """
         Update this state.
-        Returns: Name of next state if transition should occur, None otherwise.
+        Returns: Id of next state if transition should occur, None otherwise.
         """
         return None
 
@@ -49,63 +89,66 @@ class IdleState(BehaviorState):
     
     def enter(self) -> None:
         ai = self.context.entity.get_component(AI)
-        ai.state['idle_time'] = 0.0
-        ai.state['current_state'] = 'idle'
+        ai.state.idle_time = 0.0
+        ai.state.current_state = BehaviorStateId.IDLE
         
         # Clear target state
-        ai.state['target_id'] = None
-        ai.state['target_distance'] = float('inf')
-        ai.state['target_detected'] = False
+        ai.state.target_id = None
+        ai.state.target_distance = float('inf')
+        ai.state.target_detected = False
         
-        logger.debug(f"Entity {self.context.entity.id} ({ai.behavior_type}) entering idle state")
+        logger.debug("Entity %s (%s) entering idle state", self.context.entity.id, ai.behavior_type)
         
-    def update(self) -> Optional[str]:
-        ai = self.context.entity.get_component(AI)
-        ai.state['idle_time'] += self.context.dt
+    def update(self) -> Optional[BehaviorStateId]:
+        ctx = self.context
+        entity = ctx.entity
+        ai = entity.get_component(AI)
+        state = ai.state
+        state.idle_time += ctx.dt
         
         # Check transitions based on behavior type
-        if ai.behavior_type in ['hunt', 'guard']:
+        if ai.behavior_type in _DETECTING_TYPES:
             # Check for nearby targets
-            logger.debug(f"Entity {self.context.entity.id} ({ai.behavior_type}) checking for targets")
-            if self._detect_targets():
-                logger.debug(f"Entity {self.context.entity.id} ({ai.behavior_type}) detected target")
-                return 'pursuing'
+            if self._detect_targets(ai, entity.get_component(Position)):
+                logger.debug("Entity %s (%s) detected target", entity.id, ai.behavior_type)
+                return BehaviorStateId.PURSUING
         
         # Check for wandering transition
-        if ai.state['idle_time'] > self.context.config['parameters']['max_idle_time']:
-            logger.debug(f"Entity {self.context.entity.id} ({ai.behavior_type}) idle time exceeded")
-            return 'wandering'
+        if state.idle_time > ctx.max_idle_time:
+            logger.debug("Entity %s (%s) idle time exceeded", entity.id, ai.behavior_type)
+            return BehaviorStateId.WANDERING
                 
         return None
         
-    def _detect_targets(self) -> bool:
-        ai = self.context.entity.get_component(AI)
-        pos = self.context.entity.get_component(Position)
-        detection_range = self.context.config['parameters']['detection_range']
+    def _detect_targets(self, ai: AI, pos: Position) -> bool:
+        ctx = self.context
+        entity_id = ctx.entity.id
+        detection_range = ctx.detection_range
+        state = ai.state
         
-        logger.debug(f"Entity {self.context.entity.id} ({ai.behavior_type}) checking for targets. Range: {detection_range}")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Entity %s (%s) checking for targets. Range: %s",
+                         entity_id, ai.behavior_type, detection_range)
         
-        # Simple target detection logic - can be expanded
-        for target in self.context.world.get_entities_with_components(Position, Physical):
-            if target.id == self.context.entity.id:
-                continue
-                
-            target_pos = target.get_component(Position)
-            dist = math.sqrt((target_pos.x - pos.x)**2 + (target_pos.y - pos.y)**2)
-            
-            logger.debug(f"  - Checking target {target.id} at distance {dist}")
-            
-            if dist <= detection_range:
-                logger.debug(f"  - Target {target.id} in range!")
-                ai.state['target_id'] = target.id
-                ai.state['target_distance'] = dist
-                ai.state['target_detected'] = True
-                return True
+        # Nearest physical entity in range, computed over the world's SoA position arrays
+        hit = ctx.world.position_index.query_radius(
+            pos.x, pos.y, detection_range, exclude_id=entity_id)
+        
+        if hit is not None:
+            target_id, dist = hit
+            if debug:
+                logger.debug("  - Target %s in range at distance %s!", target_id, dist)
+            state.target_id = target_id
+            state.target_distance = dist
+            state.target_detected = True
+            return True
                 
-        logger.debug(f"  - No targets found in range")
-        ai.state['target_id'] = None
-        ai.state['target_distance'] = float('inf')
-        ai.state['target_detected'] = False
+        if debug:
+            logger.debug("  - No targets found in range")
+        state.target_id = None
+        state.target_distance = float('inf')
+        state.target_detected = False
         return False
 
 class WanderingState(BehaviorState):
@@ -113,92 +156,89 @@ class WanderingState(BehaviorState):
     
     def enter(self) -> None:
         ai = self.context.entity.get_component(AI)
-        ai.state['wander_time'] = 0.0
-        ai.state['wander_direction'] = self._get_random_direction()
-        ai.state['current_state'] = 'wandering'
+        ai.state.wander_time = 0.0
+        ai.state.wander_dx, ai.state.wander_dy = self._get_random_direction()
+        ai.state.current_state = BehaviorStateId.WANDERING
         
-    def update(self) -> Optional[str]:
-        ai = self.context.entity.get_component(AI)
-        pos = self.context.entity.get_component(Position)
+    def update(self) -> Optional[BehaviorStateId]:
+        ctx = self.context
+        entity = ctx.entity
+        dt = ctx.dt
+        ai = entity.get_component(AI)
+        state = ai.state
+        pos = entity.get_component(Position)
         
         # Update position based on wander direction
-        speed = self.context.config['parameters']['speed']
-        dx, dy = ai.state['wander_direction']
-        pos.x += dx * speed * self.context.dt
-        pos.y += dy * speed * self.context.dt
+        pos.x, pos.y = wander_step(pos.x, pos.y, state.wander_dx, state.wander_dy, ctx.speed, dt)
+        ctx.world.position_index.update(entity.id, pos.x, pos.y)
         
         # Update wander time
-        ai.state['wander_time'] += self.context.dt
+        state.wander_time += dt
         
         # Check for state transition
-        if ai.state['wander_time'] > self.context.config['parameters']['max_wander_time']:
-            logger.debug(f"Entity {self.context.entity.id} ({ai.behavior_type}) wander time exceeded")
-            return 'idle'
+        if state.wander_time > ctx.max_wander_time:
+            logger.debug("Entity %s (%s) wander time exceeded", entity.id, ai.behavior_type)
+            return BehaviorStateId.IDLE
             
         return None
         
     def _get_random_direction(self) -> Tuple[float, float]:
-        angle = random.random() * 2 * math.pi
-        return (math.cos(angle), math.sin(angle))
+        i = random.getrandbits(_HEADING_BITS)
+        return (_HEADING_COS[i], _HEADING_SIN[i])
 
 class PursuingState(BehaviorState):
     """State where entity pursues a target."""
     
     def enter(self) -> None:
         ai = self.context.entity.get_component(AI)
-        ai.state['current_state'] = 'pursuing'
-        logger.debug(f"Entity {self.context.entity.id} ({ai.behavior_type}) entering pursuing state")
+        ai.state.current_state = BehaviorStateId.PURSUING
+        logger.debug("Entity %s (%s) entering pursuing state", self.context.entity.id, ai.behavior_type)
         
-    def update(self) -> Optional[str]:
-        ai = self.context.entity.get_component(AI)
-        pos = self.context.entity.get_component(Position)
+    def update(self) -> Optional[BehaviorStateId]:
+        ctx = self.context
+        entity = ctx.entity
+        ai = entity.get_component(AI)
+        state = ai.state
         
         # Get target
-        target_id = ai.state.get('target_id')
+        target_id = state.target_id
         if target_id is None:
-            logger.debug(f"Entity {self.context.entity.id} ({ai.behavior_type}) has no target")
-            return 'idle'
-            
-        target = self.context.world.get_entity(target_id)
-        if not target:
-            logger.debug(f"Entity {self.context.entity.id} ({ai.behavior_type}) target {target_id} not found")
-            return 'idle'
+            logger.debug("Entity %s (%s) has no target", entity.id, ai.behavior_type)
+            return BehaviorStateId.IDLE
             
-        target_pos = target.get_component(Position)
-        if not target_pos:
-            logger.debug(f"Entity {self.context.entity.id} ({ai.behavior_type}) target {target_id} has no position")
-            return 'idle'
+        target_xy = ctx.world.pos_xy(target_id)
+        if target_xy is None:
+            logger.debug("Entity %s (%s) target %s not found", entity.id, ai.behavior_type, target_id)
+            return BehaviorStateId.IDLE
+        target_x, target_y = target_xy
             
-        # Calculate distance to target
-        dist = math.sqrt((target_pos.x - pos.x)**2 + (target_pos.y - pos.y)**2)
-        ai.state['target_distance'] = dist
-        
-        logger.debug(f"Entity {self.context.entity.id} ({ai.behavior_type}) distance to target: {dist}")
-        
-        # Check for state transitions
-        detection_range = self.context.config['parameters']['detection_range']
-        attack_range = self.context.config['parameters'].get('attack_range', 1.5)
+        # Compare distances in squared space; sqrt is only needed to steer
+        pos = entity.get_component(Position)
+        new_x, new_y, dist, outcome = ctx.pursue(pos.x, pos.y, target_x, target_y, ctx.dt)
         
         # If target is too far away, go back to idle
-        if dist > detection_range * 1.5:
-            logger.debug(f"Entity {self.context.entity.id} ({ai.behavior_type}) target out of range")
+        if outcome == PURSUE_LOST:
+            logger.debug("Entity %s (%s) target out of range", entity.id, ai.behavior_type)
             # Clear target state
-            ai.state['target_id'] = None
-            ai.state['target_distance'] = float('inf')
-            ai.state['target_detected'] = False
-            return 'idle'
+            state.target_id = None
+            state.target_distance = float('inf')
+            state.target_detected = False
+            return BehaviorStateId.IDLE
             
+        state.target_distance = dist
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Entity %s (%s) distance to target: %s",
+                         entity.id, ai.behavior_type, dist)
+        
         # If target is in attack range, switch to attacking
-        if dist <= attack_range:
-            logger.debug(f"Entity {self.context.entity.id} ({ai.behavior_type}) target in attack range")
-            return 'attacking'
+        if outcome == PURSUE_ATTACK:
+            state.target_frame = ctx.frame
+            logger.debug("Entity %s (%s) target in attack range", entity.id, ai.behavior_type)
+            return BehaviorStateId.ATTACKING
             
         # Move towards target
-        speed = self.context.config['parameters']['speed']
-        dx = (target_pos.x - pos.x) / dist
-        dy = (target_pos.y - pos.y) / dist
-        pos.x += dx * speed * self.context.dt
-        pos.y += dy * speed * self.context.dt
+        pos.x, pos.y = new_x, new_y
+        ctx.world.position_index.update(entity.id, pos.x, pos.y)
         
         return None
 
@@ -207,49 +247,50 @@ class AttackingState(BehaviorState):
     
     def enter(self) -> None:
         ai = self.context.entity.get_component(AI)
-        ai.state['attack_cooldown'] = 0.0
-        ai.state['current_state'] = 'attacking'
-        logger.debug(f"Entity {self.context.entity.id} ({ai.behavior_type}) entering attacking state")
+        ai.state.attack_cooldown = 0.0
+        ai.state.current_state = BehaviorStateId.ATTACKING
+        logger.debug("Entity %s (%s) entering attacking state", self.context.entity.id, ai.behavior_type)
         
-    def update(self) -> Optional[str]:
-        ai = self.context.entity.get_component(AI)
+    def update(self) -> Optional[BehaviorStateId]:
+        ctx = self.context
+        entity = ctx.entity
+        ai = entity.get_component(AI)
+        state = ai.state
         
         # Get target
-        target_id = ai.state.get('target_id')
+        target_id = state.target_id
         if target_id is None:
-            logger.debug(f"Entity {self.context.entity.id} ({ai.behavior_type}) has no target")
-            return 'idle'
+            logger.debug("Entity %s (%s) has no target", entity.id, ai.behavior_type)
+            return BehaviorStateId.IDLE
             
-        target = self.context.world.get_entity(target_id)
-        if not target:
-            logger.debug(f"Entity {self.context.entity.id} ({ai.behavior_type}) target {target_id} not found")
-            return 'idle'
+        # The attacker stands still, so the range is only re-verified every
+        # range_check_interval frames; target_distance keeps the last
+        # verified value, which is within attack range
+        frame = ctx.frame
+        if frame - state.target_frame >= ctx.range_check_interval:
+            target_xy = ctx.world.pos_xy(target_id)
+            if target_xy is None:
+                logger.debug("Entity %s (%s) target %s not found", entity.id, ai.behavior_type, target_id)
+                return BehaviorStateId.IDLE
+            target_x, target_y = target_xy
             
-        target_pos = target.get_component(Position)
-        if not target_pos:
-            logger.debug(f"Entity {self.context.entity.id} ({ai.behavior_type}) target {target_id} has no position")
-            return 'idle'
-            
-        # Calculate distance to target
-        pos = self.context.entity.get_component(Position)
-        dist = math.sqrt((target_pos.x - pos.x)**2 + (target_pos.y - pos.y)**2)
-        ai.state['target_distance'] = dist
-        
-        logger.debug(f"Entity {self.context.entity.id} ({ai.behavior_type}) distance to target: {dist}")
-        
-        # Check if target is still in range
-        attack_range = self.context.config['parameters'].get('attack_range', 1.5)
-        if dist > attack_range:
-            logger.debug(f"Entity {self.context.entity.id} ({ai.behavior_type}) target out of attack range")
-            return 'pursuing'
+            pos = entity.get_component(Position)
+            dx = target_x - pos.x
+            dy = target_y - pos.y
+            if dx * dx + dy * dy > ctx.att2:
+                state.target_distance = math.hypot(dx, dy)
+                logger.debug("Entity %s (%s) target out of attack range", entity.id, ai.behavior_type)
+                return BehaviorStateId.PURSUING
+            state.target_frame = frame
             
         # Update attack cooldown
-        ai.state['attack_cooldown'] -= self.context.dt
+        cooldown = state.attack_cooldown - ctx.dt
         
         # Perform attack if cooldown is ready
-        if ai.state['attack_cooldown'] <= 0:
+        if cooldown <= 0:
             self._perform_attack()
-            ai.state['attack_cooldown'] = self.context.config['parameters']['attack_cooldown']
+            cooldown = ctx.attack_cooldown
+        state.attack_cooldown = cooldown
             
         return None
         
@@ -257,6 +298,9 @@ class AttackingState(BehaviorState):
         # Attack logic will be implemented later
         pass
 
+# Indexed by BehaviorStateId
+_STATE_CTORS = (IdleState, WanderingState, PursuingState, AttackingState)
+
 class BehaviorSystem:
     """System for managing entity behaviors."""
     
@@ -264,63 +308,201 @@ class BehaviorSystem:
         self.world = world
         self.config_manager = config_manager
         self.entity_states: Dict[int, BehaviorState] = {}
-        
+        self._state_pool: Dict[int, List[Optional[BehaviorState]]] = {}
+        self._contexts: Dict[int, BehaviorContext] = {}
+        self._config_cache: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._pursue_steps: Dict[str, Callable] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tracked_entities: Optional[List[Entity]] = None
+        self.frame = 0
+
+        # Size grid cells to the shortest detection range; longer-range queries
+        # just cover more cells
+        ranges = [
+            cfg['parameters']['detection_range']
+            for cfg in config_manager.behavior_configs.values()
+            if isinstance(cfg, Mapping) and 'detection_range' in cfg.get('parameters', {})
+        ]
+        if ranges:
+            self.world.position_index.set_cell_size(min(ranges))
+
     def update(self, dt: float) -> None:
         """Update all entity behaviors."""
+        self.frame += 1
+        
+        # Pick up positions changed outside the behavior system since last tick
+        self.world.position_index.refresh()
         entities = self.world.get_entities_with_components(AI, Position)
+        # The query result is a shared list that is only replaced when
+        # membership changes; drop what is kept for entities that left
+        if entities is not self._tracked_entities:
+            self._forget_missing(entities)
+            self._tracked_entities = entities
         
+        active = []
         for entity in entities:
             ai = entity.get_component(AI)
             
             # Get behavior configuration
-            config = self.config_manager.get_behavior_config(ai.behavior_type)
+            config = self._behavior_config(ai.behavior_type)
             if not config:
-                logger.warning(f"No behavior config found for type: {ai.behavior_type}")
+                logger.warning("No behavior config found for type: %s", ai.behavior_type)
                 continue
                 
-            # Create context
-            context = BehaviorContext(
-                entity=entity,
-                world=self.world,
-                dt=dt,
-                config=config
-            )
+            # Reuse the entity's context unless its behavior config changed
+            context = self._contexts.get(entity.id)
+            if context is None or context.config is not config or context.entity is not entity:
+                # Specialized pursuit steps are built once per behavior type
+                pursue = self._pursue_steps.get(ai.behavior_type)
+                context = BehaviorContext(
+                    entity=entity,
+                    world=self.world,
+                    dt=dt,
+                    config=config,
+                    pursue=pursue
+                )
+                if pursue is None:
+                    self._pursue_steps[ai.behavior_type] = context.pursue
+                context.frame = self.frame
+                self._contexts[entity.id] = context
+                current_state = self.entity_states.get(entity.id)
+                if current_state is not None:
+                    current_state.context = context
+            else:
+                context.dt = dt
+                context.frame = self.frame
             
             # Get or create state
             current_state = self.entity_states.get(entity.id)
             if current_state is None:
-                logger.debug(f"Creating initial state for entity {entity.id} ({ai.behavior_type})")
-                current_state = IdleState(context)
+                logger.debug("Creating initial state for entity %s (%s)", entity.id, ai.behavior_type)
+                current_state = self._create_state(BehaviorStateId.IDLE, context)
                 current_state.enter()
                 self.entity_states[entity.id] = current_state
                 
+            active.append((entity, ai, context, current_state))
+            
+        # Large pursuing groups are advanced together against this tick's positions
+        pursuing = [item for item in active if type(item[3]) is PursuingState]
+        if len(pursuing) >= BATCH_MIN_SIZE:
+            self._update_pursuing_batch(pursuing, dt)
+            active = [item for item in active if type(item[3]) is not PursuingState]
+            
+        for entity, ai, context, current_state in active:
             # Update state
             next_state = current_state.update()
-            if next_state:
-                logger.debug(f"Entity {entity.id} ({ai.behavior_type}) transitioning from {current_state.__class__.__name__} to {next_state}")
-                
-                # First exit current state
-                current_state.exit()
+            if next_state is not None:
+                self._transition(entity, ai, current_state, next_state, context)
                 
-                # Create and enter new state
-                new_state = self._create_state(next_state, context)
-                new_state.enter()
-                
-                # Update entity state
-                ai.state['current_state'] = next_state
-                
-                # Store new state
-                self.entity_states[entity.id] = new_state
+    def shutdown(self) -> None:
+        """Stop the worker threads used for very large pursuit batches, if any were started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            
+    def _forget_missing(self, entities: List[Entity]) -> None:
+        """Release the contexts and states of entities no longer in the query."""
+        live = {entity.id for entity in entities}
+        for cache in (self._contexts, self.entity_states, self._state_pool):
+            for entity_id in [entity_id for entity_id in cache if entity_id not in live]:
+                del cache[entity_id]
                 
-                # Log state change
-                logger.debug(f"Entity {entity.id} ({ai.behavior_type}) state updated to {next_state}")
+    def _behavior_config(self, behavior_type: str) -> Optional[Dict[str, Any]]:
+        """Get a behavior configuration, looking it up only once per type."""
+        try:
+            return self._config_cache[behavior_type]
+        except KeyError:
+            config = self.config_manager.get_behavior_config(behavior_type)
+            self._config_cache[behavior_type] = config
+            return config
+            
+    def _transition(self, entity: Entity, ai: AI, current_state: BehaviorState,
+                    next_state: BehaviorStateId, context: BehaviorContext) -> None:
+        """Move an entity from its current state into the named state."""
+        logger.debug("Entity %s (%s) transitioning from %s to %s",
+                     entity.id, ai.behavior_type, current_state.__class__.__name__, next_state)
+        
+        # First exit current state
+        current_state.exit()
+        
+        # Create and enter new state
+        new_state = self._create_state(next_state, context)
+        new_state.enter()
+        
+        # Update entity state
+        ai.state.current_state = next_state
+        
+        # Store new state
+        self.entity_states[entity.id] = new_state
+        
+        # Log state change
+        logger.debug("Entity %s (%s) state updated to %s", entity.id, ai.behavior_type, next_state)
+        
+    def _update_pursuing_batch(self, group: List[Tuple[Entity, AI, BehaviorContext, BehaviorState]],
+                               dt: float) -> None:
+        """Advance every pursuing entity in one set of array operations."""
+        index = self.world.position_index
+        n = len(group)
+        
+        # Gather pursuer positions, target rows and per-entity parameters;
+        # pursuers are read from their own components, since the index only
+        # keeps float32 copies and the results are written back at full precision
+        positions = [entity.get_component(Position) for entity, _, _, _ in group]
+        px = np.fromiter((pos.x for pos in positions), dtype=np.float64, count=n)
+        py = np.fromiter((pos.y for pos in positions), dtype=np.float64, count=n)
+        target_rows = index.rows([ai.state.target_id for _, ai, _, _ in group])
+        speed = np.fromiter((ctx.speed for _, _, ctx, _ in group), dtype=np.float64, count=n)
+        out2 = np.fromiter((ctx.out2 for _, _, ctx, _ in group), dtype=np.float64, count=n)
+        att2 = np.fromiter((ctx.att2 for _, _, ctx, _ in group), dtype=np.float64, count=n)
+        
+        has_target = target_rows >= 0
+        tx = index.xs[target_rows]
+        ty = index.ys[target_rows]
+        
+        # NumPy releases the GIL inside ufuncs, so very large crowds are
+        # split across threads; the scatter below stays on this thread
+        if n >= PARALLEL_MIN_SIZE:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor()
+            new_x, new_y, dist, outcome = pursue_batch_parallel(
+                self._executor, os.cpu_count() or 1,
+                px, py, tx, ty, has_target, speed, out2, att2, dt)
+        else:
+            new_x, new_y, dist, outcome = pursue_batch(
+                px, py, tx, ty, has_target, speed, out2, att2, dt)
+        new_x = new_x.tolist()
+        new_y = new_y.tolist()
+        dist = dist.tolist()
+        
+        # Scatter results back; only transitions pay for exit/enter
+        for i, result in enumerate(outcome.tolist()):
+            entity, ai, context, state = group[i]
+            if result == PURSUE_MOVE:
+                pos = positions[i]
+                pos.x = new_x[i]
+                pos.y = new_y[i]
+                index.update(entity.id, pos.x, pos.y)
+                ai.state.target_distance = dist[i]
+            elif result == PURSUE_ATTACK:
+                ai.state.target_distance = dist[i]
+                ai.state.target_frame = context.frame
+                self._transition(entity, ai, state, BehaviorStateId.ATTACKING, context)
+            else:
+                ai.state.target_id = None
+                ai.state.target_distance = float('inf')
+                ai.state.target_detected = False
+                self._transition(entity, ai, state, BehaviorStateId.IDLE, context)
                 
-    def _create_state(self, state_name: str, context: BehaviorContext) -> BehaviorState:
-        """Create a new behavior state instance."""
-        states = {
-            'idle': IdleState,
-            'wandering': WanderingState,
-            'pursuing': PursuingState,
-            'attacking': AttackingState
-        }
-        return states[state_name](context)
+    def _create_state(self, state_id: BehaviorStateId, context: BehaviorContext) -> BehaviorState:
+        """Get the entity's pooled instance of a behavior state, creating it once."""
+        pool = self._state_pool.get(context.entity.id)
+        if pool is None:
+            pool = self._state_pool[context.entity.id] = [None] * len(_STATE_CTORS)
+            
+        state = pool[state_id]
+        if state is None:
+            state = pool[state_id] = _STATE_CTORS[state_id](context)
+        else:
+            # enter() resets everything a state keeps, so reuse is safe
+            state.context = context
+        return state
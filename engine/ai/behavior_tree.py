@@ -1,6 +1,6 @@
 """Behavior Tree implementation for advanced AI decision making."""
 from typing import Dict, Any, Optional, List, Callable
-from enum import Enum
+from enum import IntEnum
 import logging
 from dataclasses import dataclass, field
 from ..ecs.entity import Entity
@@ -8,13 +8,18 @@ from ..ecs.component import AI, Position
 
 logger = logging.getLogger(__name__)
 
-class NodeStatus(Enum):
+# Node statuses as plain ints; tick() methods return and compare these
+SUCCESS = 0
+FAILURE = 1
+RUNNING = 2
+
+class NodeStatus(IntEnum):
     """Status of a behavior tree node execution."""
-    SUCCESS = "SUCCESS"
-    FAILURE = "FAILURE"
-    RUNNING = "RUNNING"
+    SUCCESS = SUCCESS
+    FAILURE = FAILURE
+    RUNNING = RUNNING
 
-@dataclass
+@dataclass(slots=True)
 class BlackboardData:
     """Shared data storage for behavior tree nodes."""
     entity: Entity
@@ -33,9 +38,36 @@ class BlackboardData:
         """Clear all stored memory."""
         self.memory.clear()
 
+class BlackboardPool:
+    """Free list of blackboards, reused instead of reallocated per agent."""
+    
+    def __init__(self):
+        self._free: List[BlackboardData] = []
+        
+    def __len__(self) -> int:
+        return len(self._free)
+        
+    def acquire(self, entity: Entity, world: Any) -> BlackboardData:
+        """Get a blackboard with empty memory bound to an entity."""
+        if self._free:
+            blackboard = self._free.pop()
+            blackboard.entity = entity
+            blackboard.world = world
+            return blackboard
+        return BlackboardData(entity, world)
+        
+    def release(self, blackboard: BlackboardData) -> None:
+        """Return a blackboard to the pool, dropping its memory and references."""
+        blackboard.memory.clear()
+        blackboard.entity = None
+        blackboard.world = None
+        self._free.append(blackboard)
+
 class BehaviorNode:
     """Base class for behavior tree nodes."""
     
+    __slots__ = ('name', 'blackboard')
+    
     def __init__(self, name: str):
         self.name = name
         self.blackboard: Optional[BlackboardData] = None
@@ -44,13 +76,15 @@ class BehaviorNode:
         """Initialize the node with blackboard data."""
         self.blackboard = blackboard
         
-    def tick(self) -> NodeStatus:
+    def tick(self) -> int:
         """Execute the node's behavior."""
         raise NotImplementedError
 
 class Composite(BehaviorNode):
     """Base class for nodes that can have children."""
     
+    __slots__ = ('children',)
+    
     def __init__(self, name: str):
         super().__init__(name)
         self.children: List[BehaviorNode] = []
@@ -69,52 +103,66 @@ class Composite(BehaviorNode):
 class Sequence(Composite):
     """Executes children in sequence until one fails."""
     
+    __slots__ = ('_current_child',)
+    
     def __init__(self, name: str):
         super().__init__(name)
         self._current_child = 0
         
-    def tick(self) -> NodeStatus:
-        while self._current_child < len(self.children):
-            status = self.children[self._current_child].tick()
+    def tick(self) -> int:
+        children = self.children
+        index = self._current_child
+        count = len(children)
+        while index < count:
+            status = children[index].tick()
             
-            if status == NodeStatus.RUNNING:
-                return NodeStatus.RUNNING
+            if status == RUNNING:
+                self._current_child = index
+                return RUNNING
             
-            if status == NodeStatus.FAILURE:
+            if status == FAILURE:
                 self._current_child = 0
-                return NodeStatus.FAILURE
+                return FAILURE
                 
-            self._current_child += 1
+            index += 1
             
         self._current_child = 0
-        return NodeStatus.SUCCESS
+        return SUCCESS
 
 class Selector(Composite):
     """Executes children in sequence until one succeeds."""
     
+    __slots__ = ('_current_child',)
+    
     def __init__(self, name: str):
         super().__init__(name)
         self._current_child = 0
         
-    def tick(self) -> NodeStatus:
-        while self._current_child < len(self.children):
-            status = self.children[self._current_child].tick()
+    def tick(self) -> int:
+        children = self.children
+        index = self._current_child
+        count = len(children)
+        while index < count:
+            status = children[index].tick()
             
-            if status == NodeStatus.RUNNING:
-                return NodeStatus.RUNNING
+            if status == RUNNING:
+                self._current_child = index
+                return RUNNING
             
-            if status == NodeStatus.SUCCESS:
+            if status == SUCCESS:
                 self._current_child = 0
-                return NodeStatus.SUCCESS
+                return SUCCESS
                 
-            self._current_child += 1
+            index += 1
             
         self._current_child = 0
-        return NodeStatus.FAILURE
+        return FAILURE
 
 class Decorator(BehaviorNode):
     """Base class for nodes that modify the behavior of a single child."""
     
+    __slots__ = ('child',)
+    
     def __init__(self, name: str, child: BehaviorNode):
         super().__init__(name)
         self.child = child
@@ -126,130 +174,438 @@ class Decorator(BehaviorNode):
 class Inverter(Decorator):
     """Inverts the result of its child."""
     
-    def tick(self) -> NodeStatus:
+    __slots__ = ()
+    
+    def tick(self) -> int:
         status = self.child.tick()
         
-        if status == NodeStatus.SUCCESS:
-            return NodeStatus.FAILURE
-        elif status == NodeStatus.FAILURE:
-            return NodeStatus.SUCCESS
+        if status == SUCCESS:
+            return FAILURE
+        elif status == FAILURE:
+            return SUCCESS
             
-        return NodeStatus.RUNNING
+        return RUNNING
 
 class RepeatUntilSuccess(Decorator):
     """Repeats the child until it succeeds."""
     
+    __slots__ = ('max_attempts', '_attempts')
+    
     def __init__(self, name: str, child: BehaviorNode, max_attempts: int = -1):
         super().__init__(name, child)
         self.max_attempts = max_attempts
         self._attempts = 0
         
-    def tick(self) -> NodeStatus:
+    def tick(self) -> int:
         if self.max_attempts >= 0 and self._attempts >= self.max_attempts:
             self._attempts = 0
-            return NodeStatus.FAILURE
+            return FAILURE
             
         status = self.child.tick()
         
-        if status == NodeStatus.SUCCESS:
+        if status == SUCCESS:
             self._attempts = 0
-            return NodeStatus.SUCCESS
+            return SUCCESS
             
-        if status == NodeStatus.FAILURE:
+        if status == FAILURE:
             self._attempts += 1
             
-        return NodeStatus.RUNNING
+        return RUNNING
 
 class Condition(BehaviorNode):
     """Leaf node that checks a condition."""
     
+    __slots__ = ('_condition',)
+    
     def __init__(self, name: str, condition: Callable[[BlackboardData], bool]):
         super().__init__(name)
         self._condition = condition
         
-    def tick(self) -> NodeStatus:
-        return NodeStatus.SUCCESS if self._condition(self.blackboard) else NodeStatus.FAILURE
+    def tick(self) -> int:
+        return SUCCESS if self._condition(self.blackboard) else FAILURE
 
 class Action(BehaviorNode):
     """Leaf node that performs an action."""
     
-    def __init__(self, name: str, action: Callable[[BlackboardData], NodeStatus]):
+    __slots__ = ('_action',)
+    
+    def __init__(self, name: str, action: Callable[[BlackboardData], int]):
         super().__init__(name)
         self._action = action
         
-    def tick(self) -> NodeStatus:
+    def tick(self) -> int:
         return self._action(self.blackboard)
 
-class ParallelSequence(Composite):
+class _ParallelComposite(Composite):
+    """
+    Base for parallel composites, which tick every child in order.
+    
+    Consecutive plain Condition children are grouped into runs, evaluated
+    with a single all()/any() call instead of one tick() per child. Runs
+    keep their position among the other children, so evaluation order and
+    early exits are unchanged.
+    """
+    
+    __slots__ = ('_segments',)
+    
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._segments: Optional[List[tuple]] = None
+        
+    def initialize(self, blackboard: BlackboardData) -> None:
+        """Initialize this node and all children, and regroup the children."""
+        super().initialize(blackboard)
+        self._segments = self._build_segments()
+        
+    def _build_segments(self) -> List[tuple]:
+        """Split children into (conditions, None) runs and (None, child) entries."""
+        segments: List[tuple] = []
+        run: List[Callable[[BlackboardData], bool]] = []
+        for child in self.children:
+            if type(child).tick is Condition.tick:
+                run.append(child._condition)
+                continue
+            if run:
+                segments.append((tuple(run), None))
+                run = []
+            segments.append((None, child))
+        if run:
+            segments.append((tuple(run), None))
+        return segments
+
+class ParallelSequence(_ParallelComposite):
     """Executes all children simultaneously, succeeds when all succeed."""
     
-    def tick(self) -> NodeStatus:
+    __slots__ = ()
+    
+    def tick(self) -> int:
+        segments = self._segments
+        if segments is None:
+            segments = self._segments = self._build_segments()
+        blackboard = self.blackboard
         success_count = 0
         any_running = False
         
-        for child in self.children:
+        for conditions, child in segments:
+            if conditions is not None:
+                if not all(condition(blackboard) for condition in conditions):
+                    return FAILURE
+                success_count += len(conditions)
+                continue
+                
             status = child.tick()
             
-            if status == NodeStatus.FAILURE:
-                return NodeStatus.FAILURE
+            if status == FAILURE:
+                return FAILURE
                 
-            if status == NodeStatus.RUNNING:
+            if status == RUNNING:
                 any_running = True
             else:  # SUCCESS
                 success_count += 1
                 
         if success_count == len(self.children):
-            return NodeStatus.SUCCESS
+            return SUCCESS
             
-        return NodeStatus.RUNNING if any_running else NodeStatus.FAILURE
+        return RUNNING if any_running else FAILURE
 
-class ParallelSelector(Composite):
+class ParallelSelector(_ParallelComposite):
     """Executes all children simultaneously, succeeds when one succeeds."""
     
-    def tick(self) -> NodeStatus:
+    __slots__ = ()
+    
+    def tick(self) -> int:
+        segments = self._segments
+        if segments is None:
+            segments = self._segments = self._build_segments()
+        blackboard = self.blackboard
         any_running = False
         
-        for child in self.children:
+        for conditions, child in segments:
+            if conditions is not None:
+                if any(condition(blackboard) for condition in conditions):
+                    return SUCCESS
+                continue
+                
             status = child.tick()
             
-            if status == NodeStatus.SUCCESS:
-                return NodeStatus.SUCCESS
+            if status == SUCCESS:
+                return SUCCESS
                 
-            if status == NodeStatus.RUNNING:
+            if status == RUNNING:
                 any_running = True
                 
-        return NodeStatus.RUNNING if any_running else NodeStatus.FAILURE
+        return RUNNING if any_running else FAILURE
+
+# Node kinds of a compiled tree
+_CUSTOM = 0
+_SEQUENCE = 1
+_SELECTOR = 2
+_INVERTER = 3
+_REPEAT = 4
+_CONDITION = 5
+_ACTION = 6
+_PARALLEL_SEQUENCE = 7
+_PARALLEL_SELECTOR = 8
+
+_KIND_OF_TICK = {
+    Sequence.tick: _SEQUENCE,
+    Selector.tick: _SELECTOR,
+    Inverter.tick: _INVERTER,
+    RepeatUntilSuccess.tick: _REPEAT,
+    Condition.tick: _CONDITION,
+    Action.tick: _ACTION,
+    ParallelSequence.tick: _PARALLEL_SEQUENCE,
+    ParallelSelector.tick: _PARALLEL_SELECTOR,
+}
+
+# initialize() implementations that only bind the blackboard down the tree
+_STOCK_INITIALIZE = frozenset({
+    BehaviorNode.initialize,
+    Composite.initialize,
+    Decorator.initialize,
+    _ParallelComposite.initialize,
+})
+
+class BehaviorTree:
+    """
+    A behavior tree flattened into arrays and ticked with an explicit stack.
+    
+    compile() numbers the nodes depth-first and records each node's kind,
+    first child, next sibling and leaf callable, so a tick walks indices
+    instead of recursing through tick() methods and tree depth is not bounded
+    by the interpreter's recursion limit. Nodes whose tick() is not
+    one of the stock implementations are kept as leaves and ticked directly.
+    Composite progress lives in the compiled arrays, so once compiled the
+    tree should only be ticked through this object.
+    """
+    
+    __slots__ = ('root', 'blackboard', '_kind', '_first_child', '_next_sibling',
+                 '_child_count', '_leaf', '_max_attempts', '_cursor', '_attempts',
+                 '_successes', '_any_running')
+    
+    def __init__(self, root: BehaviorNode):
+        self.root = root
+        self.blackboard: Optional[BlackboardData] = None
+        self.compile()
+        
+    def compile(self) -> None:
+        """Flatten the node structure into arrays, resetting all tick progress."""
+        kind: List[int] = []
+        first_child: List[int] = []
+        next_sibling: List[int] = []
+        child_count: List[int] = []
+        leaf: List[Any] = []
+        max_attempts: List[int] = []
+        
+        # Depth-first numbering with an explicit stack, so arbitrarily deep
+        # trees compile without recursion
+        last_child: List[int] = []
+        pending = [(self.root, -1)]
+        while pending:
+            node, parent = pending.pop()
+            index = len(kind)
+            node_kind = _KIND_OF_TICK.get(type(node).tick, _CUSTOM)
+            kind.append(node_kind)
+            first_child.append(-1)
+            next_sibling.append(-1)
+            child_count.append(0)
+            last_child.append(-1)
+            max_attempts.append(getattr(node, 'max_attempts', -1))
+            if node_kind == _CONDITION:
+                leaf.append(node._condition)
+            elif node_kind == _ACTION:
+                leaf.append(node._action)
+            else:
+                leaf.append(node.tick)
+            
+            if parent >= 0:
+                if last_child[parent] < 0:
+                    first_child[parent] = index
+                else:
+                    next_sibling[last_child[parent]] = index
+                last_child[parent] = index
+            
+            if node_kind in (_INVERTER, _REPEAT):
+                children = [node.child]
+            elif node_kind in (_SEQUENCE, _SELECTOR, _PARALLEL_SEQUENCE, _PARALLEL_SELECTOR):
+                children = node.children
+            else:
+                children = []
+            child_count[index] = len(children)
+            pending.extend((child, index) for child in reversed(children))
+        
+        size = len(kind)
+        self._kind = kind
+        self._first_child = first_child
+        self._next_sibling = next_sibling
+        self._child_count = child_count
+        self._leaf = leaf
+        self._max_attempts = max_attempts
+        self._cursor = list(first_child)
+        self._attempts = [0] * size
+        self._successes = [0] * size
+        self._any_running = [False] * size
+        
+    def initialize(self, blackboard: BlackboardData) -> None:
+        """Bind the tree, and every node in it, to a blackboard."""
+        self.blackboard = blackboard
+        
+        # Walked with an explicit stack like compile(); nodes overriding
+        # initialize() are still handed the blackboard through it
+        pending = [self.root]
+        while pending:
+            node = pending.pop()
+            if type(node).initialize not in _STOCK_INITIALIZE:
+                node.initialize(blackboard)
+                continue
+            node.blackboard = blackboard
+            if isinstance(node, Composite):
+                if isinstance(node, _ParallelComposite):
+                    node._segments = None
+                pending.extend(node.children)
+            elif isinstance(node, Decorator):
+                pending.append(node.child)
+        
+    def tick(self) -> int:
+        """Tick the tree from the root."""
+        kind = self._kind
+        first_child = self._first_child
+        next_sibling = self._next_sibling
+        cursor = self._cursor
+        leaf = self._leaf
+        attempts = self._attempts
+        successes = self._successes
+        any_running = self._any_running
+        blackboard = self.blackboard
+        
+        # Only inner nodes go on the stack; leaves are evaluated as soon as
+        # they are reached. status is None while descending into the node on
+        # top of the stack, otherwise it holds its child's result.
+        stack: List[int] = []
+        child = 0
+        while True:
+            child_kind = kind[child]
+            if child_kind == _ACTION:
+                status = leaf[child](blackboard)
+            elif child_kind == _CONDITION:
+                status = SUCCESS if leaf[child](blackboard) else FAILURE
+            elif child_kind == _CUSTOM:
+                status = leaf[child]()
+            else:
+                stack.append(child)
+                status = None
+            
+            # Unwind until some node descends into a child
+            while stack:
+                index = stack[-1]
+                node_kind = kind[index]
+                
+                if node_kind == _SEQUENCE or node_kind == _SELECTOR:
+                    # A sequence stops on failure, a selector on success
+                    stop = FAILURE if node_kind == _SEQUENCE else SUCCESS
+                    if status is None:
+                        child = cursor[index]
+                    elif status == RUNNING:
+                        stack.pop()
+                        continue
+                    elif status == stop:
+                        cursor[index] = first_child[index]
+                        stack.pop()
+                        continue
+                    else:
+                        child = cursor[index] = next_sibling[cursor[index]]
+                    if child >= 0:
+                        break
+                    cursor[index] = first_child[index]
+                    status = SUCCESS if stop == FAILURE else FAILURE
+                    
+                elif node_kind == _INVERTER:
+                    if status is None:
+                        child = first_child[index]
+                        break
+                    if status == SUCCESS:
+                        status = FAILURE
+                    elif status == FAILURE:
+                        status = SUCCESS
+                    else:
+                        status = RUNNING
+                    
+                elif node_kind == _REPEAT:
+                    if status is None:
+                        limit = self._max_attempts[index]
+                        if limit < 0 or attempts[index] < limit:
+                            child = first_child[index]
+                            break
+                        attempts[index] = 0
+                        status = FAILURE
+                    elif status == SUCCESS:
+                        attempts[index] = 0
+                    else:
+                        if status == FAILURE:
+                            attempts[index] += 1
+                        status = RUNNING
+                    
+                else:
+                    # Parallel nodes tick every child in order, using the
+                    # cursor only for the duration of this tick
+                    if status is None:
+                        successes[index] = 0
+                        any_running[index] = False
+                        child = first_child[index]
+                    elif node_kind == _PARALLEL_SEQUENCE and status == FAILURE:
+                        stack.pop()
+                        continue
+                    elif node_kind == _PARALLEL_SELECTOR and status == SUCCESS:
+                        stack.pop()
+                        continue
+                    else:
+                        if status == RUNNING:
+                            any_running[index] = True
+                        else:
+                            successes[index] += 1
+                        child = next_sibling[cursor[index]]
+                    if child >= 0:
+                        cursor[index] = child
+                        break
+                    if node_kind == _PARALLEL_SEQUENCE and successes[index] == self._child_count[index]:
+                        status = SUCCESS
+                    else:
+                        status = RUNNING if any_running[index] else FAILURE
+                    
+                stack.pop()
+            else:
+                return status
 
 def create_patrol_behavior(patrol_points: List[tuple]) -> BehaviorNode:
     """Create a behavior tree for patrolling between points."""
     root = Sequence("Patrol")
     
-    def get_next_patrol_point(bb: BlackboardData) -> NodeStatus:
+    def get_next_patrol_point(bb: BlackboardData) -> int:
         current_index = bb.get('patrol_index', 0)
         bb.set('target_position', patrol_points[current_index])
         bb.set('patrol_index', (current_index + 1) % len(patrol_points))
-        return NodeStatus.SUCCESS
+        return SUCCESS
     
-    def move_to_target(bb: BlackboardData) -> NodeStatus:
+    def move_to_target(bb: BlackboardData) -> int:
         entity_pos = bb.entity.get_component(Position)
         target_pos = bb.get('target_position')
         
         if not entity_pos or not target_pos:
-            return NodeStatus.FAILURE
+            return FAILURE
             
         dx = target_pos[0] - entity_pos.x
         dy = target_pos[1] - entity_pos.y
         
         # Check if we've reached the target
         if abs(dx) < 0.1 and abs(dy) < 0.1:
-            return NodeStatus.SUCCESS
+            return SUCCESS
             
         # Move towards target
         speed = 0.1
         entity_pos.x += dx * speed
         entity_pos.y += dy * speed
         
-        return NodeStatus.RUNNING
+        return RUNNING
     
     root.add_child(Action("GetNextPatrolPoint", get_next_patrol_point))
     root.add_child(Action("MoveToTarget", move_to_target))
@@ -276,17 +632,17 @@ def create_guard_behavior(detection_range: float) -> BehaviorNode:
                 
         return False
     
-    def attack_target(bb: BlackboardData) -> NodeStatus:
+    def attack_target(bb: BlackboardData) -> int:
         target = bb.get('target_entity')
         if not target:
-            return NodeStatus.FAILURE
+            return FAILURE
             
         # Perform attack
         if bb.world.can_attack(bb.entity, target):
             bb.world.perform_attack(bb.entity, target)
-            return NodeStatus.SUCCESS
+            return SUCCESS
             
-        return NodeStatus.RUNNING
+        return RUNNING
     
     # Create chase sequence
     chase_sequence = Sequence("Chase")
@@ -1,18 +1,24 @@
 """Goal-Oriented Action Planning (GOAP) system for advanced AI decision making."""
 from typing import Dict, List, Set, Optional, Tuple
 from dataclasses import dataclass, field
+import functools
 import heapq
+import math
 from ..ecs.entity import Entity
 
 WorldState = Dict[str, bool]
 
-@dataclass
+@dataclass(slots=True)
 class Action:
     """Represents an action that can be performed by an AI agent."""
     name: str
     cost: float
     preconditions: WorldState
     effects: WorldState
+    _pre_mask: int = field(default=0, repr=False, compare=False)
+    _pre_true: int = field(default=0, repr=False, compare=False)
+    _eff_mask: int = field(default=0, repr=False, compare=False)
+    _eff_true: int = field(default=0, repr=False, compare=False)
     
     def __init__(self, name: str, cost: float = 1.0):
         self.name = name
@@ -20,6 +26,12 @@ class Action:
         self.preconditions = {}
         self.effects = {}
         
+        # Packed condition masks, filled in by GOAP.add_action
+        self._pre_mask = 0
+        self._pre_true = 0
+        self._eff_mask = 0
+        self._eff_true = 0
+        
     def check_preconditions(self, world_state: WorldState) -> bool:
         """Check if preconditions are met in the current world state."""
         return all(world_state.get(key) == value 
@@ -31,88 +43,153 @@ class Action:
         new_state.update(self.effects)
         return new_state
 
-@dataclass(order=True)
-class PlanNode:
-    """Node in the planning graph."""
-    f_score: float
-    g_score: float = field(compare=False)
-    world_state: WorldState = field(compare=False)
-    action: Optional[Action] = field(compare=False, default=None)
-    parent: Optional['PlanNode'] = field(compare=False, default=None)
-
 class GOAP:
     """Goal-Oriented Action Planning system."""
     
     def __init__(self):
         self.actions: List[Action] = []
+        self._key_index: Dict[str, int] = {}
+        self._known_bits = 0
+        
+        # Plans depend only on the packed start and goal, so repeated
+        # requests with the same states are answered from this cache
+        self._plan_cached = functools.lru_cache(maxsize=1024)(self._search)
         
     def add_action(self, action: Action) -> None:
         """Add an action to the planner."""
         self.actions.append(action)
+        for key in action.preconditions:
+            self._key_bit(key)
+        for key in action.effects:
+            self._key_bit(key)
+        
+        # Bits are never reassigned, so the masks stay valid as keys are added
+        action._pre_mask, action._pre_true = self._encode(action.preconditions)
+        action._eff_mask, action._eff_true = self._encode(action.effects)
+        self._plan_cached.cache_clear()
+    
+    def _key_bit(self, key: str) -> int:
+        """
+        Get the bit position of a predicate key, assigning one if new.
+        
+        Each key owns two adjacent bits of a packed state: the lower one is
+        set when the key is known, the upper one holds its value.
+        """
+        bit = self._key_index.get(key)
+        if bit is None:
+            bit = 2 * len(self._key_index)
+            self._key_index[key] = bit
+            self._known_bits |= 1 << bit
+        return bit
+    
+    def _encode(self, state: WorldState) -> Tuple[int, int]:
+        """
+        Pack a world state into (mask, value) ints over the known keys.
+        
+        A packed state matches when (packed & mask) == value. Keys the
+        planner has never seen are dropped, as nothing can test them.
+        """
+        mask = 0
+        value = 0
+        key_index = self._key_index
+        for key, flag in state.items():
+            bit = key_index.get(key)
+            if bit is None:
+                continue
+            mask |= 3 << bit
+            value |= (3 if flag else 1) << bit
+        return mask, value
         
-    def _heuristic(self, state: WorldState, goal: WorldState) -> float:
+    def _heuristic(self, state: int, goal_mask: int, goal_value: int) -> float:
         """Estimate cost to reach goal from current state."""
-        differences = sum(1 for key, value in goal.items()
-                         if state.get(key) != value)
-        return differences
+        diff = (state ^ goal_value) & goal_mask
+        return ((diff | (diff >> 1)) & self._known_bits).bit_count()
         
-    def _reconstruct_plan(self, node: PlanNode) -> List[Action]:
-        """Reconstruct plan from goal node."""
+    def _reconstruct_plan(self, came_from: Dict[int, Tuple[int, int]],
+                          state: int) -> Tuple[int, ...]:
+        """Reconstruct plan by walking parent links back from the goal state."""
         plan = []
-        current = node
         
-        while current.action is not None:
-            plan.append(current.action)
-            current = current.parent
+        while state in came_from:
+            state, action_index = came_from[state]
+            plan.append(action_index)
             
-        return list(reversed(plan))
+        return tuple(reversed(plan))
         
     def plan(self, initial_state: WorldState, goal_state: WorldState,
              max_iterations: int = 1000) -> Optional[List[Action]]:
         """Find sequence of actions to reach goal state."""
-        start_node = PlanNode(
-            f_score=self._heuristic(initial_state, goal_state),
-            g_score=0.0,
-            world_state=initial_state
-        )
+        for key in goal_state:
+            self._key_bit(key)
+        
+        # States are packed ints; actions carry (mask, value) pairs to test
+        # preconditions against and to overwrite effects with
+        _, start_state = self._encode(initial_state)
+        goal_mask, goal_value = self._encode(goal_state)
+        
+        plan = self._plan_cached(start_state, goal_mask, goal_value, max_iterations)
+        if plan is None:
+            return None
+        return [self.actions[index] for index in plan]
+        
+    def _search(self, start_state: int, goal_mask: int, goal_value: int,
+                max_iterations: int) -> Optional[Tuple[int, ...]]:
+        """A* over packed states; returns the plan as action indices."""
+        compiled = [(index, action.cost, action._pre_mask, action._pre_true,
+                     action._eff_mask, action._eff_true)
+                    for index, action in enumerate(self.actions)]
         
-        open_set: List[PlanNode] = [start_node]
-        closed_set: Set[str] = set()
+        # Try actions usable right away first, cheapest first, so the
+        # frontier fills with promising states early
+        compiled.sort(key=lambda entry: (start_state & entry[2] != entry[3], entry[1]))
+        
+        # Actions applicable to a state depend only on the bits some
+        # precondition tests; candidate lists are cached per such projection
+        tested_bits = 0
+        for entry in compiled:
+            tested_bits |= entry[2]
+        candidates: Dict[int, List[tuple]] = {}
+        
+        # Open set entries are (f, g, state); the best known cost and the
+        # (parent state, action index) that reached it are kept per state
+        open_set: List[Tuple[float, float, int]] = [
+            (self._heuristic(start_state, goal_mask, goal_value), 0.0, start_state)
+        ]
+        g_score: Dict[int, float] = {start_state: 0.0}
+        came_from: Dict[int, Tuple[int, int]] = {}
+        closed_set: Set[int] = set()
         
         iterations = 0
         
         while open_set and iterations < max_iterations:
-            current = heapq.heappop(open_set)
+            _, g, state = heapq.heappop(open_set)
             
             # Check if goal reached
-            if all(current.world_state.get(key) == value 
-                  for key, value in goal_state.items()):
-                return self._reconstruct_plan(current)
+            if state & goal_mask == goal_value:
+                return self._reconstruct_plan(came_from, state)
                 
             # Add current state to closed set
-            state_hash = str(sorted(current.world_state.items()))
-            if state_hash in closed_set:
+            if state in closed_set:
                 continue
-            closed_set.add(state_hash)
+            closed_set.add(state)
             
-            # Try each action
-            for action in self.actions:
-                if not action.check_preconditions(current.world_state):
+            # Try each applicable action
+            projection = state & tested_bits
+            applicable = candidates.get(projection)
+            if applicable is None:
+                applicable = [entry for entry in compiled if projection & entry[2] == entry[3]]
+                candidates[projection] = applicable
+            
+            for index, cost, _, _, eff_mask, eff_value in applicable:
+                new_state = (state & ~eff_mask) | eff_value
+                new_g_score = g + cost
+                if new_state in closed_set or new_g_score >= g_score.get(new_state, math.inf):
                     continue
-                    
-                new_state = action.apply_effects(current.world_state)
-                new_g_score = current.g_score + action.cost
-                new_f_score = new_g_score + self._heuristic(new_state, goal_state)
-                
-                new_node = PlanNode(
-                    f_score=new_f_score,
-                    g_score=new_g_score,
-                    world_state=new_state,
-                    action=action,
-                    parent=current
-                )
                 
-                heapq.heappush(open_set, new_node)
+                g_score[new_state] = new_g_score
+                came_from[new_state] = (state, index)
+                new_f_score = new_g_score + self._heuristic(new_state, goal_mask, goal_value)
+                heapq.heappush(open_set, (new_f_score, new_g_score, new_state))
                 
             iterations += 1
             
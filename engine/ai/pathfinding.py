@@ -1,7 +1,91 @@
 """Pathfinding implementation for NPCs."""
 from typing import List, Tuple, Optional, Set, Dict
 from ..world.tilemap import TileMap, TileType
-import heapq
+import numpy as np
+
+def _astar_flat(walkable: bytes, stride: int, start: int, goal: int,
+                cost: List[int], came_from: List[int], marks: List[int],
+                opened: int) -> Optional[List[int]]:
+    """
+    A* over a flattened 4-connected grid.
+
+    Args:
+        walkable: Row-major walkability flags, bordered by a ring of blocked cells
+        stride: Row length of the grid, border included
+        start: Flat index of the start cell
+        goal: Flat index of the goal cell
+        cost, came_from: Per-cell scratch for best cost and parent index,
+            only meaningful where marks says the cell was reached
+        marks: Per-cell search stamps; a cell was reached by this search if
+            its mark is opened and expanded if it is opened + 1
+        opened: Stamp unique to this search
+
+    Returns:
+        Flat indices from start to goal, or None if the goal is unreachable
+    """
+    goal_x = goal % stride
+    goal_y = goal // stride
+    offsets = (stride, 1, -stride, -1)
+    
+    # Stamping cells instead of resetting the scratch lists keeps setup
+    # independent of the map size
+    closed = opened + 1
+    marks[start] = opened
+    came_from[start] = start
+    cost[start] = 0
+    
+    # Edge costs are 1 and the Manhattan heuristic is consistent, so
+    # f-scores are integers that never decrease as nodes are expanded:
+    # a bucket queue keyed by f replaces the binary heap
+    current_priority = abs(start % stride - goal_x) + abs(start // stride - goal_y)
+    max_priority = current_priority
+    buckets: Dict[int, List[int]] = {current_priority: [start]}
+    
+    while current_priority <= max_priority:
+        bucket = buckets.get(current_priority)
+        if not bucket:
+            buckets.pop(current_priority, None)
+            current_priority += 1
+            continue
+        
+        current = bucket.pop()
+        if marks[current] == closed:
+            continue
+        marks[current] = closed
+        
+        if current == goal:
+            break
+        
+        new_cost = cost[current] + 1
+        for offset in offsets:
+            nxt = current + offset
+            if not walkable[nxt]:
+                continue
+            mark = marks[nxt]
+            if mark == closed:
+                continue
+            if mark != opened or new_cost < cost[nxt]:
+                marks[nxt] = opened
+                cost[nxt] = new_cost
+                came_from[nxt] = current
+                priority = new_cost + abs(nxt % stride - goal_x) + abs(nxt // stride - goal_y)
+                if priority in buckets:
+                    buckets[priority].append(nxt)
+                else:
+                    buckets[priority] = [nxt]
+                    if priority > max_priority:
+                        max_priority = priority
+    else:
+        return None
+    
+    # Walk parents back from the goal
+    path = [goal]
+    current = goal
+    while current != start:
+        current = came_from[current]
+        path.append(current)
+    path.reverse()
+    return path
 
 class PathFinder:
     """A* pathfinding implementation."""
@@ -9,55 +93,54 @@ class PathFinder:
     def __init__(self, tilemap: TileMap):
         """Initialize pathfinder with tilemap."""
         self.tilemap = tilemap
+        self._walkable_version = -1
+        self._walkable = np.zeros((0, 0), dtype=bool)
+        self._walkable_flat = b''
+        
+        # Search scratch reused across calls, see _astar_flat
+        self._cost: List[int] = []
+        self._came_from: List[int] = []
+        self._marks: List[int] = []
+        self._stamp = 0
     
     def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
         """Find a path from start to goal using A* algorithm."""
         if not self._is_valid_position(start) or not self._is_valid_position(goal):
             return None
         
-        # Initialize data structures
-        frontier = []  # Priority queue
-        heapq.heappush(frontier, (0, start))
-        came_from: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {start: None}
-        cost_so_far: Dict[Tuple[int, int], float] = {start: 0}
+        size = len(self._walkable_flat)
+        if len(self._marks) != size:
+            self._cost = [0] * size
+            self._came_from = [0] * size
+            self._marks = [0] * size
+            self._stamp = 0
+        self._stamp += 2
         
-        while frontier:
-            current = heapq.heappop(frontier)[1]
-            
-            if current == goal:
-                break
-            
-            # Check all neighbors
-            for next_pos in self._get_neighbors(current):
-                new_cost = cost_so_far[current] + 1
-                
-                if next_pos not in cost_so_far or new_cost < cost_so_far[next_pos]:
-                    cost_so_far[next_pos] = new_cost
-                    priority = new_cost + self._heuristic(next_pos, goal)
-                    heapq.heappush(frontier, (priority, next_pos))
-                    came_from[next_pos] = current
-        
-        # Reconstruct path
-        if goal not in came_from:
+        stride = self.tilemap.width + 2
+        cells = _astar_flat(self._walkable_flat, stride,
+                            (start[1] + 1) * stride + start[0] + 1,
+                            (goal[1] + 1) * stride + goal[0] + 1,
+                            self._cost, self._came_from, self._marks, self._stamp)
+        if cells is None:
             return None
-            
-        current = goal
-        path = []
-        
-        while current is not None:
-            path.append(current)
-            current = came_from[current]
+        return [(i % stride - 1, i // stride - 1) for i in cells]
+    
+    def _rebuild_walkable(self) -> None:
+        """Recompute the walkability bitmap if the tilemap changed since the last build."""
+        if self._walkable_version == self.tilemap.version:
+            return
+        self._walkable = self.tilemap.walkable_grid()
         
-        path.reverse()
-        return path
+        # Row-major copy with a blocked border for the A* kernel
+        self._walkable_flat = np.pad(self._walkable, 1).astype(np.uint8).tobytes()
+        self._walkable_version = self.tilemap.version
     
     def _is_valid_position(self, pos: Tuple[int, int]) -> bool:
         """Check if a position is valid and walkable."""
-        if not self.tilemap.is_valid_position(pos[0], pos[1]):
-            return False
-            
-        tile = self.tilemap.get_tile(pos[0], pos[1])
-        return tile in [TileType.FLOOR, TileType.DOOR]
+        self._rebuild_walkable()
+        x, y = pos
+        height, width = self._walkable.shape
+        return 0 <= x < width and 0 <= y < height and bool(self._walkable[y, x])
     
     def _get_neighbors(self, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
         """Get valid neighboring positions."""
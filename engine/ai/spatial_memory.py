@@ -1,12 +1,13 @@
 """Spatial awareness and memory system for AI entities."""
-from typing import Dict, Set, List, Tuple, Optional
+from typing import Dict, Hashable, Set, List, Tuple, Optional
 import numpy as np
 from dataclasses import dataclass
+import math
 import time
 from ..ecs.entity import Entity
 from ..ecs.component import Position
 
-@dataclass
+@dataclass(slots=True)
 class MemoryRecord:
     """Record of an entity or point of interest."""
     position: Tuple[float, float]
@@ -15,22 +16,37 @@ class MemoryRecord:
     importance: float  # Higher values are more important
     certainty: float  # 1.0 = certain, 0.0 = forgotten
     
-    def age(self) -> float:
-        """Get age of memory in seconds."""
-        return time.time() - self.timestamp
+    def age(self, now: Optional[float] = None) -> float:
+        """Get age of memory in seconds, as of now if given."""
+        if now is None:
+            now = time.time()
+        return now - self.timestamp
         
-    def update_certainty(self, decay_rate: float = 0.1) -> None:
-        """Update certainty based on age."""
-        self.certainty = max(0.0, self.certainty - (self.age() * decay_rate))
+    def update_certainty(self, decay_rate: float = 0.1, now: Optional[float] = None) -> None:
+        """Update certainty based on age; pass now to reuse one clock read across records."""
+        self.certainty = max(0.0, self.certainty - (self.age(now) * decay_rate))
+
+# Multiplier packing a (cell_x, cell_y) pair into a single int key
+_CELL_PACK = 1 << 21
 
 class SpatialGrid:
     """Grid-based spatial partitioning for efficient queries."""
     
     def __init__(self, width: int, height: int, cell_size: float = 5.0):
         self.cell_size = cell_size
-        self.grid_width = int(np.ceil(width / cell_size))
-        self.grid_height = int(np.ceil(height / cell_size))
+        self.grid_width = math.ceil(width / cell_size)
+        self.grid_height = math.ceil(height / cell_size)
         self.grid: Dict[Tuple[int, int], Set[int]] = {}
+        self._positions: Dict[int, Tuple[float, float]] = {}
+        
+        # Query-side snapshot of the grid, rebuilt lazily after it changes:
+        # entity ids and positions sorted by packed cell key, so the cells
+        # of one grid column form a contiguous run
+        self._keys = np.zeros(0, dtype=np.int64)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._xs = np.zeros(0)
+        self._ys = np.zeros(0)
+        self._dirty = False
         
     def _get_cell(self, x: float, y: float) -> Tuple[int, int]:
         """Get grid cell coordinates for a position."""
@@ -42,6 +58,8 @@ class SpatialGrid:
         if cell not in self.grid:
             self.grid[cell] = set()
         self.grid[cell].add(entity_id)
+        self._positions[entity_id] = (x, y)
+        self._dirty = True
         
     def remove_entity(self, entity_id: int, x: float, y: float) -> None:
         """Remove an entity from the grid."""
@@ -50,6 +68,8 @@ class SpatialGrid:
             self.grid[cell].discard(entity_id)
             if not self.grid[cell]:
                 del self.grid[cell]
+        self._positions.pop(entity_id, None)
+        self._dirty = True
                 
     def update_entity(self, entity_id: int, old_x: float, old_y: float,
                      new_x: float, new_y: float) -> None:
@@ -66,20 +86,155 @@ class SpatialGrid:
             if new_cell not in self.grid:
                 self.grid[new_cell] = set()
             self.grid[new_cell].add(entity_id)
+        self._positions[entity_id] = (new_x, new_y)
+        self._dirty = True
+        
+    def _rebuild(self) -> None:
+        """Sort entity ids and positions by packed cell key."""
+        self._dirty = False
+        
+        ids = []
+        positions = []
+        for cell_ids in self.grid.values():
+            for entity_id in cell_ids:
+                position = self._positions.get(entity_id)
+                if position is not None:
+                    ids.append(entity_id)
+                    positions.append(position)
+        
+        xy = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        keys = ((xy[:, 0] / self.cell_size).astype(np.int64) * _CELL_PACK
+                + (xy[:, 1] / self.cell_size).astype(np.int64))
+        order = np.argsort(keys, kind='stable')
+        self._keys = keys[order]
+        self._ids = np.asarray(ids, dtype=np.int64)[order]
+        self._xs = xy[order, 0]
+        self._ys = xy[order, 1]
             
     def get_entities_in_range(self, x: float, y: float, radius: float) -> Set[int]:
         """Get all entities within radius of a point."""
-        result = set()
-        cell_radius = int(np.ceil(radius / self.cell_size))
-        center_cell = self._get_cell(x, y)
-        
-        for dx in range(-cell_radius, cell_radius + 1):
-            for dy in range(-cell_radius, cell_radius + 1):
-                cell = (center_cell[0] + dx, center_cell[1] + dy)
-                if cell in self.grid:
-                    result.update(self.grid[cell])
-                    
-        return result
+        if self._dirty:
+            self._rebuild()
+        if not len(self._keys):
+            return set()
+            
+        cell_radius = math.ceil(radius / self.cell_size)
+        center_x, center_y = self._get_cell(x, y)
+        
+        # Each grid column of the covering square is one contiguous run of
+        # the sorted keys; locate all runs at once and gather their rows
+        columns = (center_x + np.arange(-cell_radius, cell_radius + 1, dtype=np.int64)) * _CELL_PACK
+        starts = np.searchsorted(self._keys, columns + (center_y - cell_radius), side='left')
+        ends = np.searchsorted(self._keys, columns + (center_y + cell_radius), side='right')
+        lengths = ends - starts
+        total = int(lengths.sum())
+        if not total:
+            return set()
+        offsets = np.cumsum(lengths) - lengths
+        rows = np.arange(total) + np.repeat(starts - offsets, lengths)
+        
+        # Cull the square's corners to the actual circle
+        dx = self._xs[rows] - x
+        dy = self._ys[rows] - y
+        return set(self._ids[rows[dx * dx + dy * dy <= radius * radius]].tolist())
+
+class _MemoryTable:
+    """
+    One observer's memory records, stored as parallel NumPy arrays.
+    
+    Rows are dense: removing a record moves the last row into its slot, so
+    queries run over the ``[:count]`` prefix of each array.
+    """
+    
+    __slots__ = ('keys', 'row_of', 'xs', 'ys', 'timestamps', 'importance',
+                 'certainty', 'count')
+    
+    def __init__(self, capacity: int = 16):
+        self.keys: List[Hashable] = []
+        self.row_of: Dict[Hashable, int] = {}
+        self.xs = np.zeros(capacity)
+        self.ys = np.zeros(capacity)
+        self.timestamps = np.zeros(capacity)
+        self.importance = np.zeros(capacity)
+        self.certainty = np.zeros(capacity)
+        self.count = 0
+        
+    def __len__(self) -> int:
+        return self.count
+        
+    def put(self, key: Hashable, position: Tuple[float, float], timestamp: float,
+            importance: float) -> None:
+        """Insert or overwrite the record stored under key with full certainty."""
+        row = self.row_of.get(key)
+        if row is None:
+            if self.count == len(self.xs):
+                self._grow()
+            row = self.count
+            self.count += 1
+            self.row_of[key] = row
+            self.keys.append(key)
+        self.xs[row], self.ys[row] = position
+        self.timestamps[row] = timestamp
+        self.importance[row] = importance
+        self.certainty[row] = 1.0
+        
+    def remove(self, key: Hashable) -> None:
+        """Remove the record stored under key, if any."""
+        row = self.row_of.pop(key, None)
+        if row is None:
+            return
+        last = self.count - 1
+        if row != last:
+            moved = self.keys[last]
+            self.keys[row] = moved
+            self.row_of[moved] = row
+            for array in (self.xs, self.ys, self.timestamps, self.importance, self.certainty):
+                array[row] = array[last]
+        self.keys.pop()
+        self.count = last
+        
+    def retain(self, keep: np.ndarray) -> None:
+        """Keep only the rows flagged in keep, compacting them in order."""
+        rows = np.flatnonzero(keep)
+        kept = len(rows)
+        if kept == self.count:
+            return
+        for array in (self.xs, self.ys, self.timestamps, self.importance, self.certainty):
+            array[:kept] = array[rows]
+        self.keys = [self.keys[row] for row in rows.tolist()]
+        self.row_of = {key: row for row, key in enumerate(self.keys)}
+        self.count = kept
+        
+    def decay(self, now: float, decay_rate: float) -> np.ndarray:
+        """Apply age-based certainty decay to every record and return the certainties."""
+        n = self.count
+        certainty = self.certainty[:n]
+        np.maximum(0.0, certainty - (now - self.timestamps[:n]) * decay_rate, out=certainty)
+        return certainty
+        
+    def scores(self) -> np.ndarray:
+        """Importance weighted by certainty, per record."""
+        n = self.count
+        return self.importance[:n] * self.certainty[:n]
+        
+    def record(self, row: int, entity_id: Optional[int]) -> MemoryRecord:
+        """Build a MemoryRecord snapshot of a row."""
+        return MemoryRecord(
+            position=(float(self.xs[row]), float(self.ys[row])),
+            entity_id=entity_id,
+            timestamp=float(self.timestamps[row]),
+            importance=float(self.importance[row]),
+            certainty=float(self.certainty[row])
+        )
+        
+    def _grow(self) -> None:
+        """Double the capacity of the backing arrays."""
+        capacity = max(1, len(self.xs)) * 2
+        for name in ('xs', 'ys', 'timestamps', 'importance', 'certainty'):
+            old = getattr(self, name)
+            new = np.zeros(capacity)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
 
 class SpatialMemory:
     """Spatial memory and awareness system for AI entities."""
@@ -87,101 +242,84 @@ class SpatialMemory:
     def __init__(self, decay_rate: float = 0.1, memory_limit: int = 100):
         self.decay_rate = decay_rate
         self.memory_limit = memory_limit
-        self.memories: Dict[int, Dict[int, MemoryRecord]] = {}  # entity_id -> {target_id -> record}
-        self.points_of_interest: Dict[int, Dict[str, MemoryRecord]] = {}  # entity_id -> {poi_name -> record}
+        self.memories: Dict[int, _MemoryTable] = {}  # entity_id -> records keyed by target_id
+        self.points_of_interest: Dict[int, _MemoryTable] = {}  # entity_id -> records keyed by poi_name
         
     def update_entity_memory(self, observer_id: int, target_id: int,
                            position: Tuple[float, float], importance: float = 1.0) -> None:
         """Update memory of an entity."""
-        if observer_id not in self.memories:
-            self.memories[observer_id] = {}
+        table = self.memories.get(observer_id)
+        if table is None:
+            table = self.memories[observer_id] = _MemoryTable()
             
-        self.memories[observer_id][target_id] = MemoryRecord(
-            position=position,
-            entity_id=target_id,
-            timestamp=time.time(),
-            importance=importance,
-            certainty=1.0
-        )
+        table.put(target_id, position, time.time(), importance)
         
         # Enforce memory limit
-        if len(self.memories[observer_id]) > self.memory_limit:
+        excess = len(table) - self.memory_limit
+        if excess == 1:
+            # At the limit every insert overflows by one: drop the single
+            # least important memory with one linear scan
+            table.remove(table.keys[int(np.argmin(table.scores()))])
+        elif excess > 1:
             # Remove least important memories
-            sorted_memories = sorted(
-                self.memories[observer_id].items(),
-                key=lambda x: x[1].importance * x[1].certainty
-            )
-            for target_id, _ in sorted_memories[:len(sorted_memories) - self.memory_limit]:
-                del self.memories[observer_id][target_id]
+            victims = np.argpartition(table.scores(), excess - 1)[:excess]
+            for target_id in [table.keys[row] for row in victims.tolist()]:
+                table.remove(target_id)
                 
     def add_point_of_interest(self, observer_id: int, poi_name: str,
                             position: Tuple[float, float], importance: float = 1.0) -> None:
         """Add or update a point of interest."""
-        if observer_id not in self.points_of_interest:
-            self.points_of_interest[observer_id] = {}
+        table = self.points_of_interest.get(observer_id)
+        if table is None:
+            table = self.points_of_interest[observer_id] = _MemoryTable()
             
-        self.points_of_interest[observer_id][poi_name] = MemoryRecord(
-            position=position,
-            entity_id=None,
-            timestamp=time.time(),
-            importance=importance,
-            certainty=1.0
-        )
+        table.put(poi_name, position, time.time(), importance)
         
     def get_recent_memories(self, observer_id: int, max_age: float = float('inf'),
                           min_certainty: float = 0.0) -> List[MemoryRecord]:
         """Get recent memories above certainty threshold."""
-        if observer_id not in self.memories:
+        table = self.memories.get(observer_id)
+        if table is None:
             return []
             
         current_time = time.time()
-        memories = []
+        certainty = table.decay(current_time, self.decay_rate)
+        ages = current_time - table.timestamps[:table.count]
+        rows = np.flatnonzero((ages <= max_age) & (certainty >= min_certainty))
         
-        for record in self.memories[observer_id].values():
-            record.update_certainty(self.decay_rate)
-            if (record.age() <= max_age and
-                record.certainty >= min_certainty):
-                memories.append(record)
-                
-        return sorted(memories, key=lambda x: x.importance * x.certainty, reverse=True)
+        order = rows[np.argsort(-table.scores()[rows], kind='stable')]
+        return [table.record(row, table.keys[row]) for row in order.tolist()]
         
     def get_nearest_poi(self, observer_id: int, position: Tuple[float, float],
                        min_certainty: float = 0.0) -> Optional[Tuple[str, MemoryRecord]]:
         """Get the nearest point of interest above certainty threshold."""
-        if observer_id not in self.points_of_interest:
+        table = self.points_of_interest.get(observer_id)
+        if table is None or not table.count:
             return None
             
-        nearest = None
-        min_dist = float('inf')
+        n = table.count
+        certainty = table.decay(time.time(), self.decay_rate)
+        dx = table.xs[:n] - position[0]
+        dy = table.ys[:n] - position[1]
+        d2 = np.where(certainty >= min_certainty, dx * dx + dy * dy, np.inf)
         
-        for name, record in self.points_of_interest[observer_id].items():
-            record.update_certainty(self.decay_rate)
-            if record.certainty < min_certainty:
-                continue
-                
-            dist = np.sqrt((position[0] - record.position[0])**2 +
-                          (position[1] - record.position[1])**2)
-            if dist < min_dist:
-                min_dist = dist
-                nearest = (name, record)
-                
-        return nearest
+        row = int(np.argmin(d2))
+        if d2[row] == np.inf:
+            return None
+        return table.keys[row], table.record(row, None)
         
     def forget_entity(self, observer_id: int, target_id: int) -> None:
         """Remove memory of an entity."""
-        if observer_id in self.memories:
-            self.memories[observer_id].pop(target_id, None)
+        table = self.memories.get(observer_id)
+        if table is not None:
+            table.remove(target_id)
             
     def forget_old_memories(self, max_age: float) -> None:
         """Remove memories older than max_age."""
         current_time = time.time()
         
-        for observer_id in list(self.memories.keys()):
-            self.memories[observer_id] = {
-                target_id: record
-                for target_id, record in self.memories[observer_id].items()
-                if record.age() <= max_age
-            }
+        for table in self.memories.values():
+            table.retain(current_time - table.timestamps[:table.count] <= max_age)
             
     def clear_entity_memory(self, observer_id: int) -> None:
         """Clear all memories for an entity."""
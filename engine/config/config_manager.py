@@ -1,62 +1,120 @@
-from typing import Dict, Any, Optional, Type
+from typing import Dict, Any, List, Mapping, Optional, Tuple, Type
+from types import MappingProxyType
 import yaml
+import logging
 import os
+import pickle
+import sys
 from pathlib import Path
+from ..ecs import component as component_module
 from ..ecs.component import Component
 from ..ecs.entity import Entity
 from ..ecs.world import World
 
+logger = logging.getLogger(__name__)
+
+# libyaml's C loader when PyYAML was built with it, else the pure-Python one
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Component classes templates can name, resolved once at import
+_COMPONENT_CLASSES: Dict[str, Type[Component]] = {
+    name: value for name, value in vars(component_module).items()
+    if isinstance(value, type) and issubclass(value, Component)
+}
+
+# Parsed configuration is cached here, relative to the data directory
+_CACHE_FILE = Path('.cache') / 'config.pickle'
+
 class ConfigManager:
     """Manages loading and accessing game configuration data."""
     
     def __init__(self, data_dir: str):
         self.data_dir = Path(data_dir)
         self.entity_templates: Dict[str, Dict] = {}
-        self.behavior_configs: Dict[str, Dict] = {}
+        self.behavior_configs: Dict[str, Mapping] = {}
         self.generation_rules: Dict[str, Dict] = {}
+        self._resolved_templates: Dict[str, Mapping] = {}
         self._load_configurations()
     
     def _load_configurations(self) -> None:
-        """Load all configuration files."""
-        # Load entity templates
-        entity_path = self.data_dir / 'entities'
-        if entity_path.exists():
-            for file in entity_path.glob('*.yaml'):
-                with open(file, 'r') as f:
-                    templates = yaml.safe_load(f)
-                    self.entity_templates.update(templates)
+        """Load all configuration files, from the parse cache when it is current."""
+        files = {section: sorted((self.data_dir / section).glob('*.yaml'))
+                 for section in ('entities', 'behaviors', 'generation')}
+        signature = self._signature(files)
         
-        # Load behavior configurations
-        behavior_path = self.data_dir / 'behaviors'
-        if behavior_path.exists():
-            for file in behavior_path.glob('*.yaml'):
-                with open(file, 'r') as f:
-                    behaviors = yaml.safe_load(f)
-                    self.behavior_configs.update(behaviors)
-
-        # Load generation rules
-        generation_path = self.data_dir / 'generation'
-        if generation_path.exists():
-            for file in generation_path.glob('*.yaml'):
-                with open(file, 'r') as f:
-                    rules = yaml.safe_load(f)
-                    self.generation_rules.update(rules)
+        data = self._read_cache(signature)
+        if data is None:
+            data = {section: {} for section in files}
+            for section, paths in files.items():
+                for file in paths:
+                    with open(file, 'rb') as f:
+                        data[section].update(yaml.load(f, Loader=_YamlLoader))
+            self._write_cache(signature, data)
+        
+        self.entity_templates.update(self._intern_strings(data['entities']))
+        # Behavior configs are shared by every entity of a type, so hand them out read-only
+        behaviors = self._intern_strings(data['behaviors'])
+        self.behavior_configs.update((name, self._freeze(config)) for name, config in behaviors.items())
+        self.generation_rules.update(data['generation'])
+    
+    def _signature(self, files: Dict[str, List[Path]]) -> List[Tuple[str, int, int]]:
+        """Identify the current config files by path, modification time and size."""
+        signature = []
+        for paths in files.values():
+            for file in paths:
+                stat = file.stat()
+                signature.append((str(file.relative_to(self.data_dir)), stat.st_mtime_ns, stat.st_size))
+        return signature
+    
+    def _read_cache(self, signature: List[Tuple[str, int, int]]) -> Optional[Dict[str, Dict]]:
+        """Load cached parsed configuration if it was built from the same files."""
+        try:
+            with open(self.data_dir / _CACHE_FILE, 'rb') as f:
+                cached = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+        if not isinstance(cached, dict) or cached.get('sig') != signature:
+            return None
+        return cached['data']
+    
+    def _write_cache(self, signature: List[Tuple[str, int, int]], data: Dict[str, Dict]) -> None:
+        """Store parsed configuration for the next launch; failures only cost the speedup."""
+        path = self.data_dir / _CACHE_FILE
+        try:
+            path.parent.mkdir(exist_ok=True)
+            tmp = path.with_suffix('.tmp')
+            with open(tmp, 'wb') as f:
+                pickle.dump({'sig': signature, 'data': data}, f, protocol=5)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.debug("Could not write config cache %s: %s", path, e)
     
-    def get_entity_template(self, template_name: str) -> Optional[Dict]:
-        """Get an entity template by name, including inherited properties."""
+    def get_entity_template(self, template_name: str) -> Optional[Mapping]:
+        """
+        Get an entity template by name, including inherited properties.
+        
+        Resolved templates are cached and shared between callers, so they are
+        returned as read-only mappings.
+        """
+        resolved = self._resolved_templates.get(template_name)
+        if resolved is not None:
+            return resolved
+        
         template = self.entity_templates.get(template_name)
         if not template:
             return None
             
         # Handle template inheritance
+        resolved = template
         if 'inherit' in template:
             parent = self.get_entity_template(template['inherit'])
             if parent:
                 # Deep merge parent and child templates
-                merged = self._deep_merge(parent.copy(), template)
-                return merged
-                
-        return template
+                resolved = self._deep_merge(self._thaw(parent), template)
+        
+        resolved = self._freeze(resolved)
+        self._resolved_templates[template_name] = resolved
+        return resolved
     
     def create_entity_from_template(self, world: World, template_name: str,
                                   position: Optional[Dict[str, float]] = None) -> Optional[Entity]:
@@ -69,22 +127,24 @@ class ConfigManager:
         
         # Create components from template
         components = template.get('components', {})
+        add_component = world.add_component
         for component_name, component_data in components.items():
-            # Import the component class dynamically
-            component_class = getattr(__import__('engine.ecs.component', fromlist=[component_name]),
-                                   component_name)
+            component_class = _COMPONENT_CLASSES.get(component_name)
+            if component_class is None:
+                raise AttributeError(f"Unknown component type '{component_name}'")
             
-            # Override position if provided
+            # Copy nested values out of the frozen template so each component
+            # owns its dicts, overriding position if provided
+            component_data = self._thaw(component_data)
             if component_name == 'Position' and position:
                 component_data.update(position)
             
             # Create and add the component
-            component = component_class(**component_data)
-            world.add_component(entity.id, component)
+            add_component(entity.id, component_class(**component_data))
             
         return entity
     
-    def get_behavior_config(self, behavior_type: str) -> Optional[Dict]:
+    def get_behavior_config(self, behavior_type: str) -> Optional[Mapping]:
         """Get behavior configuration by type."""
         return self.behavior_configs.get(behavior_type)
     
@@ -92,15 +152,54 @@ class ConfigManager:
         """Get all generation rules."""
         return self.generation_rules
     
+    @staticmethod
+    def _intern_strings(value: Any) -> Any:
+        """Recursively intern string keys and values so lookups hit identity checks."""
+        if isinstance(value, dict):
+            return {sys.intern(k) if isinstance(k, str) else k: ConfigManager._intern_strings(v)
+                    for k, v in value.items()}
+        if isinstance(value, list):
+            return [ConfigManager._intern_strings(v) for v in value]
+        if isinstance(value, str):
+            return sys.intern(value)
+        return value
+    
+    @staticmethod
+    def _freeze(value: Any) -> Any:
+        """Recursively wrap dicts in read-only MappingProxyType views."""
+        if isinstance(value, dict):
+            return MappingProxyType({k: ConfigManager._freeze(v) for k, v in value.items()})
+        if isinstance(value, list):
+            return [ConfigManager._freeze(v) for v in value]
+        return value
+    
+    @staticmethod
+    def _thaw(value: Any) -> Any:
+        """Recursively copy read-only mappings back into plain dicts."""
+        if isinstance(value, Mapping):
+            return {k: ConfigManager._thaw(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [ConfigManager._thaw(v) for v in value]
+        return value
+    
     @staticmethod
     def _deep_merge(base: Dict, override: Dict) -> Dict:
-        """Deep merge two dictionaries."""
-        result = base.copy()
+        """
+        Deep merge override into base, modifying base in place.
         
-        for key, value in override.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = ConfigManager._deep_merge(result[key], value)
-            else:
-                result[key] = value
+        Nested dicts present in both are merged; anything else in override
+        replaces the value in base. Returns base.
+        """
+        stack = [(base, override)]
+        while stack:
+            dst, src = stack.pop()
+            replaced = {}
+            for key, value in src.items():
+                current = dst.get(key)
+                if isinstance(current, dict) and isinstance(value, dict):
+                    stack.append((current, value))
+                else:
+                    replaced[key] = value
+            dst.update(replaced)
                 
-        return result
+        return base
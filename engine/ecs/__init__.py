@@ -1,10 +1,29 @@
-from .component import Component, Position, Physical, Health, AI, Inventory
-from .entity import Entity
-from .entity_manager import EntityManager
-from .world import World
-from .system import System, MovementSystem, AISystem, HealthSystem
+from importlib import import_module
+
+# Exported names resolve on first access (PEP 562), so importing one
+# submodule does not pull in the rest of the package
+_lazy = {
+    'Component': 'component', 'Position': 'component', 'Physical': 'component',
+    'Health': 'component', 'AI': 'component', 'AIState': 'component',
+    'BehaviorStateId': 'component', 'Inventory': 'component',
+    'Entity': 'entity',
+    'EntityManager': 'entity_manager',
+    'World': 'world',
+    'System': 'system', 'MovementSystem': 'system', 'AISystem': 'system', 'HealthSystem': 'system',
+}
 
 __all__ = [
-    'Component', 'Position', 'Physical', 'Health', 'AI', 'Inventory',
+    'Component', 'Position', 'Physical', 'Health', 'AI', 'AIState', 'BehaviorStateId', 'Inventory',
     'Entity', 'EntityManager', 'World', 'System', 'MovementSystem', 'AISystem', 'HealthSystem'
 ]
+
+def __getattr__(name):
+    module = _lazy.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f'.{module}', __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,52 +1,117 @@
-from typing import Dict, Any
-import attrs
+from typing import Dict, Any, Optional, Union
+from dataclasses import dataclass, field, fields, asdict
+from enum import IntEnum
+import sys
 
-@attrs.define
+@dataclass(slots=True)
 class Component:
     """Base class for all components in the ECS system."""
-    entity_id: int = attrs.field(default=None)
+    entity_id: int = None
     
     def serialize(self) -> Dict[str, Any]:
         """Convert component data to a dictionary for storage."""
-        return attrs.asdict(self)
+        return asdict(self)
     
     @classmethod
     def deserialize(cls, data: Dict[str, Any]) -> 'Component':
         """Create a component instance from stored data."""
         return cls(**data)
 
-@attrs.define
+@dataclass(slots=True)
 class Position(Component):
     """Component for entities that exist in the world space."""
-    x: float = attrs.field(default=0.0)
-    y: float = attrs.field(default=0.0)
-    z: float = attrs.field(default=0.0)
-    level_id: str = attrs.field(default="")
+    x: float = 0.0
+    y: float = 0.0
+    z: float = 0.0
+    level_id: str = ""
 
-@attrs.define
+@dataclass(slots=True)
 class Physical(Component):
     """Component for entities with physical properties."""
-    size: float = attrs.field(default=1.0)
-    solid: bool = attrs.field(default=True)
-    blocking: bool = attrs.field(default=True)
+    size: float = 1.0
+    solid: bool = True
+    blocking: bool = True
 
-@attrs.define
+@dataclass(slots=True)
 class Health(Component):
     """Component for entities that can take damage and die."""
-    current: float = attrs.field(default=100.0)
-    maximum: float = attrs.field(default=100.0)
-    regeneration: float = attrs.field(default=0.0)
+    current: float = 100.0
+    maximum: float = 100.0
+    regeneration: float = 0.0
 
-@attrs.define
+@dataclass(slots=True)
+class Collider(Component):
+    """Component for entities that collide with each other and the map."""
+    radius: float = 0.5
+
+@dataclass(slots=True)
+class Velocity(Component):
+    """Component for entities moved by collision response."""
+    x: float = 0.0
+    y: float = 0.0
+    mass: float = 1.0
+    restitution: float = 0.5
+
+class BehaviorStateId(IntEnum):
+    """Behavior state machine states, usable as indices into jump tables."""
+    IDLE = 0
+    WANDERING = 1
+    PURSUING = 2
+    ATTACKING = 3
+
+def _to_state_id(value: Union[str, int]) -> BehaviorStateId:
+    """Accept state names as well as ids."""
+    if isinstance(value, str):
+        return BehaviorStateId[value.upper()]
+    return BehaviorStateId(value)
+
+@dataclass(slots=True)
+class AIState:
+    """Slotted runtime state of an AI's behavior state machine."""
+    current_state: BehaviorStateId = BehaviorStateId.IDLE
+    idle_time: float = 0.0
+    wander_time: float = 0.0
+    wander_dx: float = 0.0
+    wander_dy: float = 0.0
+    target_id: Optional[int] = None
+    target_distance: float = float('inf')
+    target_detected: bool = False
+    target_frame: int = -1  # frame the target range was last verified
+    attack_cooldown: float = 0.0
+    last_trade: Optional[int] = None
+    investigation_target: Optional[int] = None
+    extra: Dict[str, Any] = field(default_factory=dict)  # template-specific values
+    
+    def __post_init__(self) -> None:
+        # Converted on construction only; writes on the hot path stay plain slot stores
+        self.current_state = _to_state_id(self.current_state)
+
+_AI_STATE_FIELDS = frozenset(f.name for f in fields(AIState))
+
+def _to_ai_state(value: Any) -> AIState:
+    """Build an AIState from a state dict, keeping unknown keys in extra."""
+    if isinstance(value, AIState):
+        return value
+    values = dict(value or {})
+    extra = {key: values.pop(key) for key in list(values) if key not in _AI_STATE_FIELDS}
+    state = AIState(**values)
+    state.extra.update(extra)
+    return state
+
+@dataclass(slots=True)
 class AI(Component):
     """Component for entities with artificial intelligence."""
-    behavior_type: str = attrs.field(default="idle")
-    state: Dict[str, Any] = attrs.field(factory=dict)
-    goals: Dict[str, float] = attrs.field(factory=dict)  # goal_name: priority
+    behavior_type: str = "idle"
+    state: AIState = field(default_factory=AIState)
+    goals: Dict[str, float] = field(default_factory=dict)  # goal_name: priority
+    
+    def __post_init__(self) -> None:
+        self.behavior_type = sys.intern(self.behavior_type)
+        self.state = _to_ai_state(self.state)
 
-@attrs.define
+@dataclass(slots=True)
 class Inventory(Component):
     """Component for entities that can carry items."""
-    items: Dict[int, int] = attrs.field(factory=dict)  # item_id: quantity
-    capacity: float = attrs.field(default=100.0)
-    current_weight: float = attrs.field(default=0.0)
+    items: Dict[int, int] = field(default_factory=dict)  # item_id: quantity
+    capacity: float = 100.0
+    current_weight: float = 0.0
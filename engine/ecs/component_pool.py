@@ -1,26 +1,43 @@
 """Component pool implementation for efficient memory management."""
-from typing import Dict, Type, List, Optional
-import attrs
-from .component import Component
+from typing import Any, Dict, Type, List, Optional, Set, Tuple, Union, get_args, get_origin, get_type_hints
+import dataclasses
+import gc
+import math
+import numpy as np
+from .component import Component, Position, Physical, Health, Velocity, Collider
 
 class ComponentPool:
     """Pool for managing component instances efficiently."""
+    __slots__ = ('component_type', '_active_components', '_free_components', '_chunk_size',
+                 '_preallocatable')
     
     def __init__(self, component_type: Type[Component]):
         self.component_type = component_type
         self._active_components: Dict[int, Component] = {}  # entity_id -> component
         self._free_components: List[Component] = []
-        self._chunk_size = 100  # Number of components to pre-allocate
+        self._chunk_size = 100  # Number of components to pre-allocate, doubled on each growth
+        self._preallocatable = all(
+            f.default is not dataclasses.MISSING or f.default_factory is not dataclasses.MISSING
+            for f in dataclasses.fields(component_type)
+        )
         
     def acquire(self, entity_id: int, **kwargs) -> Component:
-        """Get a component instance, either from pool or create new."""
+        """Get a component instance from the pool, growing it when empty."""
+        if not self._free_components:
+            self._grow_pool()
         if self._free_components:
             component = self._free_components.pop()
             # Reset component state with new parameters
             for key, value in kwargs.items():
                 setattr(component, key, value)
             component.entity_id = entity_id
+            
+            # Re-apply construction-time conversions to the new values
+            post_init = getattr(component, '__post_init__', None)
+            if kwargs and post_init is not None:
+                post_init()
         else:
+            # Types with required fields cannot be built ahead of time
             component = self.component_type(entity_id=entity_id, **kwargs)
             
         self._active_components[entity_id] = component
@@ -44,9 +61,265 @@ class ComponentPool:
 
     def pre_allocate(self, count: int) -> None:
         """Pre-allocate components to reduce runtime allocations."""
-        for _ in range(count):
-            self._free_components.append(self.component_type())
+        if not self._preallocatable:
+            return
+        # A bulk warm-up only creates live objects, so skip the collector's bookkeeping
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            component_type = self.component_type
+            self._free_components.extend(component_type() for _ in range(count))
+        finally:
+            if gc_enabled:
+                gc.enable()
             
     def _grow_pool(self) -> None:
-        """Grow the pool by allocating more components."""
+        """Grow the pool geometrically by allocating more components."""
         self.pre_allocate(self._chunk_size)
+        self._chunk_size *= 2
+
+# Component types stored column-wise by NumericComponentPool
+NUMERIC_COMPONENTS: Set[type] = set()
+
+def numeric_component(component_type: type) -> type:
+    """Class decorator marking a dataclass component for Structure-of-Arrays storage."""
+    NUMERIC_COMPONENTS.add(component_type)
+    return component_type
+
+numeric_component(Position)
+numeric_component(Physical)
+numeric_component(Health)
+numeric_component(Velocity)
+numeric_component(Collider)
+
+_COLUMN_DTYPES = {float: np.float64, int: np.int64, bool: np.bool_}
+
+def _column_specs(component_type: type) -> Dict[str, Tuple[Any, Any, bool]]:
+    """
+    Work out the column layout of a dataclass component.
+
+    Returns:
+        field name -> (dtype, default field, optional), where optional marks an
+        Optional[float] column storing None as NaN
+    """
+    hints = get_type_hints(component_type)
+    specs = {}
+    for f in dataclasses.fields(component_type):
+        if f.name == 'entity_id':
+            continue
+        hint = hints.get(f.name)
+        optional = False
+        if get_origin(hint) is Union:
+            args = [arg for arg in get_args(hint) if arg is not type(None)]
+            if len(args) == 1 and args[0] is float:
+                hint, optional = float, True
+        specs[f.name] = (_COLUMN_DTYPES.get(hint, object), f, optional)
+    return specs
+
+def _field_default(f: dataclasses.Field) -> Any:
+    """Get a fresh default value for a dataclass field."""
+    if f.default_factory is not dataclasses.MISSING:
+        return f.default_factory()
+    return None if f.default is dataclasses.MISSING else f.default
+
+def _view_type(component_type: type, specs: Dict[str, Tuple[Any, Any, bool]]) -> type:
+    """Build a view class exposing one pool slot through component attributes."""
+    def column_property(name: str, dtype: Any, optional: bool) -> property:
+        if dtype is object:
+            def fget(view):
+                return view._pool.fields[name][view._slot]
+        elif optional:
+            def fget(view):
+                value = view._pool.fields[name][view._slot].item()
+                return None if math.isnan(value) else value
+        else:
+            def fget(view):
+                return view._pool.fields[name][view._slot].item()
+        
+        def fset(view, value):
+            view._pool._store(name, view._slot, value)
+        return property(fget, fset)
+    
+    def entity_id(view) -> Optional[int]:
+        entity = int(view._pool.slot_entity[view._slot])
+        return None if entity < 0 else entity
+    
+    def serialize(view) -> Dict[str, Any]:
+        data = {'entity_id': view.entity_id}
+        data.update((name, getattr(view, name)) for name in specs)
+        return data
+    
+    def __repr__(view) -> str:
+        values = ', '.join(f"{name}={value!r}" for name, value in view.serialize().items())
+        return f"{component_type.__name__}({values})"
+    
+    namespace = {name: column_property(name, dtype, optional)
+                 for name, (dtype, _, optional) in specs.items()}
+    namespace.update(__slots__=('_pool', '_slot'), entity_id=property(entity_id),
+                     serialize=serialize, __repr__=__repr__,
+                     component_type=component_type)
+    return type(f"{component_type.__name__}View", (), namespace)
+
+class _ReleasedSlot:
+    """Stand-in pool for views whose slot was released; any access raises."""
+    __slots__ = ()
+    
+    def __getattr__(self, name: str) -> Any:
+        raise ReferenceError("component view used after its entity released the component")
+
+_RELEASED = _ReleasedSlot()
+
+class NumericComponentPool(ComponentPool):
+    """
+    Pool storing a component type's fields as NumPy columns, one slot per entity.
+    
+    Numeric fields (float, int, bool, and Optional[float] with None stored as
+    NaN) live in contiguous arrays in ``fields``, also reachable as attributes
+    (``pool.x[slots]``); other fields are kept in object columns. Slots are
+    stable while an entity holds the component and are recycled through a
+    freelist. ``get`` returns a small view object for callers that work on a
+    single component, while systems read and write whole columns.
+    
+    A view is only valid while its entity holds the component. ``release``
+    detaches the slot's view, so a handle kept past that point raises
+    ReferenceError instead of reading or writing the slot's next owner.
+    """
+    
+    def __init__(self, component_type: Type[Component], capacity: int = 64):
+        self.component_type = component_type
+        self._chunk_size = capacity
+        self._specs = _column_specs(component_type)
+        self._view_type = _view_type(component_type, self._specs)
+        self.fields: Dict[str, np.ndarray] = {
+            name: np.zeros(capacity, dtype=dtype) for name, (dtype, _, _) in self._specs.items()
+        }
+        self.slot_entity = np.full(capacity, -1, dtype=np.int64)
+        self.entity_to_slot: Dict[int, int] = {}
+        self._free_slots: List[int] = list(range(capacity - 1, -1, -1))
+        self._views: List[Optional[Any]] = [None] * capacity
+        self._active: Optional[np.ndarray] = None
+        self.version = 0  # bumped whenever an entity gains or loses a slot
+    
+    def __getattr__(self, name: str) -> np.ndarray:
+        fields = self.__dict__.get('fields')
+        if fields is not None and name in fields:
+            return fields[name]
+        raise AttributeError(f"{type(self).__name__} has no attribute or column {name!r}")
+    
+    def __getitem__(self, entity_id: int) -> Any:
+        view = self.get(entity_id)
+        if view is None:
+            raise KeyError(entity_id)
+        return view
+    
+    def __len__(self) -> int:
+        return len(self.entity_to_slot)
+    
+    def __contains__(self, entity_id: int) -> bool:
+        return entity_id in self.entity_to_slot
+    
+    @property
+    def capacity(self) -> int:
+        """Number of allocated slots."""
+        return len(self.slot_entity)
+    
+    def _store(self, name: str, slot: int, value: Any) -> None:
+        """Write one field value into its column."""
+        if value is None and self._specs[name][2]:
+            value = math.nan
+        self.fields[name][slot] = value
+    
+    def _grow(self, capacity: int) -> None:
+        """Reallocate every column to hold at least capacity slots."""
+        old = self.capacity
+        if capacity <= old:
+            return
+        for name, column in self.fields.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:old] = column
+            self.fields[name] = grown
+        slot_entity = np.full(capacity, -1, dtype=np.int64)
+        slot_entity[:old] = self.slot_entity
+        self.slot_entity = slot_entity
+        self._views.extend([None] * (capacity - old))
+        # Keep handing out the lowest free slots first
+        self._free_slots[:0] = range(capacity - 1, old - 1, -1)
+    
+    def acquire(self, entity_id: int, **kwargs) -> Any:
+        """Assign a slot to an entity and fill it from defaults and kwargs."""
+        slot = self.entity_to_slot.get(entity_id)
+        if slot is None:
+            if not self._free_slots:
+                self._grow(self.capacity * 2)
+            slot = self._free_slots.pop()
+            self.entity_to_slot[entity_id] = slot
+            self.slot_entity[slot] = entity_id
+            self._active = None
+            self.version += 1
+        
+        for name, (_, f, _) in self._specs.items():
+            value = kwargs[name] if name in kwargs else _field_default(f)
+            self._store(name, slot, value)
+        return self._view(slot)
+    
+    def release(self, entity_id: int) -> None:
+        """Return an entity's slot to the freelist."""
+        slot = self.entity_to_slot.pop(entity_id, None)
+        if slot is not None:
+            self.slot_entity[slot] = -1
+            # Detach the old handle; the next owner gets a fresh view
+            view = self._views[slot]
+            if view is not None:
+                view._pool = _RELEASED
+                self._views[slot] = None
+            # Drop references held by object columns
+            for name, (dtype, _, _) in self._specs.items():
+                if dtype is object:
+                    self.fields[name][slot] = None
+            self._free_slots.append(slot)
+            self._active = None
+            self.version += 1
+    
+    def _view(self, slot: int) -> Any:
+        """Get the cached view object for a slot."""
+        view = self._views[slot]
+        if view is None:
+            view = self._view_type.__new__(self._view_type)
+            view._pool = self
+            view._slot = slot
+            self._views[slot] = view
+        return view
+    
+    def get(self, entity_id: int) -> Optional[Any]:
+        """Get a view of the entity's component if it exists."""
+        slot = self.entity_to_slot.get(entity_id)
+        return None if slot is None else self._view(slot)
+    
+    def slot_of(self, entity_id: int) -> int:
+        """Get the slot of an entity, or -1 if it has none."""
+        return self.entity_to_slot.get(entity_id, -1)
+    
+    def slots_of(self, entity_ids: List[int]) -> np.ndarray:
+        """Get the slot of each entity, or -1 where it has none."""
+        entity_to_slot = self.entity_to_slot
+        return np.fromiter((entity_to_slot.get(i, -1) for i in entity_ids),
+                           dtype=np.intp, count=len(entity_ids))
+    
+    def active_slots(self) -> np.ndarray:
+        """Get the occupied slots in ascending order."""
+        if self._active is None:
+            self._active = np.flatnonzero(self.slot_entity >= 0)
+        return self._active
+    
+    def clear(self) -> None:
+        """Release every slot."""
+        for entity_id in list(self.entity_to_slot):
+            self.release(entity_id)
+    
+    def pre_allocate(self, count: int) -> None:
+        """Make room for count more entities without reallocating."""
+        self._grow(len(self.entity_to_slot) + count)
+    
+    def _grow_pool(self) -> None:
+        """Grow the pool by allocating more slots."""
+        self._grow(self.capacity + self._chunk_size)
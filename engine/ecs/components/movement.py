@@ -1,10 +1,12 @@
 """Movement-related components for the ECS."""
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Tuple, Optional
 
+from ..component_pool import numeric_component
 from ...physics.movement import MovementStats, MovementState
 
 
+@numeric_component
 @dataclass
 class TransformComponent:
     """Component for entity position and rotation."""
@@ -15,10 +17,11 @@ class TransformComponent:
     scale_y: float = 1.0
 
 
+@numeric_component
 @dataclass
 class MovementComponent:
     """Component for entity movement capabilities."""
-    stats: MovementStats = MovementStats()
+    stats: MovementStats = field(default_factory=MovementStats)
     state: MovementState = MovementState.IDLE
     velocity_x: float = 0.0
     velocity_y: float = 0.0
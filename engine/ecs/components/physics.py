@@ -2,9 +2,11 @@
 from dataclasses import dataclass
 from typing import Optional
 
+from ..component_pool import numeric_component
 from ...physics.collision import CollisionShape, ShapeType
 
 
+@numeric_component
 @dataclass
 class ColliderComponent:
     """Component for collision detection."""
@@ -13,6 +15,7 @@ class ColliderComponent:
     layer: int = 0  # Collision layer for filtering
 
 
+@numeric_component
 @dataclass
 class RigidbodyComponent:
     """Component for physics simulation."""
@@ -21,3 +24,5 @@ class RigidbodyComponent:
     gravity_scale: float = 1.0
     is_kinematic: bool = False  # If True, not affected by forces/gravity
     fixed_rotation: bool = False  # If True, rotation is not affected by physics
+    velocity_x: float = 0.0
+    velocity_y: float = 0.0
@@ -1,11 +1,35 @@
 """Entity class for the ECS system."""
-from typing import Dict, Type, Optional
-import attrs
+from typing import Dict, Type, Optional, TypeVar
+from .component import Component
+
+C = TypeVar('C', bound=Component)
 
-@attrs.define
 class Entity:
     """Base class for all entities in the game."""
-    id: int = attrs.field()
+    __slots__ = ('id', 'components')
+    
+    def __init__(self, id: int):
+        self.id = id
+        self.components: Dict[Type[Component], Component] = {}
+    
+    def add_component(self, component: Component) -> None:
+        """Attach a component, replacing any existing one of the same type."""
+        self.components[type(component)] = component
+    
+    def remove_component(self, component_type: Type[Component]) -> None:
+        """Detach the component of the given type, if present."""
+        self.components.pop(component_type, None)
+    
+    def get_component(self, component_type: Type[C]) -> Optional[C]:
+        """Get the component of the given type, if present."""
+        return self.components.get(component_type)
+    
+    def has_component(self, component_type: Type[Component]) -> bool:
+        """Check whether a component of the given type is attached."""
+        return component_type in self.components
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={self.id!r})"
     
     def __hash__(self) -> int:
         return self.id
@@ -1,34 +1,79 @@
-from typing import Dict, Type, Optional, Set
+from typing import Deque, Dict, List, Type, Optional, Set
+from collections import deque
 from .entity import Entity
 from .component import Component
-from .component_pool import ComponentPool
+from .component_pool import ComponentPool, NumericComponentPool, NUMERIC_COMPONENTS
 
 class EntityManager:
     """Manages entities and their components."""
+    __slots__ = ('_next_entity_id', '_free_ids', '_entities', '_component_pools',
+                 '_component_bits', '_bit_types', '_entity_masks', '_archetypes',
+                 '_structural_epoch')
     
     def __init__(self):
         self._next_entity_id = 1
+        self._free_ids: Deque[int] = deque()  # ids of destroyed entities, reused oldest first
         self._entities: Dict[int, Entity] = {}
         self._component_pools: Dict[Type[Component], ComponentPool] = {}
-        self._entity_components: Dict[int, Set[Type[Component]]] = {}
+        
+        # Each component type gets a bit; an entity's mask is the OR of its
+        # components' bits, and entities are grouped by mask into archetypes
+        self._component_bits: Dict[Type[Component], int] = {}
+        self._bit_types: List[Type[Component]] = []
+        self._entity_masks: Dict[int, int] = {}
+        self._archetypes: Dict[int, Set[int]] = {}
+        
+        # Bumped by every structural change, letting queries detect stale caches
+        self._structural_epoch = 0
         
     def create_entity(self) -> Entity:
         """Create a new entity."""
-        entity_id = self._next_entity_id
-        self._next_entity_id += 1
+        if self._free_ids:
+            entity_id = self._free_ids.popleft()
+        else:
+            entity_id = self._next_entity_id
+            self._next_entity_id += 1
         entity = Entity(entity_id)
         self._entities[entity_id] = entity
-        self._entity_components[entity_id] = set()
+        self._set_mask(entity_id, 0)
         return entity
         
+    def _component_bit(self, component_type: Type[Component]) -> int:
+        """Get the bit of a component type, assigning the next free one on first use."""
+        bit = self._component_bits.get(component_type)
+        if bit is None:
+            bit = 1 << len(self._bit_types)
+            self._component_bits[component_type] = bit
+            self._bit_types.append(component_type)
+        return bit
+        
+    def _set_mask(self, entity_id: int, mask: int) -> None:
+        """Move an entity to the archetype of its new component mask."""
+        old = self._entity_masks.get(entity_id)
+        if old is not None:
+            self._leave_archetype(entity_id, old)
+        self._entity_masks[entity_id] = mask
+        self._archetypes.setdefault(mask, set()).add(entity_id)
+        
+    def _leave_archetype(self, entity_id: int, mask: int) -> None:
+        """Remove an entity from an archetype, dropping the archetype once empty."""
+        members = self._archetypes[mask]
+        members.discard(entity_id)
+        if not members:
+            del self._archetypes[mask]
+        
     def destroy_entity(self, entity_id: int) -> None:
         """Destroy an entity and all its components."""
         if entity_id in self._entities:
             # Release all components back to their pools
-            component_types = self._entity_components.pop(entity_id, set())
-            for comp_type in component_types:
-                self._component_pools[comp_type].release(entity_id)
+            mask = self._entity_masks.pop(entity_id)
+            for index, comp_type in enumerate(self._bit_types):
+                if mask >> index & 1:
+                    self._component_pools[comp_type].release(entity_id)
+            self._leave_archetype(entity_id, mask)
             del self._entities[entity_id]
+            self._structural_epoch += 1
+            self._free_ids.append(entity_id)
             
     def add_component(self, entity_id: int, component_type: Type[Component], **kwargs) -> Component:
         """Add a component to an entity."""
@@ -37,36 +82,63 @@ class EntityManager:
             
         # Get or create component pool
         if component_type not in self._component_pools:
-            self._component_pools[component_type] = ComponentPool(component_type)
+            pool_type = NumericComponentPool if component_type in NUMERIC_COMPONENTS else ComponentPool
+            pool = self._component_pools[component_type] = pool_type(component_type)
+            # Warm the pool up front so spawns mid-frame reuse instances
+            pool.pre_allocate(pool._chunk_size)
             
         # Get component from pool
         component = self._component_pools[component_type].acquire(entity_id, **kwargs)
-        self._entity_components[entity_id].add(component_type)
+        mask = self._entity_masks[entity_id]
+        bit = self._component_bit(component_type)
+        if not mask & bit:
+            self._set_mask(entity_id, mask | bit)
+        self._structural_epoch += 1
         return component
         
     def remove_component(self, entity_id: int, component_type: Type[Component]) -> None:
         """Remove a component from an entity."""
         if entity_id in self._entities and component_type in self._component_pools:
             self._component_pools[component_type].release(entity_id)
-            self._entity_components[entity_id].discard(component_type)
+            mask = self._entity_masks[entity_id]
+            bit = self._component_bits[component_type]
+            if mask & bit:
+                self._set_mask(entity_id, mask & ~bit)
+                self._structural_epoch += 1
             
     def get_component(self, entity_id: int, component_type: Type[Component]) -> Optional[Component]:
         """Get a component from an entity."""
-        if component_type in self._component_pools:
-            return self._component_pools[component_type].get(entity_id)
-        return None
+        pool = self._component_pools.get(component_type)
+        return None if pool is None else pool.get(entity_id)
+        
+    def get_entity(self, entity_id: int) -> Optional[Entity]:
+        """Get a live entity by its id."""
+        return self._entities.get(entity_id)
+        
+    def get_pool(self, component_type: Type[Component]) -> Optional[ComponentPool]:
+        """Get the pool holding a component type, if any entity has used it."""
+        return self._component_pools.get(component_type)
         
     def has_component(self, entity_id: int, component_type: Type[Component]) -> bool:
         """Check if an entity has a component."""
-        return component_type in self._entity_components.get(entity_id, set())
+        bit = self._component_bits.get(component_type)
+        return bit is not None and bool(self._entity_masks.get(entity_id, 0) & bit)
         
     def get_entities_with_components(self, *component_types: Type[Component]) -> Set[int]:
         """Get all entities that have all the specified component types."""
         if not component_types:
             return set()
             
+        required = 0
+        for comp_type in component_types:
+            bit = self._component_bits.get(comp_type)
+            if bit is None:
+                return set()
+            required |= bit
+        
+        # Whole archetypes match or fail together
         result = set()
-        for entity_id, components in self._entity_components.items():
-            if all(comp_type in components for comp_type in component_types):
-                result.add(entity_id)
+        for mask, members in self._archetypes.items():
+            if mask & required == required:
+                result |= members
         return result
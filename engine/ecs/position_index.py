@@ -0,0 +1,245 @@
+"""Structure-of-Arrays index of entity positions for vectorized spatial queries."""
+from typing import Dict, List, Optional, Set, Tuple
+import math
+from operator import attrgetter
+import numpy as np
+from .component import Position
+
+_get_x = attrgetter('x')
+_get_y = attrgetter('y')
+
+# Indexes this small are scanned directly instead of through the grid
+BRUTE_FORCE_MAX = 64
+
+class PositionIndex:
+    """
+    Keeps the positions of physical entities in contiguous NumPy arrays.
+
+    Rows are dense: removing an entity moves the last row into the freed slot,
+    so every query can operate on the ``[:count]`` prefix of the arrays.
+    Entities are also bucketed into a uniform grid so radius queries only
+    touch the cells around the query point.
+    """
+
+    def __init__(self, capacity: int = 64, cell_size: float = 8.0):
+        self._xs = np.zeros(capacity, dtype=np.float32)
+        self._ys = np.zeros(capacity, dtype=np.float32)
+        self._ids = np.zeros(capacity, dtype=np.int32)
+        self._cxs = np.zeros(capacity, dtype=np.int32)
+        self._cys = np.zeros(capacity, dtype=np.int32)
+        self._positions: List[Position] = []
+        self._row_of: Dict[int, int] = {}
+        self._count = 0
+        self._cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, entity_id: int) -> bool:
+        return entity_id in self._row_of
+
+    @property
+    def cell_size(self) -> float:
+        """Edge length of a grid cell."""
+        return self._cell_size
+
+    def set_cell_size(self, cell_size: float) -> None:
+        """Change the grid resolution and re-bucket every entity."""
+        self._cell_size = cell_size
+        self._cells.clear()
+        n = self._count
+        if n:
+            self._cxs[:n] = np.floor(self._xs[:n] / cell_size)
+            self._cys[:n] = np.floor(self._ys[:n] / cell_size)
+            for row in range(n):
+                key = (int(self._cxs[row]), int(self._cys[row]))
+                self._cells.setdefault(key, set()).add(int(self._ids[row]))
+
+    def _cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        """Get grid cell coordinates for a position."""
+        return (math.floor(x / self._cell_size), math.floor(y / self._cell_size))
+
+    def _set_cell(self, row: int, cell: Tuple[int, int]) -> None:
+        """Move a row's entity into a new grid cell."""
+        entity_id = int(self._ids[row])
+        old = (int(self._cxs[row]), int(self._cys[row]))
+        bucket = self._cells.get(old)
+        if bucket is not None:
+            bucket.discard(entity_id)
+            if not bucket:
+                del self._cells[old]
+        self._cells.setdefault(cell, set()).add(entity_id)
+        self._cxs[row], self._cys[row] = cell
+
+    def _grow(self) -> None:
+        """Double the capacity of the backing arrays."""
+        capacity = max(1, len(self._xs)) * 2
+        for name in ('_xs', '_ys', '_ids', '_cxs', '_cys'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self._count] = old[:self._count]
+            setattr(self, name, new)
+
+    def insert(self, entity_id: int, position: Position) -> None:
+        """Add an entity, or rebind it to a new Position component."""
+        row = self._row_of.get(entity_id)
+        if row is None:
+            if self._count == len(self._xs):
+                self._grow()
+            row = self._count
+            self._count += 1
+            self._row_of[entity_id] = row
+            self._ids[row] = entity_id
+            self._positions.append(position)
+            cell = self._cell_of(position.x, position.y)
+            self._cells.setdefault(cell, set()).add(entity_id)
+            self._cxs[row], self._cys[row] = cell
+        else:
+            self._positions[row] = position
+            self.update(entity_id, position.x, position.y)
+        self._xs[row] = position.x
+        self._ys[row] = position.y
+
+    def remove(self, entity_id: int) -> None:
+        """Remove an entity, keeping the arrays dense."""
+        row = self._row_of.pop(entity_id, None)
+        if row is None:
+            return
+
+        cell = (int(self._cxs[row]), int(self._cys[row]))
+        bucket = self._cells.get(cell)
+        if bucket is not None:
+            bucket.discard(entity_id)
+            if not bucket:
+                del self._cells[cell]
+
+        last = self._count - 1
+        if row != last:
+            moved_id = int(self._ids[last])
+            self._xs[row] = self._xs[last]
+            self._ys[row] = self._ys[last]
+            self._ids[row] = moved_id
+            self._cxs[row] = self._cxs[last]
+            self._cys[row] = self._cys[last]
+            self._positions[row] = self._positions[last]
+            self._row_of[moved_id] = row
+        self._positions.pop()
+        self._count = last
+
+    def update(self, entity_id: int, x: float, y: float) -> None:
+        """Record a new position for an indexed entity."""
+        row = self._row_of.get(entity_id)
+        if row is not None:
+            self._xs[row] = x
+            self._ys[row] = y
+            cell = self._cell_of(x, y)
+            if cell[0] != self._cxs[row] or cell[1] != self._cys[row]:
+                self._set_cell(row, cell)
+
+    def refresh(self) -> None:
+        """Re-read every indexed Position component into the arrays."""
+        n = self._count
+        if n:
+            positions = self._positions
+            self._xs[:n] = np.fromiter(map(_get_x, positions), dtype=np.float32, count=n)
+            self._ys[:n] = np.fromiter(map(_get_y, positions), dtype=np.float32, count=n)
+            
+            # Re-bucket only the rows whose cell changed
+            cxs = np.floor(self._xs[:n] / self._cell_size).astype(np.int32)
+            cys = np.floor(self._ys[:n] / self._cell_size).astype(np.int32)
+            moved = np.flatnonzero((cxs != self._cxs[:n]) | (cys != self._cys[:n]))
+            for row in moved.tolist():
+                self._set_cell(row, (int(cxs[row]), int(cys[row])))
+
+    @property
+    def xs(self) -> np.ndarray:
+        """X coordinates of the indexed rows."""
+        return self._xs[:self._count]
+
+    @property
+    def ys(self) -> np.ndarray:
+        """Y coordinates of the indexed rows."""
+        return self._ys[:self._count]
+
+    def rows(self, entity_ids: List[Optional[int]]) -> np.ndarray:
+        """Get the row of each entity, or -1 where it is not indexed."""
+        row_of = self._row_of
+        return np.fromiter((row_of.get(i, -1) for i in entity_ids),
+                           dtype=np.intp, count=len(entity_ids))
+
+    def get(self, entity_id: int) -> Optional[Tuple[float, float]]:
+        """Get the indexed position of an entity."""
+        row = self._row_of.get(entity_id)
+        if row is None:
+            return None
+        return float(self._xs[row]), float(self._ys[row])
+
+    def query_radius(self, x: float, y: float, radius: float,
+                     exclude_id: Optional[int] = None) -> Optional[Tuple[int, float]]:
+        """
+        Find the nearest indexed entity within radius of a point.
+
+        Returns:
+            (entity_id, distance) of the nearest match, or None
+        """
+        n = self._count
+        if n == 0:
+            return None
+
+        reach = math.ceil(radius / self._cell_size)
+        cells = self._cells
+        row_of = self._row_of
+        exclude_row = row_of.get(exclude_id) if exclude_id is not None else None
+
+        # Few entities, or a radius covering more cells than are occupied:
+        # one pass over the dense arrays beats gathering cell buckets
+        if n <= BRUTE_FORCE_MAX or (2 * reach + 1) ** 2 > len(cells):
+            dx = self._xs[:n] - x
+            dy = self._ys[:n] - y
+            d2 = dx * dx + dy * dy
+            if exclude_row is not None:
+                d2[exclude_row] = np.inf
+            i = int(np.argmin(d2))
+            if d2[i] <= radius * radius:
+                return int(self._ids[i]), math.sqrt(float(d2[i]))
+            return None
+
+        # Gather candidate rows from the cells overlapping the query circle,
+        # rejecting cells whose nearest edge is already out of range
+        center_x, center_y = self._cell_of(x, y)
+        size = self._cell_size
+        r2 = radius * radius
+        gap_y = []
+        for cy in range(center_y - reach, center_y + reach + 1):
+            gy = max(cy * size - y, y - (cy + 1) * size, 0.0)
+            gap_y.append((cy, gy * gy))
+        candidates = []
+        for cx in range(center_x - reach, center_x + reach + 1):
+            gx = max(cx * size - x, x - (cx + 1) * size, 0.0)
+            gx2 = gx * gx
+            if gx2 > r2:
+                continue
+            for cy, gy2 in gap_y:
+                if gx2 + gy2 > r2:
+                    continue
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    candidates.extend(bucket)
+        if exclude_row is not None:
+            try:
+                candidates.remove(exclude_id)
+            except ValueError:
+                pass
+        if not candidates:
+            return None
+
+        rows = np.fromiter((row_of[i] for i in candidates), dtype=np.intp, count=len(candidates))
+        dx = self._xs[rows] - x
+        dy = self._ys[rows] - y
+        d2 = dx * dx + dy * dy
+
+        i = int(np.argmin(d2))
+        if d2[i] <= r2:
+            return int(self._ids[rows[i]]), math.sqrt(float(d2[i]))
+        return None
@@ -10,40 +10,46 @@ class Query:
         self.entity_manager = entity_manager
         self.component_types = component_types
         self._cached_entities: Set[int] = set()
-        self._is_cache_valid = False
+        self._cached_tuples: List[Tuple[int, Tuple[Component, ...]]] = []
+        self._cached_epoch = -1  # structural epoch the cache was built at
         
     def _update_cache(self) -> None:
-        """Update the cached set of matching entities."""
+        """Update the cached matching entities and their resolved components."""
         self._cached_entities = self.entity_manager.get_entities_with_components(*self.component_types)
-        self._is_cache_valid = True
+        # Matching entities have every type, so all their pools exist
+        if self._cached_entities:
+            gets = [self.entity_manager.get_pool(component_type).get
+                    for component_type in self.component_types]
+            self._cached_tuples = [(entity_id, tuple(get(entity_id) for get in gets))
+                                   for entity_id in self._cached_entities]
+        else:
+            self._cached_tuples = []
+        self._cached_epoch = self.entity_manager._structural_epoch
+        
+    def _ensure_cache(self) -> None:
+        """Rebuild the cache if entities or components changed since it was built."""
+        if self._cached_epoch != self.entity_manager._structural_epoch:
+            self._update_cache()
         
     def invalidate(self) -> None:
-        """Mark the cache as invalid."""
-        self._is_cache_valid = False
+        """Force the cache to be rebuilt on next access."""
+        self._cached_epoch = -1
         
     def iter_entities(self) -> Iterator[int]:
         """Iterate over entity IDs that match the query."""
-        if not self._is_cache_valid:
-            self._update_cache()
+        self._ensure_cache()
         yield from self._cached_entities
         
-    def iter_components(self) -> Iterator[Tuple[int, List[Component]]]:
+    def iter_components(self) -> Iterator[Tuple[int, Tuple[Component, ...]]]:
         """Iterate over matching entities and their requested components."""
-        for entity_id in self.iter_entities():
-            components = []
-            for component_type in self.component_types:
-                component = self.entity_manager.get_component(entity_id, component_type)
-                if component is None:  # This shouldn't happen if cache is valid
-                    continue
-                components.append(component)
-            yield entity_id, components
+        self._ensure_cache()
+        yield from self._cached_tuples
             
-    def __iter__(self) -> Iterator[Tuple[int, List[Component]]]:
+    def __iter__(self) -> Iterator[Tuple[int, Tuple[Component, ...]]]:
         """Make the query iterable."""
         return self.iter_components()
         
     def __len__(self) -> int:
         """Get the number of matching entities."""
-        if not self._is_cache_valid:
-            self._update_cache()
+        self._ensure_cache()
         return len(self._cached_entities)
@@ -1,16 +1,16 @@
-from typing import List, Type
+from typing import List, Tuple, Type
 from .world import World
-from .component import Component
+from .component import Component, Position, Physical, AI, Health
 
 class System:
     """
     Base class for all systems in the game.
     Systems operate on entities with specific component combinations.
     """
+    required_components: Tuple[Type[Component], ...] = ()
     
     def __init__(self, world: World):
         self.world = world
-        self.required_components: List[Type[Component]] = []
         
     def update(self, dt: float) -> None:
         """
@@ -27,11 +27,7 @@ class System:
 
 class MovementSystem(System):
     """System for handling entity movement."""
-    
-    def __init__(self, world: World):
-        super().__init__(world)
-        from .component import Position, Physical
-        self.required_components = [Position, Physical]
+    required_components = (Position, Physical)
     
     def update(self, dt: float) -> None:
         """Update positions of all entities with Position and Physical components."""
@@ -41,11 +37,7 @@ class MovementSystem(System):
 
 class AISystem(System):
     """System for processing AI behavior."""
-    
-    def __init__(self, world: World):
-        super().__init__(world)
-        from .component import AI, Position
-        self.required_components = [AI, Position]
+    required_components = (AI, Position)
     
     def update(self, dt: float) -> None:
         """Update AI behavior for all entities with AI and Position components."""
@@ -55,17 +47,12 @@ class AISystem(System):
 
 class HealthSystem(System):
     """System for processing health-related effects."""
-    
-    def __init__(self, world: World):
-        super().__init__(world)
-        from .component import Health
-        self.required_components = [Health]
+    required_components = (Health,)
     
     def update(self, dt: float) -> None:
         """Update health status for all entities with Health component."""
-        entities = self.get_relevant_entities()
-        for entity in entities:
-            health = entity.get_component(self.required_components[0])
+        for entity in self.get_relevant_entities():
+            health = entity.components[Health]
             if health.regeneration > 0:
                 health.current = min(health.current + health.regeneration * dt,
                                   health.maximum)
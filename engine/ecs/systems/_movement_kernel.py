@@ -0,0 +1,66 @@
+"""Array kernel advancing ECS movement one tick."""
+from typing import Tuple
+import numpy as np
+
+# Distance and angle below which a target counts as reached
+MOVE_THRESHOLD = 0.1
+ROTATION_THRESHOLD = 0.1
+
+def step(x: np.ndarray, y: np.ndarray, rot: np.ndarray, vx: np.ndarray, vy: np.ndarray,
+         tx: np.ndarray, ty: np.ndarray, trot: np.ndarray, turn: np.ndarray,
+         walk: np.ndarray, run: np.ndarray, running: np.ndarray,
+         dt: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Advance movers one tick, updating the arrays in place.
+    
+    Targets are NaN where an entity has none; reached targets are reset to NaN.
+    
+    Args:
+        x, y, rot: Transform positions and rotations in degrees
+        vx, vy: Velocities
+        tx, ty, trot: Target positions and rotations
+        turn, walk, run: Turn speed and walk/run speeds
+        running: Whether each entity is in the running state
+        dt: Timestep
+        
+    Returns:
+        (moving, arrived) masks of entities steering toward or snapping to their target
+    """
+    # Steer toward target positions
+    targeted = ~(np.isnan(tx) | np.isnan(ty))
+    dx = np.where(targeted, tx - x, 0.0)
+    dy = np.where(targeted, ty - y, 0.0)
+    distance = np.hypot(dx, dy)
+    moving = targeted & (distance > MOVE_THRESHOLD)
+    arrived = targeted & ~moving
+    
+    scale = np.divide(np.where(running, run, walk), distance,
+                      out=np.zeros_like(distance), where=moving)
+    np.copyto(vx, dx * scale, where=moving)
+    np.copyto(vy, dy * scale, where=moving)
+    
+    np.copyto(x, tx, where=arrived)
+    np.copyto(y, ty, where=arrived)
+    vx[arrived] = 0.0
+    vy[arrived] = 0.0
+    tx[arrived] = np.nan
+    ty[arrived] = np.nan
+    
+    # Turn toward target rotations along the shortest path
+    turning = ~np.isnan(trot)
+    if turning.any():
+        target = np.mod(trot, 360.0)
+        # Wrapped into [-180, 180) without branching on the sign
+        diff = np.mod(target - rot + 180.0, 360.0) - 180.0
+        magnitude = np.abs(diff)
+        turn_step = turn * dt
+        rotating = turning & (magnitude > ROTATION_THRESHOLD)
+        partial = rotating & (magnitude >= turn_step)
+        np.copyto(rot, np.where(partial, rot + np.copysign(turn_step, diff), target),
+                  where=turning)
+        trot[turning & ~rotating] = np.nan
+    
+    # Integrate
+    x += vx * dt
+    y += vy * dt
+    return moving, arrived
@@ -1,85 +1,82 @@
 """Movement system for the ECS."""
 from typing import Tuple, Optional
+from itertools import chain
+from operator import attrgetter
+import math
 import numpy as np
 
 from ..entity import Entity
 from ..entity_manager import EntityManager
 from ..components.movement import MovementComponent, TransformComponent
+from ._movement_kernel import step
 from ...physics.movement import MovementState
 
+_get_speeds = attrgetter('turn_speed', 'walk_speed', 'run_speed')
+
 
 class MovementSystem:
     """System for handling entity movement."""
     
     def __init__(self, entity_manager: EntityManager):
         self.entity_manager = entity_manager
+        self._pairing_key: Optional[tuple] = None
+        self._pairing: Tuple[np.ndarray, np.ndarray] = (np.empty(0, np.intp), np.empty(0, np.intp))
     
     def update(self, dt: float) -> None:
-        """Update movement for all relevant entities."""
-        # Get all entities with movement components
-        moving_entities = self.entity_manager.get_entities_with_components(
-            MovementComponent, TransformComponent
-        )
+        """Update movement for all relevant entities as batched array operations."""
+        movement_pool = self.entity_manager.get_pool(MovementComponent)
+        transform_pool = self.entity_manager.get_pool(TransformComponent)
+        if not movement_pool or not transform_pool:
+            return
         
-        for entity in moving_entities:
-            movement = self.entity_manager.get_component(entity, MovementComponent)
-            transform = self.entity_manager.get_component(entity, TransformComponent)
-            
-            # Handle movement to target position
-            if movement.target_x is not None and movement.target_y is not None:
-                dx = movement.target_x - transform.x
-                dy = movement.target_y - transform.y
-                distance = np.sqrt(dx * dx + dy * dy)
-                
-                if distance > 0.1:  # Movement threshold
-                    # Calculate direction
-                    direction_x = dx / distance
-                    direction_y = dy / distance
-                    
-                    # Set velocity based on state
-                    speed = (movement.stats.run_speed 
-                            if movement.state == MovementState.RUNNING
-                            else movement.stats.walk_speed)
-                    
-                    movement.velocity_x = direction_x * speed
-                    movement.velocity_y = direction_y * speed
-                    movement.state = MovementState.WALKING
-                else:
-                    # Reached target
-                    transform.x = movement.target_x
-                    transform.y = movement.target_y
-                    movement.target_x = None
-                    movement.target_y = None
-                    movement.velocity_x = 0
-                    movement.velocity_y = 0
-                    movement.state = MovementState.IDLE
-            
-            # Handle rotation to target
-            if movement.target_rotation is not None:
-                current_rotation = transform.rotation % 360
-                target_rotation = movement.target_rotation % 360
-                
-                # Calculate shortest rotation path
-                diff = target_rotation - current_rotation
-                if diff > 180:
-                    diff -= 360
-                elif diff < -180:
-                    diff += 360
-                
-                # Apply rotation
-                if abs(diff) > 0.1:  # Rotation threshold
-                    rotation_speed = movement.stats.turn_speed * dt
-                    if abs(diff) < rotation_speed:
-                        transform.rotation = target_rotation
-                    else:
-                        transform.rotation += np.sign(diff) * rotation_speed
-                else:
-                    transform.rotation = target_rotation
-                    movement.target_rotation = None
-            
-            # Apply movement
-            transform.x += movement.velocity_x * dt
-            transform.y += movement.velocity_y * dt
+        # Pair up the movement and transform slots of every moving entity,
+        # reusing the pairing until either pool gains or loses an entity
+        key = (movement_pool, movement_pool.version, transform_pool, transform_pool.version)
+        if self._pairing_key != key:
+            m = movement_pool.active_slots()
+            t = transform_pool.slots_of(movement_pool.slot_entity[m].tolist())
+            has_transform = t >= 0
+            self._pairing = (m[has_transform], t[has_transform])
+            self._pairing_key = key
+        m, t = self._pairing
+        if len(m) == 0:
+            return
+        
+        # Speeds live on the stats objects, so only gather them for entities
+        # that are steering or turning
+        tx = movement_pool.target_x[m]
+        ty = movement_pool.target_y[m]
+        trot = movement_pool.target_rotation[m]
+        active = ~((np.isnan(tx) | np.isnan(ty)) & np.isnan(trot))
+        speeds = np.zeros((len(m), 3))
+        if active.any():
+            stats = movement_pool.stats[m[active]]
+            speeds[active] = np.fromiter(
+                chain.from_iterable(map(_get_speeds, stats)), dtype=np.float64, count=3 * len(stats)
+            ).reshape(-1, 3)
+        state = movement_pool.state[m]
+        
+        x = transform_pool.x[t]
+        y = transform_pool.y[t]
+        rotation = transform_pool.rotation[t]
+        vx = movement_pool.velocity_x[m]
+        vy = movement_pool.velocity_y[m]
+        moving, arrived = step(x, y, rotation, vx, vy, tx, ty, trot,
+                               speeds[:, 0], speeds[:, 1], speeds[:, 2],
+                               state == MovementState.RUNNING, dt)
+        
+        state[moving] = MovementState.WALKING
+        state[arrived] = MovementState.IDLE
+        movement_pool.state[m] = state
+        
+        transform_pool.x[t] = x
+        transform_pool.y[t] = y
+        transform_pool.rotation[t] = rotation
+        movement_pool.velocity_x[m] = vx
+        movement_pool.velocity_y[m] = vy
+        movement_pool.target_x[m] = tx
+        movement_pool.target_y[m] = ty
+        movement_pool.target_rotation[m] = trot
     
     def set_movement_target(
         self,
@@ -89,7 +86,7 @@ class MovementSystem:
         running: bool = False
     ) -> None:
         """Set a target position for an entity to move to."""
-        movement = self.entity_manager.get_component(entity, MovementComponent)
+        movement = self.entity_manager.get_component(entity.id, MovementComponent)
         if movement:
             movement.target_x = target_x
             movement.target_y = target_y
@@ -97,13 +94,13 @@ class MovementSystem:
     
     def set_rotation_target(self, entity: Entity, target_rotation: float) -> None:
         """Set a target rotation for an entity."""
-        movement = self.entity_manager.get_component(entity, MovementComponent)
+        movement = self.entity_manager.get_component(entity.id, MovementComponent)
         if movement:
             movement.target_rotation = target_rotation
     
     def stop_movement(self, entity: Entity) -> None:
         """Stop an entity's movement."""
-        movement = self.entity_manager.get_component(entity, MovementComponent)
+        movement = self.entity_manager.get_component(entity.id, MovementComponent)
         if movement:
             movement.target_x = None
             movement.target_y = None
@@ -118,14 +115,14 @@ class MovementSystem:
         running: bool = False
     ) -> None:
         """Set direct movement input for an entity."""
-        movement = self.entity_manager.get_component(entity, MovementComponent)
+        movement = self.entity_manager.get_component(entity.id, MovementComponent)
         if movement:
             # Clear any target position
             movement.target_x = None
             movement.target_y = None
             
             # Calculate velocity
-            length = np.sqrt(direction[0]**2 + direction[1]**2)
+            length = math.hypot(direction[0], direction[1])
             if length > 0:
                 # Normalize and scale by speed
                 speed = (movement.stats.run_speed if running
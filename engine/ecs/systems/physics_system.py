@@ -1,13 +1,17 @@
 """Physics system for the ECS."""
-from typing import Dict, Set, Tuple
+from typing import Dict, Optional, Set, Tuple
 import numpy as np
 
 from ..entity import Entity
 from ..entity_manager import EntityManager
+from ..component_pool import NumericComponentPool
 from ..components.physics import ColliderComponent, RigidbodyComponent
 from ..components.movement import TransformComponent
 from ...physics.collision import CollisionSystem, CollisionResult
 
+# Speed below which a body with no gravity comes to rest
+REST_SPEED = 1e-4
+
 
 class PhysicsSystem:
     """System for handling physics simulation and collision detection."""
@@ -16,62 +20,84 @@ class PhysicsSystem:
         self.entity_manager = entity_manager
         self.collision_system = collision_system
         self.gravity = (0.0, -9.81)  # Default gravity
+        self._rows_key: Optional[tuple] = None
+        self._rows: Tuple[np.ndarray, np.ndarray, np.ndarray] = (
+            np.empty(0, np.intp), np.empty(0, np.intp), np.empty(0, np.intp)
+        )
+    
+    def _body_rows(self, rigidbodies: NumericComponentPool, colliders: NumericComponentPool,
+                   transforms: NumericComponentPool) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the rigidbody, collider and transform slots of every physics body."""
+        # Reuse the rows until any of the pools gains or loses an entity
+        key = (rigidbodies, rigidbodies.version, colliders, colliders.version,
+               transforms, transforms.version)
+        if self._rows_key != key:
+            r = rigidbodies.active_slots()
+            entity_ids = rigidbodies.slot_entity[r].tolist()
+            c = colliders.slots_of(entity_ids)
+            t = transforms.slots_of(entity_ids)
+            complete = (c >= 0) & (t >= 0)
+            self._rows = (r[complete], c[complete], t[complete])
+            self._rows_key = key
+        return self._rows
     
     def update(self, dt: float) -> None:
-        """Update physics for all relevant entities."""
-        # Get all entities with physics components
-        physics_entities = self.entity_manager.get_entities_with_components(
-            RigidbodyComponent, ColliderComponent, TransformComponent
-        )
+        """Integrate all physics bodies as batched operations over the pool columns."""
+        rigidbodies = self.entity_manager.get_pool(RigidbodyComponent)
+        colliders = self.entity_manager.get_pool(ColliderComponent)
+        transforms = self.entity_manager.get_pool(TransformComponent)
+        if not rigidbodies or not colliders or not transforms:
+            return
         
-        for entity in physics_entities:
-            rigidbody = self.entity_manager.get_component(entity, RigidbodyComponent)
-            collider = self.entity_manager.get_component(entity, ColliderComponent)
-            transform = self.entity_manager.get_component(entity, TransformComponent)
-            
-            if not rigidbody.is_kinematic:
-                # Apply gravity
-                gravity_force = (
-                    self.gravity[0] * rigidbody.gravity_scale,
-                    self.gravity[1] * rigidbody.gravity_scale
-                )
-                
-                # Update velocity
-                velocity_x = transform.velocity_x + gravity_force[0] * dt
-                velocity_y = transform.velocity_y + gravity_force[1] * dt
-                
-                # Apply drag
-                drag_factor = 1.0 - (rigidbody.drag * dt)
-                velocity_x *= drag_factor
-                velocity_y *= drag_factor
-                
-                # Calculate new position
-                new_x = transform.x + velocity_x * dt
-                new_y = transform.y + velocity_y * dt
-                
-                # Check for collisions
-                collision = self.collision_system.check_tile_collision(
-                    collider.shape,
-                    new_x,
-                    new_y
-                )
-                
-                if collision.collided and not collider.is_trigger:
-                    # Resolve collision
-                    new_x = transform.x + velocity_x * dt - collision.penetration_x
-                    new_y = transform.y + velocity_y * dt - collision.penetration_y
-                    
-                    # Adjust velocity based on collision normal
-                    if collision.normal_x != 0:
-                        velocity_x = 0
-                    if collision.normal_y != 0:
-                        velocity_y = 0
+        r, c, t = self._body_rows(rigidbodies, colliders, transforms)
+        
+        # Bodies at rest have zero velocity and feel no gravity; they are
+        # skipped until something gives them velocity again
+        gx, gy = self.gravity
+        awake = (rigidbodies.velocity_x[r] != 0) | (rigidbodies.velocity_y[r] != 0)
+        if gx or gy:
+            awake |= rigidbodies.gravity_scale[r] != 0
+        awake &= ~rigidbodies.is_kinematic[r]
+        r, c, t = r[awake], c[awake], t[awake]
+        if len(r) == 0:
+            return
+        
+        # Apply gravity and drag, then integrate
+        gravity_scale = rigidbodies.gravity_scale[r] * dt
+        drag_factor = 1.0 - rigidbodies.drag[r] * dt
+        velocity_x = (rigidbodies.velocity_x[r] + gx * gravity_scale) * drag_factor
+        velocity_y = (rigidbodies.velocity_y[r] + gy * gravity_scale) * drag_factor
+        new_x = transforms.x[t] + velocity_x * dt
+        new_y = transforms.y[t] + velocity_y * dt
+        
+        # Tile collisions are still resolved body by body; triggers never block
+        check_tile_collision = self.collision_system.check_tile_collision
+        blocking = np.flatnonzero(~colliders.is_trigger[c])
+        for i, shape in zip(blocking.tolist(), colliders.shape[c[blocking]]):
+            collision = check_tile_collision(shape, new_x[i], new_y[i])
+            if collision.collided:
+                # Push the body out along the normal, away from the tile
+                normal_x, normal_y = collision.contact_normal
+                new_x[i] += normal_x * collision.penetration
+                new_y[i] += normal_y * collision.penetration
                 
-                # Update transform
-                transform.x = new_x
-                transform.y = new_y
-                transform.velocity_x = velocity_x
-                transform.velocity_y = velocity_y
+                # Adjust velocity based on collision normal
+                if normal_x != 0:
+                    velocity_x[i] = 0.0
+                if normal_y != 0:
+                    velocity_y[i] = 0.0
+        
+        # Put bodies that have slowed to a stop without gravity to sleep
+        resting = np.abs(velocity_x) + np.abs(velocity_y) < REST_SPEED
+        if gx or gy:
+            resting &= gravity_scale == 0
+        velocity_x[resting] = 0.0
+        velocity_y[resting] = 0.0
+        
+        transforms.x[t] = new_x
+        transforms.y[t] = new_y
+        rigidbodies.velocity_x[r] = velocity_x
+        rigidbodies.velocity_y[r] = velocity_y
     
     def check_collision(
         self,
@@ -80,38 +106,39 @@ class PhysicsSystem:
         offset_y: float = 0.0
     ) -> Tuple[bool, Set[Entity]]:
         """Check if an entity would collide at an offset from its current position."""
-        collider = self.entity_manager.get_component(entity, ColliderComponent)
-        transform = self.entity_manager.get_component(entity, TransformComponent)
+        collider = self.entity_manager.get_component(entity.id, ColliderComponent)
+        transform = self.entity_manager.get_component(entity.id, TransformComponent)
         
         if not collider or not transform:
             return False, set()
         
+        x = transform.x + offset_x
+        y = transform.y + offset_y
+        
         # Check tile collision
-        tile_collision = self.collision_system.check_tile_collision(
-            collider.shape,
-            transform.x + offset_x,
-            transform.y + offset_y
-        )
+        tile_collision = self.collision_system.check_tile_collision(collider.shape, x, y)
         
         if tile_collision.collided and not collider.is_trigger:
             return True, set()
         
-        # Check entity collisions
-        collided_entities = set()
+        # Check entity collisions; the trigger flags of everything touched
+        # are gathered from the collider column in one go
         entity_collisions = self.collision_system.check_entity_collision(
-            entity.id,
-            transform.x + offset_x,
-            transform.y + offset_y
+            entity.id, x, y, collider.shape
         )
+        if not entity_collisions:
+            return False, set()
+        other_ids = [other_id for other_id, _ in entity_collisions]
+        colliders = self.entity_manager.get_pool(ColliderComponent)
+        slots = colliders.slots_of(other_ids)
+        blocking = (slots >= 0) & ~colliders.is_trigger[slots]
         
-        for other_id, collision in entity_collisions:
-            other_entity = self.entity_manager.get_entity(other_id)
+        get_entity = self.entity_manager.get_entity
+        collided_entities = set()
+        for i in np.flatnonzero(blocking).tolist():
+            other_entity = get_entity(other_ids[i])
             if other_entity:
-                other_collider = self.entity_manager.get_component(
-                    other_entity, ColliderComponent
-                )
-                if other_collider and not other_collider.is_trigger:
-                    collided_entities.add(other_entity)
+                collided_entities.add(other_entity)
         
         return len(collided_entities) > 0, collided_entities
     
@@ -1,6 +1,10 @@
-from typing import Dict, List, Type, Set, Optional
+from typing import Dict, List, Type, Optional, Tuple
+import heapq
+import itertools
+import numpy as np
 from .entity import Entity
-from .component import Component
+from .component import Component, Position, Physical
+from .position_index import PositionIndex
 
 class World:
     """
@@ -10,22 +14,60 @@ class World:
     
     def __init__(self):
         self.entities: Dict[int, Entity] = {}
-        self.component_to_entities: Dict[Type[Component], Set[int]] = {}
+        # Each component type gets a dense index; an entity's mask has the
+        # bits of its component types set
+        self._type_bit: Dict[Type[Component], int] = {}
+        self._entity_masks: Dict[int, int] = {}
+        # Entity ids are never reused, so each live entity also gets a dense
+        # row, recycled lowest first, keeping the bitsets as small as the
+        # live population
+        self._entity_rows: Dict[int, int] = {}
+        self._row_entities = np.full(64 * 8, -1, dtype=np.int64)
+        self._free_rows: List[int] = []
+        self._next_row = 0
+        # Per component bit, a packed bitset of member rows, bit i of byte k
+        # standing for row 8k + i, and the number of members
+        self._bitsets: List[np.ndarray] = []
+        self._bit_counts: List[int] = []
+        self._bitset_bytes = 64
+        # Per-bit membership versions; a cached query result stays valid
+        # while the summed versions of its types are unchanged
+        self._bit_versions: List[int] = []
+        self._query_cache: Dict[Tuple[Type[Component], ...], Tuple[int, List[Entity]]] = {}
+        # SoA positions of Position+Physical entities for spatial queries
+        self.position_index = PositionIndex()
+        self._entity_ids = itertools.count(1)
         
     def create_entity(self) -> Entity:
         """Create a new entity and add it to the world."""
-        entity = Entity()
+        entity = Entity(next(self._entity_ids))
         self.entities[entity.id] = entity
+        if self._free_rows:
+            row = heapq.heappop(self._free_rows)
+        else:
+            row = self._next_row
+            self._next_row += 1
+            if row >> 3 >= self._bitset_bytes:
+                self._grow_bitsets(row)
+        self._entity_rows[entity.id] = row
+        self._row_entities[row] = entity.id
         return entity
     
     def remove_entity(self, entity_id: int) -> None:
         """Remove an entity and all its components from the world."""
         if entity_id in self.entities:
-            entity = self.entities[entity_id]
             # Remove entity from component mappings
-            for component_type in entity.components:
-                if component_type in self.component_to_entities:
-                    self.component_to_entities[component_type].discard(entity_id)
+            mask = self._entity_masks.pop(entity_id, 0)
+            row = self._entity_rows.pop(entity_id)
+            byte, flag = row >> 3, 1 << (row & 7)
+            for bit, bitset in enumerate(self._bitsets):
+                if mask >> bit & 1:
+                    bitset[byte] &= 0xFF ^ flag
+                    self._bit_counts[bit] -= 1
+                    self._bit_versions[bit] += 1
+            self._row_entities[row] = -1
+            heapq.heappush(self._free_rows, row)
+            self.position_index.remove(entity_id)
             # Remove the entity itself
             del self.entities[entity_id]
     
@@ -39,9 +81,22 @@ class World:
             entity.add_component(component)
             
             # Update component mapping
-            if component_type not in self.component_to_entities:
-                self.component_to_entities[component_type] = set()
-            self.component_to_entities[component_type].add(entity_id)
+            bit = self._type_bit.get(component_type)
+            if bit is None:
+                bit = self._type_bit[component_type] = len(self._bitsets)
+                self._bitsets.append(np.zeros(self._bitset_bytes, dtype=np.uint8))
+                self._bit_counts.append(0)
+                self._bit_versions.append(0)
+            mask = self._entity_masks.get(entity_id, 0)
+            if not mask >> bit & 1:
+                row = self._entity_rows[entity_id]
+                self._bitsets[bit][row >> 3] |= 1 << (row & 7)
+                self._bit_counts[bit] += 1
+                self._bit_versions[bit] += 1
+                self._entity_masks[entity_id] = mask | 1 << bit
+            
+            if component_type is Position or component_type is Physical:
+                self._index_position(entity_id)
     
     def remove_component(self, entity_id: int, component_type: Type[Component]) -> None:
         """Remove a component from an entity."""
@@ -49,27 +104,90 @@ class World:
             entity = self.entities[entity_id]
             entity.remove_component(component_type)
             
-            if component_type in self.component_to_entities:
-                self.component_to_entities[component_type].discard(entity_id)
+            bit = self._type_bit.get(component_type)
+            mask = self._entity_masks.get(entity_id, 0)
+            if bit is not None and mask >> bit & 1:
+                row = self._entity_rows[entity_id]
+                self._bitsets[bit][row >> 3] &= 0xFF ^ 1 << (row & 7)
+                self._entity_masks[entity_id] = mask & ~(1 << bit)
+                self._bit_counts[bit] -= 1
+                self._bit_versions[bit] += 1
+            
+            if component_type is Position or component_type is Physical:
+                self.position_index.remove(entity_id)
+    
+    def _grow_bitsets(self, row: int) -> None:
+        """Widen every bitset to cover a row, at least doubling them."""
+        size = max((row >> 3) + 1, 2 * self._bitset_bytes)
+        for bit, bitset in enumerate(self._bitsets):
+            grown = np.zeros(size, dtype=np.uint8)
+            grown[:self._bitset_bytes] = bitset
+            self._bitsets[bit] = grown
+        row_entities = np.full(size * 8, -1, dtype=np.int64)
+        row_entities[:len(self._row_entities)] = self._row_entities
+        self._row_entities = row_entities
+        self._bitset_bytes = size
+    
+    def _index_position(self, entity_id: int) -> None:
+        """Add an entity to the position index once it is both positioned and physical."""
+        required = self._mask_of(Position, Physical)
+        if required and self._entity_masks.get(entity_id, 0) & required == required:
+            entity = self.entities[entity_id]
+            self.position_index.insert(entity_id, entity.get_component(Position))
     
     def get_entities_with_components(self, *component_types: Type[Component]) -> List[Entity]:
-        """Get all entities that have all of the specified component types."""
+        """
+        Get all entities that have all of the specified component types.
+        
+        Results are cached per combination of types until one of those types
+        gains or loses an entity, and the cached list is shared between
+        callers, so it must not be modified.
+        """
         if not component_types:
             return list(self.entities.values())
         
-        # Start with entities that have the first component type
-        if component_types[0] not in self.component_to_entities:
-            return []
+        bits = []
+        version = 0
+        for component_type in component_types:
+            bit = self._type_bit.get(component_type)
+            if bit is None:
+                return []
+            bits.append(bit)
+            version += self._bit_versions[bit]
         
-        entity_ids = self.component_to_entities[component_types[0]].copy()
+        cached = self._query_cache.get(component_types)
+        if cached is not None and cached[0] == version:
+            return cached[1]
         
-        # Intersect with entities that have each additional component type
-        for component_type in component_types[1:]:
-            if component_type not in self.component_to_entities:
-                return []
-            entity_ids &= self.component_to_entities[component_type]
-            
-        return [self.entities[entity_id] for entity_id in entity_ids]
+        # AND the packed bitsets of all requested types, eight rows per byte,
+        # rarest type first so an empty intersection stops early; only the
+        # bytes of rows ever handed out are touched
+        bits.sort(key=self._bit_counts.__getitem__)
+        used = (self._next_row + 7) >> 3
+        members = self._bitsets[bits[0]][:used].copy()
+        for bit in bits[1:]:
+            if not members.any():
+                break
+            members &= self._bitsets[bit][:used]
+        rows = np.flatnonzero(np.unpackbits(members, bitorder='little'))
+        entities = self.entities
+        result = [entities[entity_id] for entity_id in self._row_entities[rows].tolist()]
+        self._query_cache[component_types] = (version, result)
+        return result
+    
+    def _mask_of(self, *component_types: Type[Component]) -> int:
+        """Get the combined mask of component types, or 0 if any has never been added."""
+        mask = 0
+        for component_type in component_types:
+            bit = self._type_bit.get(component_type)
+            if bit is None:
+                return 0
+            mask |= 1 << bit
+        return mask
+    
+    def pos_xy(self, entity_id: int) -> Optional[Tuple[float, float]]:
+        """Get an indexed entity's position straight from the SoA arrays."""
+        return self.position_index.get(entity_id)
     
     def get_entity(self, entity_id: int) -> Optional[Entity]:
         """Get an entity by its ID."""
@@ -3,7 +3,7 @@ from typing import Optional, Tuple, Dict, Any
 import logging
 from ..world.tilemap import TileMap, TileType, Room
 from ..ecs.entity import Entity
-from ..ecs.component import AI, Position, Physical, Health, Inventory
+from ..ecs.component import AI, AIState, BehaviorStateId, Position, Physical, Health, Inventory
 
 logger = logging.getLogger(__name__)
 
@@ -23,14 +23,7 @@ class NPC(Entity):
         # Initialize AI state
         ai = self.get_component(AI)
         if ai:
-            ai.state = {
-                'current_state': 'idle',
-                'idle_time': 0.0,
-                'wander_time': 0.0,
-                'target_id': None,
-                'target_distance': float('inf'),
-                'target_detected': False
-            }
+            ai.state = AIState()
             logger.debug(f"NPC {id} ({behavior_type}) initialized with state: {ai.state}")
     
     def update(self, world: Any, dt: float, config: Dict[str, Any]) -> None:
@@ -41,15 +34,8 @@ class NPC(Entity):
             return
             
         # Update AI state if needed
-        if not ai.state:
-            ai.state = {
-                'current_state': 'idle',
-                'idle_time': 0.0,
-                'wander_time': 0.0,
-                'target_id': None,
-                'target_distance': float('inf'),
-                'target_detected': False
-            }
+        if ai.state is None:
+            ai.state = AIState()
             logger.debug(f"NPC {self.id} ({ai.behavior_type}) state reset to: {ai.state}")
     
     def get_current_task(self) -> Optional[str]:
@@ -58,25 +44,25 @@ class NPC(Entity):
         if not ai or not ai.state:
             return None
             
-        current_state = ai.state.get('current_state')
+        current_state = ai.state.current_state
         logger.debug(f"NPC {self.id} ({ai.behavior_type}) current state: {current_state}")
         
         # Check if we should be in attacking state
-        if current_state == 'attacking':
-            target_id = ai.state.get('target_id')
-            target_distance = ai.state.get('target_distance', float('inf'))
+        if current_state == BehaviorStateId.ATTACKING:
+            target_id = ai.state.target_id
+            target_distance = ai.state.target_distance
             logger.debug(f"NPC {self.id} ({ai.behavior_type}) target_id: {target_id}, target_distance: {target_distance}")
             
             # If we have no target or target is too far, go back to idle
             if target_id is None or target_distance > 10.0:  # Use a reasonable fallback distance
                 logger.debug(f"NPC {self.id} ({ai.behavior_type}) invalid attacking state, resetting to idle")
-                ai.state['current_state'] = 'idle'
-                ai.state['target_id'] = None
-                ai.state['target_distance'] = float('inf')
-                ai.state['target_detected'] = False
+                ai.state.current_state = BehaviorStateId.IDLE
+                ai.state.target_id = None
+                ai.state.target_distance = float('inf')
+                ai.state.target_detected = False
                 return 'idle'
                 
-        return current_state
+        return current_state.name.lower()
     
     def can_interact_with(self, tilemap: TileMap, x: int, y: int) -> bool:
         """Check if NPC can interact with a tile."""
@@ -102,11 +88,7 @@ class NPC(Entity):
         if not pos:
             return None
             
-        for room in tilemap.rooms.values():
-            if (room.x <= pos.x < room.x + room.width and 
-                room.y <= pos.y < room.y + room.height):
-                return room
-        return None
+        return tilemap.get_room_at(pos.x, pos.y)
     
     def move_to(self, x: int, y: int, tilemap: TileMap) -> bool:
         """Move NPC towards target position."""
@@ -153,7 +135,7 @@ class NPC(Entity):
         # For now, just log the interaction
         ai = self.get_component(AI)
         if ai:
-            ai.state['last_trade'] = target.id
+            ai.state.last_trade = target.id
     
     def _investigate(self, target: 'NPC') -> None:
         """Guard investigation logic."""
@@ -162,5 +144,5 @@ class NPC(Entity):
             return
             
         # Set target for investigation
-        ai.state['investigation_target'] = target.id
-        ai.state['current_state'] = 'pursuing'
+        ai.state.investigation_target = target.id
+        ai.state.current_state = BehaviorStateId.PURSUING
@@ -0,0 +1,146 @@
+"""Scalar and batched narrow-phase kernels for collision detection."""
+from typing import Optional, Tuple
+import math
+import numpy as np
+
+# (normal_x, normal_y, penetration, contact_x, contact_y)
+Contact = Tuple[float, float, float, float, float]
+
+def circle_circle(ax: float, ay: float, ar: float,
+                  bx: float, by: float, br: float) -> Optional[Contact]:
+    """
+    Test two circles for overlap.
+
+    Returns:
+        The contact with the normal pointing from a to b, or None if they are apart
+    """
+    dx = bx - ax
+    dy = by - ay
+    radii = ar + br
+    d2 = dx * dx + dy * dy
+    # Most pairs reaching the narrow phase are apart; reject them before the sqrt
+    if d2 >= radii * radii:
+        return None
+    if d2 == 0:  # Same position, push apart along x
+        return 1.0, 0.0, radii, ax, ay
+    distance = math.sqrt(d2)
+    nx = dx / distance
+    ny = dy / distance
+    return nx, ny, radii - distance, ax + nx * ar, ay + ny * ar
+
+def circle_aabb(px: float, py: float, r: float,
+                min_x: float, min_y: float, max_x: float, max_y: float) -> Optional[Contact]:
+    """
+    Test a circle against an axis-aligned box.
+
+    Returns:
+        The contact at the closest point of the box, with the normal pointing
+        from that point to the circle center, or None if they are apart
+    """
+    # Closest point of the box to the circle center
+    cx = min_x if px < min_x else (max_x if px > max_x else px)
+    cy = min_y if py < min_y else (max_y if py > max_y else py)
+    dx = px - cx
+    dy = py - cy
+    d2 = dx * dx + dy * dy
+    if d2 >= r * r:
+        return None
+    if d2 == 0:  # Center inside the box, push out along x
+        return 1.0, 0.0, r, cx, cy
+    distance = math.sqrt(d2)
+    return dx / distance, dy / distance, r - distance, cx, cy
+
+def circle_aabbs(px: float, py: float, r: float,
+                 min_x: np.ndarray, min_y: np.ndarray,
+                 max_x: np.ndarray, max_y: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    Test a circle against many axis-aligned boxes without branching.
+
+    Returns:
+        (hit, normal_x, normal_y, penetration, contact_x, contact_y) arrays;
+        contacts are only meaningful where hit is set
+    """
+    cx = np.clip(px, min_x, max_x)
+    cy = np.clip(py, min_y, max_y)
+    dx = px - cx
+    dy = py - cy
+    d2 = dx * dx + dy * dy
+    hit = d2 < r * r
+    distance = np.sqrt(d2)
+    # A center inside a box has no direction to the closest point, push out along x
+    inside = distance == 0
+    scale = 1.0 / np.where(inside, 1.0, distance)
+    nx = np.where(inside, 1.0, dx * scale)
+    ny = np.where(inside, 0.0, dy * scale)
+    return hit, nx, ny, r - distance, cx, cy
+
+def aabb_aabbs(min_x: float, min_y: float, max_x: float, max_y: float,
+               other_min_x: np.ndarray, other_min_y: np.ndarray,
+               other_max_x: np.ndarray, other_max_y: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    Test one axis-aligned box against many without branching.
+
+    Returns:
+        (hit, normal_x, normal_y, penetration) arrays, resolving along the axis
+        of least overlap with the normal pointing away from the other box;
+        contacts are only meaningful where hit is set
+    """
+    overlap_x = np.minimum(max_x, other_max_x) - np.maximum(min_x, other_min_x)
+    overlap_y = np.minimum(max_y, other_max_y) - np.maximum(min_y, other_min_y)
+    hit = (overlap_x > 0) & (overlap_y > 0)
+    along_x = overlap_x <= overlap_y
+    # Push towards whichever side of the other box the center is on
+    side_x = np.where(min_x + max_x >= other_min_x + other_max_x, 1.0, -1.0)
+    side_y = np.where(min_y + max_y >= other_min_y + other_max_y, 1.0, -1.0)
+    nx = np.where(along_x, side_x, 0.0)
+    ny = np.where(along_x, 0.0, side_y)
+    return hit, nx, ny, np.where(along_x, overlap_x, overlap_y)
+
+def hash_pairs(px: np.ndarray, py: np.ndarray, r: np.ndarray,
+               cell_size: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find every pair of circles whose bounds share a spatial hash cell.
+
+    Each circle is entered into every cell its bounds touch, and the entries
+    are sorted into a CSR layout (cell_start/cell_items). A pair is emitted
+    only from the lowest cell its bounds share, so it is reported once.
+
+    Returns:
+        (a, b) index arrays into the inputs, with a < b in CSR order
+    """
+    x0 = np.floor((px - r) / cell_size).astype(np.int64)
+    y0 = np.floor((py - r) / cell_size).astype(np.int64)
+    x1 = np.floor((px + r) / cell_size).astype(np.int64)
+    y1 = np.floor((py + r) / cell_size).astype(np.int64)
+    span_x = x1 - x0 + 1
+    counts = span_x * (y1 - y0 + 1)
+
+    # One entry per (circle, touched cell)
+    items = np.repeat(np.arange(len(px)), counts)
+    offsets = np.arange(len(items)) - np.repeat(np.cumsum(counts) - counts, counts)
+    cell_x = x0[items] + offsets % span_x[items]
+    cell_y = y0[items] + offsets // span_x[items]
+    base_x = cell_x.min(initial=0)
+    base_y = cell_y.min(initial=0)
+    keys = (cell_x - base_x) * (cell_y.max(initial=0) - base_y + 1) + (cell_y - base_y)
+
+    # CSR: entries grouped by cell, cell_start[i]:cell_start[i + 1] per cell
+    order = np.argsort(keys, kind='stable')
+    cell_items = items[order]
+    keys = keys[order]
+    cell_x = cell_x[order]
+    cell_y = cell_y[order]
+    cell_start = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1], True])
+    cell_end = np.repeat(cell_start[1:], np.diff(cell_start))
+
+    # Pair each entry with every later entry of its cell
+    later = cell_end - np.arange(len(cell_items)) - 1
+    first = np.repeat(np.arange(len(cell_items)), later)
+    second = first + 1 + np.arange(len(first)) - np.repeat(np.cumsum(later) - later, later)
+    a = cell_items[first]
+    b = cell_items[second]
+
+    # The lowest shared cell starts at the larger of the two minimum corners
+    lowest = ((cell_x[first] == np.maximum(x0[a], x0[b])) &
+              (cell_y[first] == np.maximum(y0[a], y0[b])))
+    return a[lowest], b[lowest]
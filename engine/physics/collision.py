@@ -1,12 +1,33 @@
 """Grid-based collision detection for roguelike movement with continuous collision detection."""
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import List, Optional, Tuple, Dict, Set
+from itertools import combinations
+from typing import List, Optional, Tuple, Dict, Set, Union
+import math
 import numpy as np
 from ..world.tilemap import TileMap, TileType
 from ..ecs.entity import Entity
 from ..ecs.component import Position, Collider, Velocity
-from .spatial_grid import PhysicsGrid, AABB
+from .spatial_grid import AABB
+from ._kernels import circle_circle, circle_aabb, circle_aabbs, aabb_aabbs, hash_pairs
+
+# Below this many colliders, testing every pair beats building the hash
+BRUTE_FORCE_LIMIT = 32
+# Smallest spatial hash cell, in tiles
+MIN_HASH_CELL = 1.0
+
+class ShapeType(Enum):
+    """Kinds of collision shape."""
+    CIRCLE = auto()
+    BOX = auto()
+
+@dataclass
+class CollisionShape:
+    """Collision shape centered on its owner's position, in tiles."""
+    type: ShapeType = ShapeType.CIRCLE
+    radius: float = 0.5  # Circles
+    width: float = 1.0  # Boxes
+    height: float = 1.0
 
 @dataclass
 class CollisionResult:
@@ -27,7 +48,7 @@ class CollisionPair:
 class CollisionSystem:
     """Handles grid-based and continuous collision detection."""
     
-    def __init__(self, tilemap: TileMap, world_width: float, world_height: float):
+    def __init__(self, tilemap: TileMap):
         self.tilemap = tilemap
         self.solid_tiles = {
             TileType.WALL,
@@ -40,36 +61,52 @@ class CollisionSystem:
         }
         # Dictionary to track entity positions
         self.entity_positions: Dict[int, Tuple[int, int]] = {}
-        # Spatial partitioning for continuous collision detection
-        self.physics_grid = PhysicsGrid(world_width, world_height)
-        # Cache for static collision shapes
-        self.static_colliders: List[AABB] = []
+        # Registered entities with colliders, by id
+        self._colliders: Dict[int, Entity] = {}
+        # Solidity of every tile, indexed [y, x]; static collision shapes are
+        # the unit boxes of its solid cells, stored as rows of min_x, min_y,
+        # max_x, max_y with a column per box and _static_index mapping each
+        # tile to its box column, or -1
+        self._solid_version = -1
+        self._solid_grid = np.zeros((0, 0), dtype=bool)
+        self._static_index = np.zeros((0, 0), dtype=np.intp)
+        self._static_bounds = np.zeros((4, 0), dtype=np.float32)
         self._build_static_colliders()
         
     def _build_static_colliders(self) -> None:
-        """Build collision shapes for static tiles."""
-        for x in range(self.tilemap.width):
-            for y in range(self.tilemap.height):
-                tile = self.tilemap.get_tile(x, y)
-                if tile in self.solid_tiles:
-                    self.static_colliders.append(AABB(
-                        min_x=float(x),
-                        min_y=float(y),
-                        max_x=float(x + 1),
-                        max_y=float(y + 1)
-                    ))
+        """Recompute the solidity grid and static boxes if the tilemap changed since the last build."""
+        if self._solid_version == self.tilemap.version:
+            return
+        is_solid = np.frompyfunc(self.solid_tiles.__contains__, 1, 1)
+        self._solid_grid = is_solid(self.tilemap.tiles).astype(bool)
+        
+        # One box per solid tile, numbered in x-major order
+        xs, ys = np.nonzero(self._solid_grid.T)
+        self._static_bounds = np.stack([xs, ys, xs + 1, ys + 1]).astype(np.float32)
+        self._static_index = np.full(self._solid_grid.shape, -1, dtype=np.intp)
+        self._static_index[ys, xs] = np.arange(len(xs))
+        self._solid_version = self.tilemap.version
     
-    def register_entity(self, entity: Entity, position: Tuple[int, int]) -> None:
-        """Register an entity's position."""
-        self.entity_positions[entity.id] = position
-        if entity.has_component(Collider):
-            self.physics_grid.add_entity(entity)
+    def register_entity(self, entity: Union[Entity, int], position: Tuple[int, int]) -> None:
+        """
+        Register an entity's position.
+        
+        Entities passed as objects that have a Collider also take part in
+        continuous collision detection; bare ids are only tracked on the grid.
+        """
+        entity_id = entity if isinstance(entity, int) else entity.id
+        self.entity_positions[entity_id] = position
+        if not isinstance(entity, int):
+            pos = entity.get_component(Position)
+            col = entity.get_component(Collider)
+            if pos and col:
+                self._colliders[entity_id] = entity
     
-    def unregister_entity(self, entity: Entity) -> None:
+    def unregister_entity(self, entity: Union[Entity, int]) -> None:
         """Unregister an entity."""
-        self.entity_positions.pop(entity.id, None)
-        if entity.has_component(Collider):
-            self.physics_grid.remove_entity(entity)
+        entity_id = entity if isinstance(entity, int) else entity.id
+        self.entity_positions.pop(entity_id, None)
+        self._colliders.pop(entity_id, None)
     
     def check_move(self, entity_id: int, new_x: int, new_y: int) -> CollisionResult:
         """Check if an entity can move to a new position (grid-based)."""
@@ -77,8 +114,8 @@ class CollisionSystem:
         if not self.tilemap.is_valid_position(new_x, new_y):
             return CollisionResult(True, None)
         
-        tile = self.tilemap.get_tile(new_x, new_y)
-        if tile in self.solid_tiles:
+        self._build_static_colliders()
+        if self._solid_grid[new_y, new_x]:
             return CollisionResult(True, None)
         
         # Check entity collisions
@@ -88,19 +125,40 @@ class CollisionSystem:
         
         return CollisionResult(False, None)
     
-    def move_entity(self, entity: Entity, new_x: int, new_y: int) -> bool:
+    def check_moves_batch(self, entity_id: int, targets: np.ndarray) -> np.ndarray:
+        """
+        Check several grid moves of an entity at once.
+        
+        Args:
+            entity_id: The moving entity
+            targets: (n, 2) integer array of target x, y positions
+            
+        Returns:
+            Boolean mask, true where the move is blocked as check_move would report
+        """
+        targets = np.asarray(targets, dtype=np.intp).reshape(-1, 2)
+        xs, ys = targets[:, 0], targets[:, 1]
+        
+        # Bounds and tile collision
+        self._build_static_colliders()
+        height, width = self._solid_grid.shape
+        blocked = ~((xs >= 0) & (xs < width) & (ys >= 0) & (ys < height))
+        blocked |= self._solid_grid[ys.clip(0, height - 1), xs.clip(0, width - 1)]
+        
+        # Entity collisions, in a single pass over the tracked positions
+        wanted = {(x, y): i for i, (x, y) in enumerate(targets.tolist())}
+        for other_id, pos in self.entity_positions.items():
+            i = wanted.get(pos)
+            if i is not None and other_id != entity_id:
+                blocked[i] = True
+        return blocked
+    
+    def move_entity(self, entity: Union[Entity, int], new_x: int, new_y: int) -> bool:
         """Try to move an entity to a new position (grid-based)."""
-        result = self.check_move(entity.id, new_x, new_y)
+        entity_id = entity if isinstance(entity, int) else entity.id
+        result = self.check_move(entity_id, new_x, new_y)
         if not result.collided:
-            old_pos = self.entity_positions.get(entity.id)
-            self.entity_positions[entity.id] = (new_x, new_y)
-            
-            # Update physics grid if entity has collider
-            if entity.has_component(Collider) and old_pos:
-                self.physics_grid.update_entity(
-                    entity,
-                    (float(old_pos[0]), float(old_pos[1]))
-                )
+            self.entity_positions[entity_id] = (new_x, new_y)
             return True
         return False
     
@@ -111,63 +169,31 @@ class CollisionSystem:
     def _check_circle_circle(self, pos_a: Position, col_a: Collider,
                            pos_b: Position, col_b: Collider) -> CollisionResult:
         """Check collision between two circles."""
-        dx = pos_b.x - pos_a.x
-        dy = pos_b.y - pos_a.y
-        distance = np.sqrt(dx * dx + dy * dy)
-        
-        if distance == 0:  # Entities are at the same position
-            return CollisionResult(
-                collided=True,
-                contact_point=(pos_a.x, pos_a.y),
-                contact_normal=(1, 0),
-                penetration=col_a.radius + col_b.radius
-            )
-            
-        if distance < col_a.radius + col_b.radius:
-            normal = (dx / distance, dy / distance)
-            penetration = col_a.radius + col_b.radius - distance
-            contact_point = (
-                pos_a.x + normal[0] * col_a.radius,
-                pos_a.y + normal[1] * col_a.radius
-            )
-            return CollisionResult(
-                collided=True,
-                contact_point=contact_point,
-                contact_normal=normal,
-                penetration=penetration
-            )
-            
-        return CollisionResult(collided=False)
+        contact = circle_circle(pos_a.x, pos_a.y, col_a.radius, pos_b.x, pos_b.y, col_b.radius)
+        if contact is None:
+            return CollisionResult(collided=False)
+        nx, ny, penetration, cx, cy = contact
+        return CollisionResult(
+            collided=True,
+            contact_point=(cx, cy),
+            contact_normal=(nx, ny),
+            penetration=penetration
+        )
         
     def _check_circle_aabb(self, pos: Position, col: Collider,
                           aabb: AABB) -> CollisionResult:
         """Check collision between a circle and an AABB."""
-        # Find closest point on AABB to circle center
-        closest_x = max(aabb.min_x, min(pos.x, aabb.max_x))
-        closest_y = max(aabb.min_y, min(pos.y, aabb.max_y))
-        
-        # Calculate distance between closest point and circle center
-        dx = pos.x - closest_x
-        dy = pos.y - closest_y
-        distance = np.sqrt(dx * dx + dy * dy)
-        
-        if distance < col.radius:
-            if distance == 0:  # Circle center is inside AABB
-                # Push out in x direction
-                penetration = col.radius
-                normal = (1, 0)
-            else:
-                penetration = col.radius - distance
-                normal = (dx / distance, dy / distance)
-                
-            return CollisionResult(
-                collided=True,
-                contact_point=(closest_x, closest_y),
-                contact_normal=normal,
-                penetration=penetration
-            )
-            
-        return CollisionResult(collided=False)
+        contact = circle_aabb(pos.x, pos.y, col.radius,
+                              aabb.min_x, aabb.min_y, aabb.max_x, aabb.max_y)
+        if contact is None:
+            return CollisionResult(collided=False)
+        nx, ny, penetration, cx, cy = contact
+        return CollisionResult(
+            collided=True,
+            contact_point=(cx, cy),
+            contact_normal=(nx, ny),
+            penetration=penetration
+        )
         
     def check_collision(self, entity_a: Entity, entity_b: Entity) -> CollisionResult:
         """Check collision between two entities."""
@@ -181,6 +207,62 @@ class CollisionSystem:
             
         return self._check_circle_circle(pos_a, col_a, pos_b, col_b)
         
+    def check_entity_collision(self, entity_id: int, x: float, y: float,
+                               shape: Optional[CollisionShape] = None) -> List[Tuple[int, CollisionResult]]:
+        """
+        Check an entity placed at a position against every other registered collider.
+        
+        Args:
+            entity_id: The entity being tested, skipped among the colliders
+            x, y: Position to test it at
+            shape: Shape to test with; defaults to the entity's registered Collider
+        
+        Returns:
+            (other_id, result) for each collider touched, with normals pointing
+            from the entity towards the other collider
+        """
+        if shape is None:
+            entity = self._colliders.get(entity_id)
+            if entity is None:
+                return []
+            shape = CollisionShape(ShapeType.CIRCLE, radius=entity.get_component(Collider).radius)
+        if shape.type is ShapeType.CIRCLE:
+            half_w = half_h = shape.radius
+        else:
+            half_w = shape.width / 2
+            half_h = shape.height / 2
+        
+        others = [(other_id, other.get_component(Position), other.get_component(Collider))
+                  for other_id, other in self._colliders.items() if other_id != entity_id]
+        if not others:
+            return []
+        
+        # Bounds overlap over all colliders at once, exact contacts for the survivors
+        px = np.fromiter((pos.x for _, pos, _ in others), dtype=np.float64, count=len(others))
+        py = np.fromiter((pos.y for _, pos, _ in others), dtype=np.float64, count=len(others))
+        r = np.fromiter((col.radius for _, _, col in others), dtype=np.float64, count=len(others))
+        near = (np.abs(px - x) <= r + half_w) & (np.abs(py - y) <= r + half_h)
+        
+        collisions = []
+        for i in np.flatnonzero(near).tolist():
+            _, pos, col = others[i]
+            if shape.type is ShapeType.CIRCLE:
+                contact = circle_circle(x, y, shape.radius, pos.x, pos.y, col.radius)
+            else:
+                # The normal points out of the box, towards the other circle
+                contact = circle_aabb(pos.x, pos.y, col.radius,
+                                      x - half_w, y - half_h, x + half_w, y + half_h)
+            if contact is None:
+                continue
+            nx, ny, penetration, cx, cy = contact
+            collisions.append((others[i][0], CollisionResult(
+                collided=True,
+                contact_point=(cx, cy),
+                contact_normal=(nx, ny),
+                penetration=penetration
+            )))
+        return collisions
+
     def check_static_collision(self, entity: Entity) -> Optional[CollisionResult]:
         """Check collision between an entity and static geometry."""
         pos = entity.get_component(Position)
@@ -188,13 +270,57 @@ class CollisionSystem:
         
         if not pos or not col:
             return None
-            
-        for static_aabb in self.static_colliders:
-            result = self._check_circle_aabb(pos, col, static_aabb)
-            if result.collided:
-                return result
-                
-        return None
+        
+        return self._static_contact(CollisionShape(ShapeType.CIRCLE, radius=col.radius), pos.x, pos.y)
+        
+    def check_tile_collision(self, shape: CollisionShape, x: float, y: float) -> CollisionResult:
+        """Check a shape placed at a position against the solid tiles."""
+        result = self._static_contact(shape, x, y)
+        return result if result is not None else CollisionResult(collided=False)
+        
+    def _static_contact(self, shape: CollisionShape, x: float, y: float) -> Optional[CollisionResult]:
+        """Get the first contact between a shape and the solid tiles, or None."""
+        if shape.type is ShapeType.CIRCLE:
+            half_w = half_h = shape.radius
+        else:
+            half_w = shape.width / 2
+            half_h = shape.height / 2
+        
+        # Only solid tiles under the shape's bounds can touch it
+        self._build_static_colliders()
+        height, width = self._solid_grid.shape
+        x0 = max(0, math.floor(x - half_w))
+        y0 = max(0, math.floor(y - half_h))
+        x1 = min(width, math.floor(x + half_w) + 1)
+        y1 = min(height, math.floor(y + half_h) + 1)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        
+        # Boxes are numbered in x-major order, so the first hit is the one a
+        # full x-major scan would find
+        rows = self._static_index[y0:y1, x0:x1].T.ravel()
+        rows = rows[rows >= 0]
+        if len(rows) == 0:
+            return None
+        # One gather pulls all four bounds of the candidates
+        min_x, min_y, max_x, max_y = self._static_bounds[:, rows].astype(np.float64)
+        if shape.type is ShapeType.CIRCLE:
+            hit, nx, ny, penetration, cx, cy = circle_aabbs(x, y, shape.radius, min_x, min_y, max_x, max_y)
+        else:
+            hit, nx, ny, penetration = aabb_aabbs(x - half_w, y - half_h, x + half_w, y + half_h,
+                                                  min_x, min_y, max_x, max_y)
+            # Contact on the shape's edge facing the tile
+            cx = x - nx * half_w
+            cy = y - ny * half_h
+        if not hit.any():
+            return None
+        i = int(np.argmax(hit))
+        return CollisionResult(
+            collided=True,
+            contact_point=(float(cx[i]), float(cy[i])),
+            contact_normal=(float(nx[i]), float(ny[i])),
+            penetration=float(penetration[i])
+        )
         
     def resolve_collision(self, entity_a: Entity, entity_b: Entity,
                          result: CollisionResult) -> None:
@@ -253,28 +379,38 @@ class CollisionSystem:
             vel_b.x += impulse_x / vel_b.mass
             vel_b.y += impulse_y / vel_b.mass
             
+    def _candidate_pairs(self, entities: List[Entity]) -> List[Tuple[Entity, Entity]]:
+        """
+        Get every pair of entities whose bounds share a spatial hash cell, once each.
+        
+        The hash is rebuilt per call with cells about twice the average
+        collider radius. A pair is reported only from the lowest cell its
+        bounds share, so pairs spanning several cells are not repeated.
+        """
+        bodies = []
+        for entity in entities:
+            pos = entity.get_component(Position)
+            col = entity.get_component(Collider)
+            if pos and col:
+                bodies.append((entity, pos.x, pos.y, col.radius))
+        if len(bodies) < BRUTE_FORCE_LIMIT:
+            return [(a[0], b[0]) for a, b in combinations(bodies, 2)]
+        
+        px, py, radius = (np.array(column, dtype=np.float64) for column in list(zip(*bodies))[1:])
+        cell_size = max(MIN_HASH_CELL, 2.0 * float(radius.mean()))
+        a, b = hash_pairs(px, py, radius, cell_size)
+        return [(bodies[i][0], bodies[j][0]) for i, j in zip(a.tolist(), b.tolist())]
+            
     def update(self, dt: float) -> None:
         """Update the physics system."""
-        # Get all entities with colliders
-        collider_entities = {
-            entity for entity in self.physics_grid.grid.object_cells.keys()
-            if entity.has_component(Collider)
-        }
+        # Colliders are known from registration, so no component checks here
+        collider_entities = list(self._colliders.values())
         
         # Check dynamic vs dynamic collisions
-        checked_pairs = set()
-        for entity_a in collider_entities:
-            potential_collisions = self.physics_grid.get_potential_collisions(entity_a)
-            
-            for entity_b in potential_collisions:
-                if (entity_a, entity_b) in checked_pairs or (entity_b, entity_a) in checked_pairs:
-                    continue
-                    
-                result = self.check_collision(entity_a, entity_b)
-                if result.collided:
-                    self.resolve_collision(entity_a, entity_b, result)
-                    
-                checked_pairs.add((entity_a, entity_b))
+        for entity_a, entity_b in self._candidate_pairs(collider_entities):
+            result = self.check_collision(entity_a, entity_b)
+            if result.collided:
+                self.resolve_collision(entity_a, entity_b, result)
                 
         # Check dynamic vs static collisions
         for entity in collider_entities:
@@ -282,13 +418,12 @@ class CollisionSystem:
             if result:
                 pos = entity.get_component(Position)
                 if pos:
-                    pos.x -= result.contact_normal[0] * result.penetration
-                    pos.y -= result.contact_normal[1] * result.penetration
+                    # The normal points out of the tile, towards free space
+                    pos.x += result.contact_normal[0] * result.penetration
+                    pos.y += result.contact_normal[1] * result.penetration
                     
-        # Update physics grid
-        for entity in collider_entities:
+        # Keep grid positions in step with the resolved positions
+        for entity_id, entity in self._colliders.items():
             pos = entity.get_component(Position)
             if pos:
-                old_pos = self.entity_positions.get(entity.id, (pos.x, pos.y))
-                self.physics_grid.update_entity(entity, old_pos)
-                self.entity_positions[entity.id] = (int(pos.x), int(pos.y))
+                self.entity_positions[entity_id] = (int(pos.x), int(pos.y))
@@ -1,33 +1,53 @@
 """Component pooling system for physics components."""
-from typing import Dict, List, Type, TypeVar, Optional
-from dataclasses import dataclass, field
+from typing import Dict, Generic, List, Tuple, Type, TypeVar, Optional
+from dataclasses import dataclass, field, fields
 from ..ecs.component import Component, Position, Velocity, Collider
+from ..ecs.component_pool import NumericComponentPool
 
 T = TypeVar('T', bound=Component)
 
+def _reset_value(value: object) -> object:
+    """Value a released component field is cleared to."""
+    # bool is a subclass of int, so it has to be checked first
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return 0
+    return None
+
 @dataclass
 class ComponentPool(Generic[T]):
-    """Pool for reusing component instances."""
+    """
+    Pool for reusing component instances.
+    
+    PhysicsComponentPools stores its components in NumericComponentPool
+    columns instead; this object pool is kept for other component types.
+    """
     component_type: Type[T]
     initial_size: int = 100
     grow_size: int = 50
     active_components: Dict[int, T] = field(default_factory=dict)
     available_components: List[T] = field(default_factory=list)
+    # (field name, cleared value) pairs, worked out once from a fresh instance
+    _reset_values: Tuple[Tuple[str, object], ...] = field(default=(), init=False, repr=False)
     
     def __post_init__(self):
         """Initialize the pool with components."""
+        prototype = self.component_type()
+        self._reset_values = tuple(
+            (f.name, _reset_value(getattr(prototype, f.name))) for f in fields(prototype)
+        )
         self._grow_pool(self.initial_size)
         
     def _grow_pool(self, size: int) -> None:
         """Grow the pool by creating new components."""
-        for _ in range(size):
-            component = self.component_type()
-            self.available_components.append(component)
+        component_type = self.component_type
+        self.available_components.extend([component_type() for _ in range(size)])
             
     def acquire(self, entity_id: int) -> T:
-        """Get a component from the pool."""
+        """Get a component from the pool, growing it geometrically when empty."""
         if not self.available_components:
-            self._grow_pool(self.grow_size)
+            self._grow_pool(max(self.grow_size, len(self.active_components) // 2))
             
         component = self.available_components.pop()
         self.active_components[entity_id] = component
@@ -38,13 +58,8 @@ class ComponentPool(Generic[T]):
         if entity_id in self.active_components:
             component = self.active_components.pop(entity_id)
             # Reset component state
-            for key, value in component.__dict__.items():
-                if isinstance(value, (int, float)):
-                    setattr(component, key, 0)
-                elif isinstance(value, bool):
-                    setattr(component, key, False)
-                else:
-                    setattr(component, key, None)
+            for key, value in self._reset_values:
+                setattr(component, key, value)
             self.available_components.append(component)
             
     def get(self, entity_id: int) -> Optional[T]:
@@ -57,12 +72,18 @@ class ComponentPool(Generic[T]):
         self.active_components.clear()
 
 class PhysicsComponentPools:
-    """Manager for physics component pools."""
+    """
+    Manager for physics component pools.
+    
+    The physics components are plain numbers, so they are stored column-wise:
+    acquire and the getters hand out views of a slot, while systems can sweep
+    whole columns such as ``position_pool.x[position_pool.active_slots()]``.
+    """
     
     def __init__(self):
-        self.position_pool = ComponentPool(Position)
-        self.velocity_pool = ComponentPool(Velocity)
-        self.collider_pool = ComponentPool(Collider)
+        self.position_pool = NumericComponentPool(Position)
+        self.velocity_pool = NumericComponentPool(Velocity)
+        self.collider_pool = NumericComponentPool(Collider)
         
     def create_physics_components(self, entity_id: int,
                                 has_velocity: bool = True) -> tuple:
@@ -12,6 +12,8 @@ class MovementState(Enum):
     IDLE = auto()
     MOVING = auto()
     WAITING = auto()
+    WALKING = auto()  # Steering toward a target at walk speed
+    RUNNING = auto()  # Steering toward a target at run speed
 
 
 @dataclass
@@ -19,11 +21,18 @@ class MovementStats:
     """Movement-related statistics for an entity."""
     movement_points: int = 1  # Number of tiles that can be moved per turn
     diagonal_movement: bool = False  # Whether diagonal movement is allowed
+    walk_speed: float = 2.0  # Units per second when walking
+    run_speed: float = 4.0  # Units per second when running
+    turn_speed: float = 180.0  # Degrees per second
 
 
 class MovementSystem:
     """Handles turn-based grid movement."""
     
+    # Neighbour offsets, orthogonal first
+    _MOVES4 = np.array([(0, 1), (1, 0), (0, -1), (-1, 0)], dtype=np.int32)
+    _MOVES8 = np.concatenate([_MOVES4, np.array([(1, 1), (1, -1), (-1, 1), (-1, -1)], dtype=np.int32)])
+    
     def __init__(self, collision_system: CollisionSystem):
         self.collision_system = collision_system
         self.movement_stats: Dict[int, MovementStats] = {}
@@ -107,22 +116,13 @@ class MovementSystem:
         """Get the current movement state of an entity."""
         return self.states.get(entity_id)
     
-    def get_valid_moves(self, entity_id: int) -> List[Tuple[int, int]]:
-        """Get all valid moves for an entity."""
-        valid_moves = []
+    def get_valid_moves(self, entity_id: int) -> np.ndarray:
+        """Get all valid moves for an entity, as an (n, 2) array of target positions."""
         current_pos = self.get_position(entity_id)
         if not current_pos or entity_id not in self.movement_stats:
-            return valid_moves
+            return np.empty((0, 2), dtype=np.int32)
         
         stats = self.movement_stats[entity_id]
-        moves = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-        if stats.diagonal_movement:
-            moves.extend([(1, 1), (1, -1), (-1, 1), (-1, -1)])
-        
-        for dx, dy in moves:
-            new_x = current_pos[0] + dx
-            new_y = current_pos[1] + dy
-            if not self.collision_system.check_move(entity_id, new_x, new_y).collided:
-                valid_moves.append((new_x, new_y))
-        
-        return valid_moves
+        moves = self._MOVES8 if stats.diagonal_movement else self._MOVES4
+        targets = moves + np.array(current_pos, dtype=np.int32)
+        return targets[~self.collision_system.check_moves_batch(entity_id, targets)]
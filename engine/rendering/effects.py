@@ -1,78 +1,113 @@
 """Visual effects for the rendering system."""
+import functools
+import random
 import pygame
-import math
-from typing import Tuple, Optional, List
+from typing import Dict, Tuple, Optional, List, Set
 import numpy as np
 
+_rng = np.random.default_rng()
+
 def create_glow_surface(color: Tuple[int, ...], size: int) -> pygame.Surface:
     """Create a circular glow effect surface."""
     surface = pygame.Surface((size, size), pygame.SRCALPHA)
     center = size // 2
     
-    for x in range(size):
-        for y in range(size):
-            # Calculate distance from center
-            distance = math.sqrt((x - center) ** 2 + (y - center) ** 2)
-            
-            # Calculate alpha based on distance
-            alpha = int(max(0, 255 * (1 - distance / center)))
-            
-            # Set pixel color with calculated alpha
-            if len(color) == 3:
-                surface.set_at((x, y), (*color, alpha))
-            else:
-                surface.set_at((x, y), (*color[:3], min(color[3], alpha)))
+    # Alpha ramps down linearly with distance from the center; surfarray
+    # views are indexed [x, y]
+    xx, yy = np.ogrid[:size, :size]
+    distance = np.sqrt((xx - center) ** 2 + (yy - center) ** 2)
+    alpha = np.clip(255 * (1 - distance / center), 0, 255).astype(np.uint8)
+    if len(color) > 3:
+        alpha = np.minimum(alpha, color[3])
+    
+    pixels = pygame.surfarray.pixels3d(surface)
+    pixels[...] = color[:3]
+    del pixels  # Release the surface lock
+    alphas = pygame.surfarray.pixels_alpha(surface)
+    alphas[...] = alpha
+    del alphas
     
     return surface
 
-def create_scanline_effect(width: int, height: int, spacing: int = 2) -> pygame.Surface:
-    """Create a scanline effect surface."""
+def create_scanline_effect(width: int, height: int, spacing: int = 2,
+                           copy: bool = False) -> pygame.Surface:
+    """
+    Create a scanline effect surface.
+    
+    Surfaces are cached per size and spacing and shared between callers,
+    so pass copy=True to get one that may be drawn on.
+    """
+    surface = _scanline_surface(width, height, spacing)
+    return surface.copy() if copy else surface
+
+@functools.lru_cache(maxsize=8)
+def _scanline_surface(width: int, height: int, spacing: int) -> pygame.Surface:
+    """Build the scanline surface for a size and spacing."""
     surface = pygame.Surface((width, height), pygame.SRCALPHA)
-    for y in range(0, height, spacing):
-        pygame.draw.line(surface, (0, 0, 0, 50), (0, y), (width, y))
+    surface.fill((0, 0, 0, 0))
+    # surfarray views are indexed [x, y]; every spacing-th row is a line
+    alphas = pygame.surfarray.pixels_alpha(surface)
+    alphas[:, ::spacing] = 50
+    del alphas  # Release the surface lock
     return surface
 
 def create_noise_texture(width: int, height: int, alpha: int = 20) -> pygame.Surface:
     """Create a noise texture for visual effect."""
     surface = pygame.Surface((width, height), pygame.SRCALPHA)
-    noise = np.random.randint(0, 255, (height, width), dtype=np.uint8)
+    # surfarray views are indexed [x, y]
+    noise = _rng.integers(0, 255, (width, height), dtype=np.uint8)
     
-    for y in range(height):
-        for x in range(width):
-            value = noise[y, x]
-            surface.set_at((x, y), (value, value, value, alpha))
+    pixels = pygame.surfarray.pixels3d(surface)
+    pixels[...] = noise[:, :, np.newaxis]
+    del pixels  # Release the surface lock
+    alphas = pygame.surfarray.pixels_alpha(surface)
+    alphas[...] = alpha
+    del alphas
     
     return surface
 
-class GlowManager:
-    """Manages glow effects for different features."""
-    
-    def __init__(self):
-        self.glow_surfaces = {}
-        self._init_glow_surfaces()
-    
-    def _init_glow_surfaces(self):
-        """Initialize glow surfaces for different features."""
+# Glow surface size per feature
+_GLOW_SIZES = {
+    'light': 64,
+    'terminal': 32,
+    'machine': 48,
+    'door': 32,
+    'window': 32,
+    'container': 32,
+    'pillar': 24,
+}
+
+# Glow surfaces shared by every GlowManager, built on first use, and the
+# features whose surface has been converted to the display format
+_GLOW_CACHE: Dict[str, pygame.Surface] = {}
+_GLOW_CONVERTED: Set[str] = set()
+
+def _glow_surfaces() -> Dict[str, pygame.Surface]:
+    """Get the shared glow surfaces, building them the first time."""
+    if not _GLOW_CACHE:
         from .colors import FEATURE_COLORS
         
-        sizes = {
-            'light': 64,
-            'terminal': 32,
-            'machine': 48,
-            'door': 32,
-            'window': 32,
-            'container': 32,
-            'pillar': 24,
-        }
-        
-        for feature, size in sizes.items():
+        for feature, size in _GLOW_SIZES.items():
             glow_color = FEATURE_COLORS.get(f'{feature}_glow')
             if glow_color:
-                self.glow_surfaces[feature] = create_glow_surface(glow_color, size)
+                _GLOW_CACHE[feature] = create_glow_surface(glow_color, size)
+    return _GLOW_CACHE
+
+class GlowManager:
+    """Manages glow effects for different features."""
+    
+    def __init__(self):
+        self.glow_surfaces = _glow_surfaces()
     
     def get_glow(self, feature: str) -> Optional[pygame.Surface]:
         """Get the glow surface for a feature."""
-        return self.glow_surfaces.get(feature.lower())
+        feature = feature.lower()
+        surface = self.glow_surfaces.get(feature)
+        # Surfaces can only be matched to the display format once it exists
+        if surface is not None and feature not in _GLOW_CONVERTED and pygame.display.get_surface():
+            surface = self.glow_surfaces[feature] = surface.convert_alpha()
+            _GLOW_CONVERTED.add(feature)
+        return surface
 
 class TerminalEffect:
     """Creates a terminal-style text effect."""
@@ -81,23 +116,28 @@ class TerminalEffect:
         self.font = font
         self.chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789!@#$%^&*()_+-=[]{}|;:,.<>?"
         self.char_surfaces = {}
+        self._rand = random.Random()
         self._init_char_surfaces()
     
     def _init_char_surfaces(self):
-        """Pre-render character surfaces."""
+        """Pre-render character surfaces, plus the dimmed ones for unrevealed text."""
         for char in self.chars:
             self.char_surfaces[char] = self.font.render(char, True, (200, 200, 255))
+        self._dim_char_surfaces = tuple(self.font.render(char, True, (100, 100, 140))
+                                        for char in self.chars)
+        self._space_surface = self.font.render(" ", True, (200, 200, 255))
     
     def render_text(self, text: str, reveal_chars: int) -> List[pygame.Surface]:
         """Render text with a terminal effect."""
         surfaces = []
+        dim_chars = self._dim_char_surfaces
+        randrange = self._rand.randrange
         for i, char in enumerate(text):
             if i < reveal_chars and char in self.char_surfaces:
                 surfaces.append(self.char_surfaces[char])
             elif char.isspace():
-                surfaces.append(self.font.render(" ", True, (200, 200, 255)))
+                surfaces.append(self._space_surface)
             else:
                 # Random character for unrevealed text
-                rand_char = np.random.choice(list(self.chars))
-                surfaces.append(self.font.render(rand_char, True, (100, 100, 140)))
+                surfaces.append(dim_chars[randrange(len(dim_chars))])
         return surfaces
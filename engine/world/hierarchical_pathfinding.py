@@ -1,6 +1,7 @@
 """Hierarchical A* pathfinding implementation."""
 from typing import List, Tuple, Set, Dict, Optional
 import heapq
+import math
 import numpy as np
 from dataclasses import dataclass, field
 from .tilemap import TileMap, TileType
@@ -19,6 +20,7 @@ class HierarchicalPathfinder:
     def __init__(self, chunk_size: int = 16):
         self.chunk_size = chunk_size
         self._abstract_cache: Dict[TileMap, np.ndarray] = {}
+        self._blocked_cache: Dict[TileMap, Tuple[int, bytes]] = {}
         
     def _create_abstract_grid(self, tilemap: TileMap) -> np.ndarray:
         """
@@ -66,6 +68,20 @@ class HierarchicalPathfinder:
             self._abstract_cache[tilemap] = self._create_abstract_grid(tilemap)
         return self._abstract_cache[tilemap]
         
+    def _get_blocked_grid(self, tilemap: TileMap) -> bytes:
+        """
+        Get the tilemap's walls as a flat row-major grid with a blocked border.
+        
+        Cached per tilemap and rebuilt when its version changes.
+        """
+        cached = self._blocked_cache.get(tilemap)
+        if cached is not None and cached[0] == tilemap.version:
+            return cached[1]
+        blocked = np.pad(tilemap.tiles == TileType.WALL, 1, constant_values=True)
+        grid = blocked.astype(np.uint8).tobytes()
+        self._blocked_cache[tilemap] = (tilemap.version, grid)
+        return grid
+        
     def _heuristic(self, a: Tuple[int, int], b: Tuple[int, int]) -> float:
         """Calculate heuristic distance between points."""
         return abs(b[0] - a[0]) + abs(b[1] - a[1])
@@ -208,44 +224,51 @@ class HierarchicalPathfinder:
     def _detailed_path(self, tilemap: TileMap, start: Tuple[int, int],
                       goal: Tuple[int, int]) -> List[Tuple[int, int]]:
         """Find detailed path within a chunk using A*."""
-        start_node = PathNode(0, start, 0)
-        open_set = [start_node]
-        closed_set: Set[Tuple[int, int]] = set()
-        g_scores: Dict[Tuple[int, int], float] = {start: 0}
+        # Cells are flat indices into the bordered grid, so the search
+        # hashes ints and needs no bounds checks
+        blocked = self._get_blocked_grid(tilemap)
+        stride = tilemap.width + 2
+        start_index = (start[1] + 1) * stride + start[0] + 1
+        goal_index = (goal[1] + 1) * stride + goal[0] + 1
+        goal_x, goal_y = goal[0] + 1, goal[1] + 1
+        
+        # Diagonal steps cost more, to favour straighter corridors
+        steps = [(stride, 1.0), (1, 1.0), (-stride, 1.0), (-1, 1.0),
+                 (stride + 1, 1.4), (stride - 1, 1.4), (1 - stride, 1.4), (-1 - stride, 1.4)]
+        
+        open_set = [(0.0, start_index)]
+        closed_set: Set[int] = set()
+        g_scores: Dict[int, float] = {start_index: 0.0}
+        came_from: Dict[int, int] = {}
         
         while open_set:
-            current = heapq.heappop(open_set)
+            _, current = heapq.heappop(open_set)
             
-            if current.position == goal:
+            if current == goal_index:
                 # Reconstruct path
-                path = []
-                while current:
-                    path.append(current.position)
-                    current = current.parent
+                path = [goal]
+                while current != start_index:
+                    current = came_from[current]
+                    path.append((current % stride - 1, current // stride - 1))
                 return path[::-1]
                 
-            closed_set.add(current.position)
+            if current in closed_set:
+                continue
+            closed_set.add(current)
+            current_g = g_scores[current]
             
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (-1, 1), (1, -1), (-1, -1)]:
-                nx = current.position[0] + dx
-                ny = current.position[1] + dy
-                
-                if (nx < 0 or nx >= tilemap.width or
-                    ny < 0 or ny >= tilemap.height or
-                    tilemap.get_tile(nx, ny) == TileType.WALL):
+            for offset, step_cost in steps:
+                neighbor = current + offset
+                if blocked[neighbor] or neighbor in closed_set:
                     continue
                     
-                neighbor_pos = (nx, ny)
-                if neighbor_pos in closed_set:
-                    continue
-                    
-                # Use diagonal distance for better paths
-                tentative_g = g_scores[current.position] + (1.4 if dx and dy else 1.0)
+                tentative_g = current_g + step_cost
                 
-                if neighbor_pos not in g_scores or tentative_g < g_scores[neighbor_pos]:
-                    g_scores[neighbor_pos] = tentative_g
-                    f_score = tentative_g + self._heuristic(neighbor_pos, goal)
-                    neighbor_node = PathNode(f_score, neighbor_pos, tentative_g, current)
-                    heapq.heappush(open_set, neighbor_node)
+                if tentative_g < g_scores.get(neighbor, math.inf):
+                    g_scores[neighbor] = tentative_g
+                    came_from[neighbor] = current
+                    f_score = (tentative_g + abs(neighbor % stride - goal_x)
+                               + abs(neighbor // stride - goal_y))
+                    heapq.heappush(open_set, (f_score, neighbor))
                     
         return []
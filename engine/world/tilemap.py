@@ -1,4 +1,5 @@
 from typing import List, Tuple, Dict, Optional, Set
+import math
 import numpy as np
 from dataclasses import dataclass
 from enum import Enum, auto
@@ -23,6 +24,10 @@ class TileType(Enum):
     LIGHT = auto()
     LIGHTS = auto()    # Plural form for config compatibility
 
+# Tile types an agent can stand on
+WALKABLE_TILES = frozenset({TileType.FLOOR, TileType.DOOR})
+_is_walkable_tile = np.frompyfunc(WALKABLE_TILES.__contains__, 1, 1)
+
 @dataclass
 class Room:
     """Represents a room in the megastructure."""
@@ -72,7 +77,14 @@ class TileMap:
         self.height = height
         self.tiles = np.full((height, width), TileType.EMPTY, dtype=object)
         self.rooms: Dict[int, Room] = {}
+        # Rooms by their own id, and the id of the room covering each tile
+        # (-1 outside rooms), indexed [y, x]
+        self.rooms_by_id: Dict[int, Room] = {}
+        self._room_id_grid = np.full((height, width), -1, dtype=np.int32)
         self.next_room_id = 0
+        self.version = 0  # Bumped on every tile change so caches can detect edits
+        self._walkable_version = -1
+        self._walkable = np.zeros((height, width), dtype=bool)
     
     def is_valid_position(self, x: int, y: int) -> bool:
         """Check if a position is within map bounds."""
@@ -84,10 +96,40 @@ class TileMap:
             return self.tiles[y, x]
         return None
     
+    def walkable_grid(self) -> np.ndarray:
+        """
+        Get the walkability of every tile, indexed [y, x].
+        
+        The grid is cached and rebuilt after tile changes; callers must not
+        modify it.
+        """
+        if self._walkable_version != self.version:
+            self._walkable = _is_walkable_tile(self.tiles).astype(bool)
+            self._walkable_version = self.version
+        return self._walkable
+    
+    def query_walkable(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Check many positions for walkability at once.
+        
+        Args:
+            xs: Integer x coordinates
+            ys: Integer y coordinates, matching xs
+            
+        Returns:
+            Boolean array, true where the position is in bounds and walkable
+        """
+        walkable = self.walkable_grid()
+        xs = np.asarray(xs, dtype=np.intp)
+        ys = np.asarray(ys, dtype=np.intp)
+        valid = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        return valid & walkable[ys.clip(0, self.height - 1), xs.clip(0, self.width - 1)]
+    
     def set_tile(self, x: int, y: int, tile_type: TileType) -> bool:
         """Set tile type at position."""
         if self.is_valid_position(x, y):
             self.tiles[y, x] = tile_type
+            self.version += 1
             return True
         return False
     
@@ -109,6 +151,7 @@ class TileMap:
         
         # Add room
         self.rooms[room.id] = room
+        self._index_room(room)
         
         # Set tiles
         for dy in range(height):
@@ -138,6 +181,15 @@ class TileMap:
         # Add room to tilemap
         self.rooms[self.next_room_id] = room
         self.next_room_id += 1
+        self._index_room(room)
+    
+    def _index_room(self, room: Room) -> None:
+        """Record a new room in the room lookup tables."""
+        self.rooms_by_id[room.id] = room
+        # Tiles already claimed keep their room, as the first match of a scan would
+        region = self._room_id_grid[max(0, room.y):max(0, room.y + room.height),
+                                    max(0, room.x):max(0, room.x + room.width)]
+        region[region < 0] = room.id
     
     def add_door(self, x: int, y: int) -> bool:
         """Add a door at the specified position."""
@@ -174,10 +226,11 @@ class TileMap:
     
     def get_room_at(self, x: int, y: int) -> Optional[Room]:
         """Get the room at the specified position."""
-        for room in self.rooms.values():
-            if room.contains_point(x, y):
-                return room
-        return None
+        x = math.floor(x)
+        y = math.floor(y)
+        if not self.is_valid_position(x, y):
+            return None
+        return self.rooms_by_id.get(int(self._room_id_grid[y, x]))
     
     def get_neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
         """Get valid neighboring positions."""
@@ -6,7 +6,6 @@ import random
 import math
 from ...engine.ecs.entity import Entity
 from ...engine.ecs.component import Health, Stats, Position, Collider
-from ...engine.physics.spatial_grid import PhysicsGrid
 
 class CombatantType(Enum):
     """Types of combatants."""
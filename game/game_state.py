@@ -83,11 +83,7 @@ class GameStateManager:
         """Initialize a new game session."""
         # Generate starting sector
         starting_sector = self.world_generator.generate_sector(0, 0)
-        self.collision_system = CollisionSystem(
-            starting_sector.tilemap,
-            self.world_width,
-            self.world_height
-        )
+        self.collision_system = CollisionSystem(starting_sector.tilemap)
         
         # Create player character
         player_entity = Entity()
@@ -167,11 +163,7 @@ class GameStateManager:
             
         # Update collision system with new sector
         new_sector = self.world_generator.get_sector(new_x, new_y)
-        self.collision_system = CollisionSystem(
-            new_sector.tilemap,
-            self.world_width,
-            self.world_height
-        )
+        self.collision_system = CollisionSystem(new_sector.tilemap)
         
     def save_game(self, filename: str) -> None:
         """Save current game state."""
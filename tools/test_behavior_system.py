@@ -0,0 +1,124 @@
+"""Tests for the batched pursuit path of BehaviorSystem."""
+import math
+import os
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.ai import behavior
+from engine.ai.behavior import BehaviorSystem
+from engine.ai._kernels import pursue_batch, pursue_batch_parallel
+from engine.config.config_manager import ConfigManager
+from engine.ecs.component import AI, Position, Physical, BehaviorStateId
+from engine.ecs.world import World
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+def _pursuit_world(seed, count):
+    """A world of guards each pursuing its own stationary target."""
+    rng = random.Random(seed)
+    world = World()
+    system = BehaviorSystem(world, ConfigManager(DATA_DIR))
+    pairs = []
+    for _ in range(count):
+        # Spread out so no guard is near another's target
+        x, y = rng.uniform(0, 2000), rng.uniform(0, 2000)
+        angle = rng.uniform(0, 2 * math.pi)
+        # Guards attack within 1.5 and lose targets beyond 7.5
+        distance = rng.uniform(0.0, 9.0)
+        target = world.create_entity()
+        world.add_component(target.id, Position(x=x + distance * math.cos(angle),
+                                                y=y + distance * math.sin(angle)))
+        world.add_component(target.id, Physical())
+        guard = world.create_entity()
+        world.add_component(guard.id, Position(x=x, y=y))
+        world.add_component(guard.id, Physical())
+        world.add_component(guard.id, AI(behavior_type="guard"))
+        pairs.append((guard, target))
+
+    # Set up the states, then point every guard at its target
+    system.update(0.1)
+    for guard, target in pairs:
+        ai = guard.get_component(AI)
+        ai.state.target_id = target.id
+        system._transition(guard, ai, system.entity_states[guard.id],
+                           BehaviorStateId.PURSUING, system._contexts[guard.id])
+    return world, system, [guard for guard, _ in pairs]
+
+def _snapshot(guards):
+    result = []
+    for guard in guards:
+        pos = guard.get_component(Position)
+        state = guard.get_component(AI).state
+        result.append((pos.x, pos.y, state.current_state, state.target_id, state.target_distance))
+    return result
+
+class TestBatchedPursuit:
+    """Pursuit advanced as one batch must match ticking each PursuingState."""
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_batch_matches_per_entity_states(self, seed, monkeypatch):
+        world, system, guards = _pursuit_world(seed, 200)
+        system.update(0.1)
+        batched = _snapshot(guards)
+
+        monkeypatch.setattr(behavior, "BATCH_MIN_SIZE", 1 << 30)
+        world, system, guards = _pursuit_world(seed, 200)
+        system.update(0.1)
+        scalar = _snapshot(guards)
+
+        # Positions are compared exactly, so float32 rounding in the batch
+        # would show; distances may differ in the last bit between kernels
+        assert [entry[:4] for entry in batched] == [entry[:4] for entry in scalar]
+        assert [entry[4] for entry in batched] == pytest.approx([entry[4] for entry in scalar], rel=1e-12)
+        outcomes = {state for _, _, state, _, _ in scalar}
+        assert outcomes == {BehaviorStateId.PURSUING, BehaviorStateId.ATTACKING, BehaviorStateId.IDLE}
+
+    def test_removed_entities_are_forgotten(self):
+        world, system, guards = _pursuit_world(1, 50)
+        for guard in guards[:20]:
+            world.remove_entity(guard.id)
+        system.update(0.1)
+        live = {guard.id for guard in guards[20:]}
+        assert set(system._contexts) == live
+        assert set(system.entity_states) == live
+        assert set(system._state_pool) == live
+
+class TestThreadedPursuit:
+    """The thread-pool split of the pursuit batch must not change its results."""
+
+    @pytest.mark.parametrize("chunks", [1, 3, 8, 50])
+    def test_parallel_kernel_matches_single_batch(self, chunks):
+        rng = np.random.default_rng(chunks)
+        n = 37
+        args = (rng.uniform(0, 50, n), rng.uniform(0, 50, n), rng.uniform(0, 50, n),
+                rng.uniform(0, 50, n), rng.random(n) < 0.9, rng.uniform(0.5, 3, n),
+                np.full(n, 400.0), np.full(n, 4.0), 0.1)
+        expected = pursue_batch(*args)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            result = pursue_batch_parallel(executor, chunks, *args)
+        for got, want in zip(result, expected):
+            np.testing.assert_array_equal(got, want)
+
+    def test_threaded_update_matches_single_thread(self, monkeypatch):
+        world, system, guards = _pursuit_world(4, 100)
+        system.update(0.1)
+        expected = _snapshot(guards)
+
+        monkeypatch.setattr(behavior, "PARALLEL_MIN_SIZE", 1)
+        world, system, guards = _pursuit_world(4, 100)
+        system.update(0.1)
+        assert system._executor is not None
+        assert _snapshot(guards) == expected
+
+        system.shutdown()
+        assert system._executor is None
+        # The next batch starts a fresh pool
+        system.update(0.1)
+        assert system._executor is not None
+        system.shutdown()
@@ -0,0 +1,88 @@
+"""Tests for the compiled, stack-evaluated BehaviorTree."""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.ai import behavior_tree as bt
+
+class _Script:
+    """Leaf callable replaying a fixed status script and logging its calls."""
+
+    def __init__(self, name, statuses, log):
+        self.name = name
+        self.statuses = statuses
+        self.log = log
+        self.calls = 0
+
+    def __call__(self, blackboard):
+        self.log.append(self.name)
+        status = self.statuses[self.calls % len(self.statuses)]
+        self.calls += 1
+        return status
+
+class _Custom(bt.BehaviorNode):
+    """Node with its own tick(), which the compiled tree treats as a leaf."""
+
+    __slots__ = ('_script',)
+
+    def __init__(self, name, script):
+        super().__init__(name)
+        self._script = script
+
+    def tick(self):
+        return self._script(self.blackboard)
+
+def _random_tree(rng, log, depth=0):
+    """Build a random tree; the same seed always builds the same tree."""
+    name = f"n{rng.random():.6f}"
+    if depth >= 4 or rng.random() < 0.3:
+        statuses = [rng.choice([bt.SUCCESS, bt.FAILURE, bt.RUNNING]) for _ in range(rng.randint(1, 5))]
+        script = _Script(name, statuses, log)
+        kind = rng.randrange(3)
+        if kind == 0:
+            return bt.Action(name, script)
+        if kind == 1:
+            return bt.Condition(name, lambda bb, script=script: script(bb) == bt.SUCCESS)
+        return _Custom(name, script)
+
+    kind = rng.randrange(6)
+    if kind == 0:
+        return bt.Inverter(name, _random_tree(rng, log, depth + 1))
+    if kind == 1:
+        return bt.RepeatUntilSuccess(name, _random_tree(rng, log, depth + 1),
+                                     max_attempts=rng.choice([-1, 1, 3]))
+    composite = [bt.Sequence, bt.Selector, bt.ParallelSequence, bt.ParallelSelector][kind - 2](name)
+    for _ in range(rng.randint(1, 4)):
+        composite.add_child(_random_tree(rng, log, depth + 1))
+    return composite
+
+class TestCompiledBehaviorTree:
+    """BehaviorTree.tick checked against ticking the node objects."""
+
+    @pytest.mark.parametrize("seed", range(40))
+    def test_matches_node_ticking(self, seed):
+        node_log, tree_log = [], []
+        node_root = _random_tree(random.Random(seed), node_log)
+        tree = bt.BehaviorTree(_random_tree(random.Random(seed), tree_log))
+
+        blackboard = bt.BlackboardData(entity=None, world=None)
+        node_root.initialize(blackboard)
+        tree.initialize(blackboard)
+
+        for _ in range(30):
+            assert tree.tick() == node_root.tick()
+        assert tree_log == node_log
+
+    def test_deep_tree_does_not_recurse(self):
+        log = []
+        root = leaf = bt.Action("leaf", _Script("leaf", [bt.SUCCESS], log))
+        for index in range(5000):
+            root = bt.Inverter(f"inv{index}", root)
+        tree = bt.BehaviorTree(root)
+        tree.initialize(bt.BlackboardData(entity=None, world=None))
+        assert tree.tick() == bt.SUCCESS
+        assert log == ["leaf"]
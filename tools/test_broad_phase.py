@@ -0,0 +1,71 @@
+"""Tests for the spatial hash broad phase of CollisionSystem."""
+import math
+import os
+import sys
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.ecs.component import Position, Collider
+from engine.ecs.entity import Entity
+from engine.physics._kernels import hash_pairs
+from engine.physics.collision import CollisionSystem
+from engine.world.tilemap import TileMap
+
+class TestBroadPhase:
+    """The spatial hash broad phase checked against every pair of bodies."""
+
+    def _sharing_pairs(self, px, py, r, cell_size):
+        """All index pairs whose bounds touch a common cell."""
+        lo_x = np.floor((px - r) / cell_size)
+        hi_x = np.floor((px + r) / cell_size)
+        lo_y = np.floor((py - r) / cell_size)
+        hi_y = np.floor((py + r) / cell_size)
+        return {
+            (i, j) for i, j in combinations(range(len(px)), 2)
+            if lo_x[i] <= hi_x[j] and lo_x[j] <= hi_x[i]
+            and lo_y[i] <= hi_y[j] and lo_y[j] <= hi_y[i]
+        }
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_hash_pairs_matches_all_pairs(self, seed):
+        rng = np.random.default_rng(seed)
+        n = 150
+        px = rng.uniform(-20, 20, n)
+        py = rng.uniform(-20, 20, n)
+        r = rng.uniform(0.1, 3.0, n)
+        cell_size = 2.0
+
+        a, b = hash_pairs(px, py, r, cell_size)
+        pairs = list(zip(a.tolist(), b.tolist()))
+        assert len(pairs) == len(set(pairs)), "pairs must be reported once"
+        assert all(i < j for i, j in pairs)
+        assert set(pairs) == self._sharing_pairs(px, py, r, cell_size)
+
+    def test_hash_pairs_empty(self):
+        empty = np.zeros(0)
+        a, b = hash_pairs(empty, empty, empty, 1.0)
+        assert len(a) == 0 and len(b) == 0
+
+    def test_candidate_pairs_cover_every_overlap(self):
+        rng = np.random.default_rng(3)
+        collision = CollisionSystem(TileMap(10, 10))
+        entities = []
+        for entity_id in range(120):
+            entity = Entity(entity_id)
+            entity.add_component(Position(x=float(rng.uniform(0, 30)), y=float(rng.uniform(0, 30))))
+            entity.add_component(Collider(radius=float(rng.uniform(0.2, 1.5))))
+            entities.append(entity)
+
+        pairs = [(a.id, b.id) for a, b in collision._candidate_pairs(entities)]
+        assert len(pairs) == len({frozenset(pair) for pair in pairs})
+
+        candidates = {frozenset(pair) for pair in pairs}
+        for a, b in combinations(entities, 2):
+            pos_a, pos_b = a.get_component(Position), b.get_component(Position)
+            reach = a.get_component(Collider).radius + b.get_component(Collider).radius
+            if math.hypot(pos_a.x - pos_b.x, pos_a.y - pos_b.y) < reach:
+                assert frozenset((a.id, b.id)) in candidates
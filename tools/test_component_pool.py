@@ -0,0 +1,91 @@
+"""Tests for the column-wise NumericComponentPool."""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.ecs.component import Position
+from engine.ecs.component_pool import NumericComponentPool
+from engine.ecs.components.movement import MovementComponent
+
+class TestNumericComponentPool:
+    """Slot assignment, growth and view lifetime of NumericComponentPool."""
+
+    @pytest.fixture
+    def pool(self):
+        return NumericComponentPool(Position, capacity=4)
+
+    def test_acquire_fills_defaults_and_kwargs(self, pool):
+        position = pool.acquire(10, x=1.5, y=-2.0)
+        assert (position.x, position.y, position.z) == (1.5, -2.0, 0.0)
+        assert position.entity_id == 10
+        assert 10 in pool and len(pool) == 1
+        assert pool.x[pool.slot_of(10)] == 1.5
+
+    def test_view_writes_reach_columns(self, pool):
+        position = pool.acquire(1)
+        position.x = 7.0
+        assert pool.x[pool.slot_of(1)] == 7.0
+        pool.y[pool.slot_of(1)] = 3.0
+        assert position.y == 3.0
+
+    def test_release_recycles_slots(self, pool):
+        for entity_id in range(4):
+            pool.acquire(entity_id)
+        slot = pool.slot_of(2)
+        pool.release(2)
+        assert 2 not in pool and pool.slot_of(2) == -1
+        assert pool.slot_entity[slot] == -1
+        pool.acquire(9)
+        assert pool.slot_of(9) == slot
+        assert pool.capacity == 4
+
+    def test_grow_keeps_values(self, pool):
+        for entity_id in range(50):
+            pool.acquire(entity_id, x=float(entity_id), y=float(-entity_id))
+        assert pool.capacity >= 50
+        for entity_id in range(50):
+            position = pool.get(entity_id)
+            assert (position.x, position.y) == (entity_id, -entity_id)
+        assert pool.slots_of([0, 49, 99]).tolist()[-1] == -1
+
+    def test_active_slots_track_structure(self, pool):
+        for entity_id in range(6):
+            pool.acquire(entity_id)
+        pool.release(1)
+        pool.release(4)
+        active = pool.active_slots()
+        assert sorted(pool.slot_entity[active].tolist()) == [0, 2, 3, 5]
+        version = pool.version
+        pool.acquire(7)
+        assert pool.version == version + 1
+        assert len(pool.active_slots()) == 5
+
+    def test_released_view_is_detached(self, pool):
+        stale = pool.acquire(1, x=1.0)
+        pool.release(1)
+        fresh = pool.acquire(2, x=5.0)
+        assert fresh is not stale
+        with pytest.raises(ReferenceError):
+            stale.x = 99.0
+        with pytest.raises(ReferenceError):
+            stale.entity_id
+        assert fresh.x == 5.0 and fresh.entity_id == 2
+
+    def test_optional_and_object_fields(self):
+        pool = NumericComponentPool(MovementComponent)
+        movement = pool.acquire(1, target_x=4.0)
+        assert movement.target_x == 4.0 and movement.target_y is None
+        assert np.isnan(pool.target_y[pool.slot_of(1)])
+        movement.target_x = None
+        assert movement.target_x is None
+        
+        # Object columns keep the value itself and drop it on release
+        stats = movement.stats
+        assert pool.stats[pool.slot_of(1)] is stats
+        slot = pool.slot_of(1)
+        pool.release(1)
+        assert pool.stats[slot] is None
@@ -0,0 +1,185 @@
+"""Tests for ConfigManager loading and its parse cache."""
+import os
+import pickle
+import shutil
+import sys
+from collections.abc import Mapping
+from types import MappingProxyType
+
+import pytest
+import yaml
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.config.config_manager import ConfigManager, _CACHE_FILE
+from engine.ecs.component import AI, Position
+from engine.ecs.world import World
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+SECTIONS = ('entities', 'behaviors', 'generation')
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """A private copy of the game data, without any parse cache."""
+    target = tmp_path / "data"
+    shutil.copytree(DATA_DIR, target, ignore=shutil.ignore_patterns('.cache'))
+    return target
+
+def _parsed(data_dir):
+    """Every section parsed straight from its YAML files."""
+    data = {}
+    for section in SECTIONS:
+        data[section] = {}
+        for file in sorted((data_dir / section).glob('*.yaml')):
+            with open(file) as f:
+                data[section].update(yaml.safe_load(f))
+    return data
+
+def _loaded(config):
+    return {'entities': config.entity_templates,
+            'behaviors': ConfigManager._thaw(config.behavior_configs),
+            'generation': config.generation_rules}
+
+def _no_yaml(monkeypatch):
+    def load(*args, **kwargs):
+        raise AssertionError("configuration was parsed instead of read from the cache")
+    monkeypatch.setattr(yaml, "load", load)
+
+class TestConfigCache:
+    """Configuration read back from the pickle cache must match parsing the YAML."""
+
+    def test_cached_load_matches_parse(self, data_dir, monkeypatch):
+        expected = _parsed(data_dir)
+        assert _loaded(ConfigManager(str(data_dir))) == expected
+        assert (data_dir / _CACHE_FILE).exists()
+
+        _no_yaml(monkeypatch)
+        assert _loaded(ConfigManager(str(data_dir))) == expected
+
+    def test_edited_file_is_reparsed(self, data_dir):
+        ConfigManager(str(data_dir))
+        with open(data_dir / 'entities' / 'characters.yaml', 'a') as f:
+            f.write("\nrock:\n  components:\n    Position: {x: 1.0, y: 2.0}\n")
+        config = ConfigManager(str(data_dir))
+        assert _loaded(config) == _parsed(data_dir)
+        assert config.get_entity_template('rock')['components']['Position']['y'] == 2.0
+
+    def test_added_and_removed_files_are_seen(self, data_dir, monkeypatch):
+        ConfigManager(str(data_dir))
+        (data_dir / 'behaviors' / 'extra.yaml').write_text("sleeper:\n  speed: 0.0\n")
+        assert ConfigManager(str(data_dir)).get_behavior_config('sleeper') == {'speed': 0.0}
+
+        (data_dir / 'behaviors' / 'extra.yaml').unlink()
+        config = ConfigManager(str(data_dir))
+        assert config.get_behavior_config('sleeper') is None
+        assert _loaded(config) == _parsed(data_dir)
+
+        # The refreshed cache is used again on the next load
+        expected = _parsed(data_dir)
+        _no_yaml(monkeypatch)
+        assert _loaded(ConfigManager(str(data_dir))) == expected
+
+    @pytest.mark.parametrize("contents", [b"", b"not a pickle",
+                                          pickle.dumps(['wrong', 'shape']),
+                                          pickle.dumps({'sig': [], 'data': {}})])
+    def test_bad_cache_falls_back_to_parsing(self, data_dir, contents):
+        (data_dir / _CACHE_FILE).parent.mkdir()
+        (data_dir / _CACHE_FILE).write_bytes(contents)
+        assert _loaded(ConfigManager(str(data_dir))) == _parsed(data_dir)
+
+    def test_unwritable_cache_is_not_fatal(self, data_dir):
+        # A plain file where the cache directory should be
+        (data_dir / _CACHE_FILE.parent).write_text("")
+        assert _loaded(ConfigManager(str(data_dir))) == _parsed(data_dir)
+        assert _loaded(ConfigManager(str(data_dir))) == _parsed(data_dir)
+
+def _reference_merge(base, override):
+    """The recursive copy-on-merge the iterative in-place merge replaced."""
+    result = base.copy()
+    for key, value in override.items():
+        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
+            result[key] = _reference_merge(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+def _reference_template(templates, name):
+    template = templates.get(name)
+    if not template:
+        return None
+    if 'inherit' in template:
+        parent = _reference_template(templates, template['inherit'])
+        if parent:
+            return _reference_merge(parent, template)
+    return template
+
+def _assert_frozen(value):
+    if isinstance(value, Mapping):
+        assert isinstance(value, MappingProxyType)
+        for item in value.values():
+            _assert_frozen(item)
+    elif isinstance(value, list):
+        for item in value:
+            _assert_frozen(item)
+
+def _assert_interned(value):
+    if isinstance(value, Mapping):
+        for key, item in value.items():
+            _assert_interned(key)
+            _assert_interned(item)
+    elif isinstance(value, list):
+        for item in value:
+            _assert_interned(item)
+    elif isinstance(value, str):
+        assert sys.intern(value) is value
+
+class TestFrozenTemplates:
+    """Resolved templates and behavior configs are shared, read-only views."""
+
+    @pytest.fixture
+    def config(self, data_dir):
+        return ConfigManager(str(data_dir))
+
+    def test_resolved_templates_match_reference(self, config, data_dir):
+        templates = _parsed(data_dir)['entities']
+        # Nested inheritance, with the child overriding part of a nested dict
+        templates['hunter'] = config.entity_templates['hunter'] = {
+            'inherit': 'silicon_creature',
+            'components': {'AI': {'goals': {'hunt': 1.0}}, 'Health': {'current': 50.0}},
+        }
+        for name in templates:
+            resolved = config.get_entity_template(name)
+            _assert_frozen(resolved)
+            assert ConfigManager._thaw(resolved) == _reference_template(templates, name)
+            assert config.get_entity_template(name) is resolved
+        assert config.get_entity_template('missing') is None
+
+    def test_shared_configs_are_read_only(self, config):
+        template = config.get_entity_template('wanderer')
+        with pytest.raises(TypeError):
+            template['components']['AI']['goals']['explore'] = 0.0
+        assert config.behavior_configs
+        for behavior_config in config.behavior_configs.values():
+            _assert_frozen(behavior_config)
+        with pytest.raises(TypeError):
+            config.get_behavior_config('guard')['speed'] = 0.0
+
+    def test_loaded_strings_are_interned(self, config):
+        _assert_interned(config.entity_templates)
+        _assert_interned(ConfigManager._thaw(config.behavior_configs))
+
+    def test_entities_own_their_component_data(self, config):
+        world = World()
+        first = config.create_entity_from_template(world, 'wanderer', {'x': 3.0, 'y': 4.0})
+        second = config.create_entity_from_template(world, 'wanderer')
+
+        goals = first.get_component(AI).goals
+        assert type(goals) is dict
+        goals['explore'] = 0.0
+        assert second.get_component(AI).goals['explore'] == 0.8
+        assert config.get_entity_template('wanderer')['components']['AI']['goals']['explore'] == 0.8
+
+        assert (first.get_component(Position).x, first.get_component(Position).y) == (3.0, 4.0)
+        assert (second.get_component(Position).x, second.get_component(Position).y) == (0.0, 0.0)
+        assert config.create_entity_from_template(world, 'missing') is None
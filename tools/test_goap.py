@@ -0,0 +1,97 @@
+"""Tests for the packed-state GOAP planner."""
+import heapq
+import itertools
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.ai.goap import GOAP, Action, create_combat_actions, create_exploration_actions
+
+KEYS = ["a", "b", "c", "d", "e"]
+
+def _dict_plan_cost(actions, initial_state, goal_state):
+    """Cheapest plan cost found by uniform-cost search over dict world states."""
+    counter = itertools.count()
+    open_set = [(0.0, next(counter), initial_state)]
+    closed = set()
+    while open_set:
+        cost, _, state = heapq.heappop(open_set)
+        if all(state.get(key) == value for key, value in goal_state.items()):
+            return cost
+        state_key = tuple(sorted(state.items()))
+        if state_key in closed:
+            continue
+        closed.add(state_key)
+        for action in actions:
+            if action.check_preconditions(state):
+                heapq.heappush(open_set, (cost + action.cost, next(counter),
+                                          action.apply_effects(state)))
+    return None
+
+def _random_actions(rng, count):
+    """Actions with one effect each, so the planner's heuristic is admissible."""
+    actions = []
+    for index in range(count):
+        action = Action(f"act{index}", cost=float(rng.randint(1, 4)))
+        for key in rng.sample(KEYS, rng.randint(0, 2)):
+            action.preconditions[key] = rng.random() < 0.5
+        action.effects[rng.choice(KEYS)] = rng.random() < 0.5
+        actions.append(action)
+    return actions
+
+class TestGOAP:
+    """The bitmask planner checked against a search over dict world states."""
+
+    def _replay(self, plan, initial_state):
+        state = dict(initial_state)
+        for action in plan:
+            assert action.check_preconditions(state)
+            state = action.apply_effects(state)
+        return state
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_matches_dict_search(self, seed):
+        rng = random.Random(seed)
+        actions = _random_actions(rng, 8)
+        planner = GOAP()
+        for action in actions:
+            planner.add_action(action)
+
+        for _ in range(10):
+            initial_state = {key: rng.random() < 0.5 for key in rng.sample(KEYS, 3)}
+            goal_state = {key: rng.random() < 0.5 for key in rng.sample(KEYS, 2)}
+            expected = _dict_plan_cost(actions, initial_state, goal_state)
+            plan = planner.plan(initial_state, goal_state, max_iterations=10000)
+            if expected is None:
+                assert plan is None
+                continue
+            assert plan is not None
+            final = self._replay(plan, initial_state)
+            assert all(final.get(key) == value for key, value in goal_state.items())
+            assert sum(action.cost for action in plan) == expected
+
+    def test_stock_actions(self):
+        planner = GOAP()
+        for action in create_combat_actions() + create_exploration_actions():
+            planner.add_action(action)
+        initial_state = {"has_weapon": True, "in_range": False, "target_visible": True}
+        goal_state = {"target_damaged": True}
+        plan = planner.plan(initial_state, goal_state)
+        expected = _dict_plan_cost(planner.actions, initial_state, goal_state)
+        if expected is None:
+            assert plan is None
+        else:
+            final = self._replay(plan, initial_state)
+            assert final["target_damaged"] is True
+
+    def test_unknown_goal_key_has_no_plan(self):
+        planner = GOAP()
+        action = Action("open", cost=1.0)
+        action.effects["door_open"] = True
+        planner.add_action(action)
+        assert planner.plan({}, {"never_set": True}) is None
+        assert [a.name for a in planner.plan({}, {"door_open": True})] == ["open"]
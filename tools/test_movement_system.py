@@ -0,0 +1,160 @@
+"""Tests for the batched ECS MovementSystem."""
+import math
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.ecs.entity_manager import EntityManager
+from engine.ecs.components.movement import MovementComponent, TransformComponent
+from engine.ecs.systems.movement_system import MovementSystem
+from engine.physics.movement import MovementState, MovementStats
+
+class _Mover:
+    """Plain copy of one entity's movement and transform state."""
+
+    def __init__(self, movement, transform):
+        self.stats = movement.stats
+        self.state = movement.state
+        self.target_x = movement.target_x
+        self.target_y = movement.target_y
+        self.target_rotation = movement.target_rotation
+        self.velocity_x = movement.velocity_x
+        self.velocity_y = movement.velocity_y
+        self.x = transform.x
+        self.y = transform.y
+        self.rotation = transform.rotation
+
+def _reference_step(mover, dt):
+    """One tick of the per-entity movement loop the batched update replaced."""
+    if mover.target_x is not None and mover.target_y is not None:
+        dx = mover.target_x - mover.x
+        dy = mover.target_y - mover.y
+        distance = math.sqrt(dx * dx + dy * dy)
+        if distance > 0.1:
+            speed = (mover.stats.run_speed if mover.state == MovementState.RUNNING
+                     else mover.stats.walk_speed)
+            mover.velocity_x = dx / distance * speed
+            mover.velocity_y = dy / distance * speed
+            mover.state = MovementState.WALKING
+        else:
+            mover.x = mover.target_x
+            mover.y = mover.target_y
+            mover.target_x = None
+            mover.target_y = None
+            mover.velocity_x = 0
+            mover.velocity_y = 0
+            mover.state = MovementState.IDLE
+
+    if mover.target_rotation is not None:
+        target_rotation = mover.target_rotation % 360
+        diff = target_rotation - mover.rotation % 360
+        if diff > 180:
+            diff -= 360
+        elif diff < -180:
+            diff += 360
+        if abs(diff) > 0.1:
+            rotation_speed = mover.stats.turn_speed * dt
+            if abs(diff) < rotation_speed:
+                mover.rotation = target_rotation
+            else:
+                mover.rotation += math.copysign(rotation_speed, diff)
+        else:
+            mover.rotation = target_rotation
+            mover.target_rotation = None
+
+    mover.x += mover.velocity_x * dt
+    mover.y += mover.velocity_y * dt
+
+class TestMovementSystem:
+    """MovementSystem.update checked against the per-entity loop."""
+
+    @pytest.fixture
+    def setup(self):
+        entity_manager = EntityManager()
+        return entity_manager, MovementSystem(entity_manager)
+
+    def _spawn(self, entity_manager, **movement):
+        entity = entity_manager.create_entity()
+        entity_manager.add_component(entity.id, TransformComponent)
+        entity_manager.add_component(entity.id, MovementComponent, **movement)
+        return entity
+
+    def test_single_steering_entity(self, setup):
+        entity_manager, system = setup
+        entity = self._spawn(entity_manager)
+        system.set_movement_target(entity, 10.0, 0.0, running=True)
+        system.set_rotation_target(entity, 90.0)
+
+        movement = entity_manager.get_component(entity.id, MovementComponent)
+        transform = entity_manager.get_component(entity.id, TransformComponent)
+        assert movement.state == MovementState.RUNNING
+
+        system.update(0.5)
+        assert movement.velocity_x == pytest.approx(movement.stats.run_speed)
+        assert transform.x == pytest.approx(movement.stats.run_speed * 0.5)
+        assert transform.rotation == pytest.approx(90.0)
+        assert movement.state == MovementState.WALKING
+
+        for _ in range(20):
+            system.update(0.5)
+        assert (transform.x, transform.y) == (10.0, 0.0)
+        assert movement.state == MovementState.IDLE
+        assert movement.target_x is None and movement.target_rotation is None
+
+    def test_direct_movement_and_stop(self, setup):
+        entity_manager, system = setup
+        entity = self._spawn(entity_manager)
+        system.set_direct_movement(entity, (3.0, 4.0))
+        movement = entity_manager.get_component(entity.id, MovementComponent)
+        assert movement.state == MovementState.WALKING
+        assert movement.velocity_x == pytest.approx(0.6 * movement.stats.walk_speed)
+
+        system.update(1.0)
+        transform = entity_manager.get_component(entity.id, TransformComponent)
+        assert transform.y == pytest.approx(0.8 * movement.stats.walk_speed)
+
+        system.stop_movement(entity)
+        system.update(1.0)
+        assert movement.state == MovementState.IDLE
+        assert transform.y == pytest.approx(0.8 * movement.stats.walk_speed)
+
+    def test_matches_per_entity_loop(self, setup):
+        entity_manager, system = setup
+        rng = random.Random(5)
+        entities = []
+        for _ in range(300):
+            stats = MovementStats(walk_speed=rng.uniform(0.5, 3.0),
+                                  run_speed=rng.uniform(3.0, 6.0),
+                                  turn_speed=rng.uniform(30.0, 360.0))
+            entity = self._spawn(entity_manager, stats=stats,
+                                 velocity_x=rng.uniform(-1, 1), velocity_y=rng.uniform(-1, 1))
+            if rng.random() < 0.7:
+                system.set_movement_target(entity, rng.uniform(-20, 20), rng.uniform(-20, 20),
+                                           running=rng.random() < 0.5)
+            if rng.random() < 0.5:
+                system.set_rotation_target(entity, rng.uniform(-720, 720))
+            entities.append(entity)
+        # One entity without a transform is left alone
+        entity_manager.add_component(entity_manager.create_entity().id, MovementComponent)
+
+        movers = [_Mover(entity_manager.get_component(e.id, MovementComponent),
+                         entity_manager.get_component(e.id, TransformComponent))
+                  for e in entities]
+        for _ in range(60):
+            system.update(0.1)
+            for mover in movers:
+                _reference_step(mover, 0.1)
+
+        for entity, mover in zip(entities, movers):
+            movement = entity_manager.get_component(entity.id, MovementComponent)
+            transform = entity_manager.get_component(entity.id, TransformComponent)
+            assert transform.x == pytest.approx(mover.x, abs=1e-9)
+            assert transform.y == pytest.approx(mover.y, abs=1e-9)
+            assert transform.rotation == pytest.approx(mover.rotation, abs=1e-9)
+            assert movement.state == mover.state
+            assert movement.target_x == mover.target_x
+            assert movement.target_rotation == mover.target_rotation
@@ -0,0 +1,171 @@
+"""Tests for the flat-grid A* pathfinders."""
+import os
+import random
+import sys
+from collections import deque
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.ai.pathfinding import PathFinder
+from engine.world.hierarchical_pathfinding import HierarchicalPathfinder
+from engine.world.tilemap import TileMap, TileType
+
+def _random_map(rng, width, height, wall_ratio):
+    """A floor map with randomly scattered walls."""
+    tilemap = TileMap(width, height)
+    for y in range(height):
+        for x in range(width):
+            tilemap.set_tile(x, y, TileType.WALL if rng.random() < wall_ratio else TileType.FLOOR)
+    return tilemap
+
+def _walkable(tilemap, x, y):
+    return tilemap.is_valid_position(x, y) and tilemap.get_tile(x, y) in (TileType.FLOOR, TileType.DOOR)
+
+def _bfs_distance(tilemap, start, goal, moves):
+    """Shortest number of steps from start to goal, or None if unreachable."""
+    distance = {start: 0}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        if (x, y) == goal:
+            return distance[goal]
+        for dx, dy in moves:
+            nxt = (x + dx, y + dy)
+            if nxt not in distance and _walkable(tilemap, *nxt):
+                distance[nxt] = distance[(x, y)] + 1
+                queue.append(nxt)
+    return None
+
+MOVES4 = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+MOVES8 = MOVES4 + [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+def _floor_cells(tilemap):
+    return [(x, y) for y in range(tilemap.height) for x in range(tilemap.width)
+            if _walkable(tilemap, x, y)]
+
+class TestPathFinder:
+    """PathFinder.find_path checked against breadth-first search."""
+
+    def _check_path(self, tilemap, path, start, goal):
+        assert path[0] == start and path[-1] == goal
+        for (ax, ay), (bx, by) in zip(path, path[1:]):
+            assert abs(ax - bx) + abs(ay - by) == 1
+            assert _walkable(tilemap, bx, by)
+
+    def _check_searches(self, rng, tilemap, pathfinder, count):
+        cells = _floor_cells(tilemap)
+        for _ in range(count):
+            start, goal = rng.choice(cells), rng.choice(cells)
+            expected = _bfs_distance(tilemap, start, goal, MOVES4)
+            path = pathfinder.find_path(start, goal)
+            if expected is None:
+                assert path is None
+            else:
+                assert path is not None
+                self._check_path(tilemap, path, start, goal)
+                assert len(path) - 1 == expected
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_shortest_paths(self, seed):
+        rng = random.Random(seed)
+        tilemap = _random_map(rng, 40, 30, 0.3)
+        self._check_searches(rng, tilemap, PathFinder(tilemap), 40)
+
+    def test_blocked_endpoints(self):
+        tilemap = _random_map(random.Random(0), 10, 10, 0.0)
+        tilemap.set_tile(5, 5, TileType.WALL)
+        pathfinder = PathFinder(tilemap)
+        assert pathfinder.find_path((0, 0), (5, 5)) is None
+        assert pathfinder.find_path((5, 5), (0, 0)) is None
+        assert pathfinder.find_path((3, 3), (3, 3)) == [(3, 3)]
+
+    def test_paths_along_map_edges(self):
+        # The flat grid's blocked border must keep searches on the map when
+        # the only route hugs the edge
+        tilemap = _random_map(random.Random(0), 12, 8, 0.0)
+        for y in range(1, 8):
+            tilemap.set_tile(6, y, TileType.WALL)
+        pathfinder = PathFinder(tilemap)
+        path = pathfinder.find_path((0, 7), (11, 7))
+        self._check_path(tilemap, path, (0, 7), (11, 7))
+        assert (6, 0) in path
+        assert all(tilemap.is_valid_position(x, y) for x, y in path)
+        assert pathfinder.find_path((-1, 0), (3, 3)) is None
+        assert pathfinder.find_path((0, 0), (12, 0)) is None
+
+    def test_sees_tile_changes(self):
+        tilemap = _random_map(random.Random(0), 10, 3, 0.0)
+        pathfinder = PathFinder(tilemap)
+        assert len(pathfinder.find_path((0, 1), (9, 1))) == 10
+
+        # Wall off the map; the cached bitmap has to be rebuilt
+        for y in range(3):
+            tilemap.set_tile(5, y, TileType.WALL)
+        assert pathfinder.find_path((0, 1), (9, 1)) is None
+        tilemap.set_tile(5, 2, TileType.DOOR)
+        assert len(pathfinder.find_path((0, 1), (9, 1))) == 12
+
+    def test_reused_scratch_matches_fresh_search(self):
+        # Stamped scratch lists carry over between searches; a long run of
+        # searches on one PathFinder must match a fresh one for each query
+        rng = random.Random(9)
+        tilemap = _random_map(rng, 30, 30, 0.35)
+        shared = PathFinder(tilemap)
+        cells = _floor_cells(tilemap)
+        for _ in range(200):
+            start, goal = rng.choice(cells), rng.choice(cells)
+            path = shared.find_path(start, goal)
+            fresh = PathFinder(tilemap).find_path(start, goal)
+            assert (path is None) == (fresh is None)
+            if path is not None:
+                assert len(path) == len(fresh)
+                self._check_path(tilemap, path, start, goal)
+
+class TestHierarchicalDetailedPath:
+    """HierarchicalPathfinder._detailed_path, which carves corridors over walls only."""
+
+    def _passable(self, tilemap, x, y):
+        return tilemap.is_valid_position(x, y) and tilemap.get_tile(x, y) != TileType.WALL
+
+    def _reachable(self, tilemap, start, goal):
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            x, y = queue.popleft()
+            if (x, y) == goal:
+                return True
+            for dx, dy in MOVES8:
+                nxt = (x + dx, y + dy)
+                if nxt not in seen and self._passable(tilemap, *nxt):
+                    seen.add(nxt)
+                    queue.append(nxt)
+        return False
+
+    @pytest.mark.parametrize("seed", range(4))
+    def test_paths_are_valid_and_complete(self, seed):
+        rng = random.Random(seed)
+        tilemap = _random_map(rng, 30, 30, 0.4)
+        pathfinder = HierarchicalPathfinder()
+        cells = [(x, y) for y in range(30) for x in range(30) if self._passable(tilemap, x, y)]
+        for _ in range(40):
+            start, goal = rng.choice(cells), rng.choice(cells)
+            path = pathfinder._detailed_path(tilemap, start, goal)
+            if not self._reachable(tilemap, start, goal):
+                assert path == []
+                continue
+            assert path[0] == start and path[-1] == goal
+            for (ax, ay), (bx, by) in zip(path, path[1:]):
+                assert max(abs(ax - bx), abs(ay - by)) == 1
+                assert self._passable(tilemap, bx, by)
+            # At least as long as the 8-connected step count
+            assert len(path) - 1 >= max(abs(goal[0] - start[0]), abs(goal[1] - start[1]))
+
+    def test_wall_grid_follows_tile_edits(self):
+        tilemap = _random_map(random.Random(0), 10, 3, 0.0)
+        pathfinder = HierarchicalPathfinder()
+        assert pathfinder._detailed_path(tilemap, (0, 1), (9, 1))
+        for y in range(3):
+            tilemap.set_tile(5, y, TileType.WALL)
+        assert pathfinder._detailed_path(tilemap, (0, 1), (9, 1)) == []
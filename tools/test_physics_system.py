@@ -0,0 +1,182 @@
+"""Tests for the ECS PhysicsSystem and the collision queries it relies on."""
+import math
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.ecs.component import Position, Collider
+from engine.ecs.entity_manager import EntityManager
+from engine.ecs.components.movement import TransformComponent
+from engine.ecs.components.physics import ColliderComponent, RigidbodyComponent
+from engine.ecs.systems.physics_system import PhysicsSystem, REST_SPEED
+from engine.physics.collision import CollisionSystem, CollisionShape, ShapeType
+from engine.world.tilemap import TileMap, TileType
+
+class TestPhysicsSystem:
+    """PhysicsSystem queries against bodies registered with the CollisionSystem."""
+
+    @pytest.fixture
+    def setup(self):
+        tilemap = TileMap(20, 20)
+        tilemap.set_tile(10, 10, TileType.WALL)
+        entity_manager = EntityManager()
+        collision_system = CollisionSystem(tilemap)
+        return entity_manager, collision_system, PhysicsSystem(entity_manager, collision_system)
+
+    def _spawn(self, entity_manager, collision_system, x, y, radius=0.5, **collider):
+        """Create a body known to both the entity manager and the collision system."""
+        entity = entity_manager.create_entity()
+        entity_manager.add_component(entity.id, TransformComponent, x=x, y=y)
+        entity_manager.add_component(entity.id, RigidbodyComponent)
+        entity_manager.add_component(entity.id, ColliderComponent,
+                                     shape=CollisionShape(ShapeType.CIRCLE, radius=radius), **collider)
+        entity.add_component(Position(x=x, y=y))
+        entity.add_component(Collider(radius=radius))
+        collision_system.register_entity(entity, (int(x), int(y)))
+        return entity
+
+    def test_check_entity_collision_matches_pairwise(self, setup):
+        entity_manager, collision_system, _ = setup
+        rng = random.Random(11)
+        entities = [self._spawn(entity_manager, collision_system,
+                                rng.uniform(0, 8), rng.uniform(0, 8), rng.uniform(0.2, 1.0))
+                    for _ in range(60)]
+
+        for entity in entities:
+            found = dict(collision_system.check_entity_collision(entity.id, 4.0, 4.0))
+            radius = entity.get_component(Collider).radius
+            for other in entities:
+                if other is entity:
+                    continue
+                pos = other.get_component(Position)
+                reach = radius + other.get_component(Collider).radius
+                distance = math.hypot(pos.x - 4.0, pos.y - 4.0)
+                assert (other.id in found) == (distance < reach)
+                if other.id in found:
+                    result = found[other.id]
+                    assert result.penetration == pytest.approx(reach - distance)
+                    # The normal points from the probed position to the other body
+                    nx, ny = result.contact_normal
+                    assert nx * (pos.x - 4.0) + ny * (pos.y - 4.0) >= 0
+
+    def test_check_entity_collision_with_box(self, setup):
+        entity_manager, collision_system, _ = setup
+        mover = self._spawn(entity_manager, collision_system, 2.0, 2.0)
+        other = self._spawn(entity_manager, collision_system, 3.8, 2.0, radius=0.5)
+        box = CollisionShape(ShapeType.BOX, width=3.0, height=1.0)
+        hits = collision_system.check_entity_collision(mover.id, 2.0, 2.0, box)
+        assert [other_id for other_id, _ in hits] == [other.id]
+        assert hits[0][1].contact_normal == (1.0, 0.0)
+        assert collision_system.check_entity_collision(mover.id, 1.0, 2.0, box) == []
+
+    def test_check_collision(self, setup):
+        entity_manager, collision_system, physics = setup
+        mover = self._spawn(entity_manager, collision_system, 2.0, 2.0)
+        other = self._spawn(entity_manager, collision_system, 3.5, 2.0)
+
+        assert physics.check_collision(mover) == (False, set())
+        assert physics.check_collision(mover, offset_x=0.7) == (True, {other})
+
+        # Walking into the wall tile is blocked without any entity involved
+        assert physics.check_collision(mover, offset_x=7.8, offset_y=8.5) == (True, set())
+
+    def test_triggers_do_not_block(self, setup):
+        entity_manager, collision_system, physics = setup
+        mover = self._spawn(entity_manager, collision_system, 2.0, 2.0)
+        solid = self._spawn(entity_manager, collision_system, 3.0, 2.0)
+        trigger = self._spawn(entity_manager, collision_system, 2.0, 3.0, is_trigger=True)
+
+        # Both overlap the probe, only the solid collider is reported
+        probe = collision_system.check_entity_collision(mover.id, 2.3, 2.3, CollisionShape(radius=0.5))
+        assert {other_id for other_id, _ in probe} == {solid.id, trigger.id}
+        assert physics.check_collision(mover, offset_x=0.3, offset_y=0.3) == (True, {solid})
+
+        # Touching only the trigger is not a collision
+        assert physics.check_collision(mover, offset_y=0.5) == (False, set())
+
+        # A collider registered without ECS components is skipped as well
+        entity_manager.remove_component(solid.id, ColliderComponent)
+        assert physics.check_collision(mover, offset_x=0.3, offset_y=0.3) == (False, set())
+
+def _reference_update(bodies, collision_system, gravity, dt):
+    """One tick of the per-body integration loop the batched update replaced."""
+    gx, gy = gravity
+    for body in bodies:
+        if body['is_kinematic']:
+            continue
+        if body['vx'] == 0 and body['vy'] == 0 and (not (gx or gy) or body['gravity_scale'] == 0):
+            continue
+        drag_factor = 1.0 - body['drag'] * dt
+        vx = (body['vx'] + gx * body['gravity_scale'] * dt) * drag_factor
+        vy = (body['vy'] + gy * body['gravity_scale'] * dt) * drag_factor
+        x = body['x'] + vx * dt
+        y = body['y'] + vy * dt
+        if not body['is_trigger']:
+            collision = collision_system.check_tile_collision(body['shape'], x, y)
+            if collision.collided:
+                normal_x, normal_y = collision.contact_normal
+                x += normal_x * collision.penetration
+                y += normal_y * collision.penetration
+                if normal_x != 0:
+                    vx = 0.0
+                if normal_y != 0:
+                    vy = 0.0
+        if abs(vx) + abs(vy) < REST_SPEED and (not (gx or gy) or body['gravity_scale'] == 0):
+            vx = vy = 0.0
+        body.update(x=x, y=y, vx=vx, vy=vy)
+
+class TestPhysicsUpdate:
+    """PhysicsSystem.update checked against integrating each body in turn."""
+
+    @pytest.mark.parametrize("gravity", [(0.0, -9.81), (0.0, 0.0)])
+    def test_matches_per_body_loop(self, gravity):
+        rng = random.Random(4)
+        tilemap = TileMap(30, 30)
+        for _ in range(60):
+            tilemap.set_tile(rng.randrange(30), rng.randrange(30), TileType.WALL)
+        entity_manager = EntityManager()
+        collision_system = CollisionSystem(tilemap)
+        physics = PhysicsSystem(entity_manager, collision_system)
+        physics.set_gravity(*gravity)
+
+        entities, bodies = [], []
+        for _ in range(200):
+            body = dict(
+                x=rng.uniform(2, 28), y=rng.uniform(2, 28),
+                vx=rng.choice([0.0, rng.uniform(-3, 3)]), vy=rng.choice([0.0, rng.uniform(-3, 3)]),
+                drag=rng.uniform(0.0, 0.5), gravity_scale=rng.choice([0.0, 1.0, 0.5]),
+                is_kinematic=rng.random() < 0.1, is_trigger=rng.random() < 0.2,
+                shape=rng.choice([CollisionShape(ShapeType.CIRCLE, radius=0.4),
+                                  CollisionShape(ShapeType.BOX, width=0.8, height=0.6)]),
+            )
+            entity = entity_manager.create_entity()
+            entity_manager.add_component(entity.id, TransformComponent, x=body['x'], y=body['y'])
+            entity_manager.add_component(entity.id, RigidbodyComponent, drag=body['drag'],
+                                         gravity_scale=body['gravity_scale'],
+                                         is_kinematic=body['is_kinematic'],
+                                         velocity_x=body['vx'], velocity_y=body['vy'])
+            entity_manager.add_component(entity.id, ColliderComponent, shape=body['shape'],
+                                         is_trigger=body['is_trigger'])
+            entities.append(entity)
+            bodies.append(body)
+        # A rigidbody without a collider is not simulated
+        loose = entity_manager.create_entity()
+        entity_manager.add_component(loose.id, TransformComponent, x=5.0, y=5.0)
+        entity_manager.add_component(loose.id, RigidbodyComponent, velocity_x=1.0)
+
+        for _ in range(30):
+            physics.update(0.05)
+            _reference_update(bodies, collision_system, gravity, 0.05)
+
+        for entity, body in zip(entities, bodies):
+            transform = entity_manager.get_component(entity.id, TransformComponent)
+            rigidbody = entity_manager.get_component(entity.id, RigidbodyComponent)
+            assert transform.x == pytest.approx(body['x'], abs=1e-9)
+            assert transform.y == pytest.approx(body['y'], abs=1e-9)
+            assert rigidbody.velocity_x == pytest.approx(body['vx'], abs=1e-9)
+            assert rigidbody.velocity_y == pytest.approx(body['vy'], abs=1e-9)
+        assert entity_manager.get_component(loose.id, TransformComponent).x == 5.0
@@ -0,0 +1,79 @@
+"""Tests for the PositionIndex radius queries behind AI target detection."""
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.ecs.component import Position
+from engine.ecs.position_index import PositionIndex
+
+class TestPositionIndex:
+    """PositionIndex.query_radius checked against a scan of every entity."""
+
+    @pytest.fixture
+    def setup(self):
+        """Index a few hundred entities spread over several grid cells."""
+        rng = np.random.default_rng(7)
+        index = PositionIndex(capacity=4, cell_size=4.0)
+        positions = {}
+        for entity_id in range(300):
+            position = Position(x=float(rng.uniform(-40, 40)), y=float(rng.uniform(-40, 40)))
+            index.insert(entity_id, position)
+            positions[entity_id] = position
+        return rng, index, positions
+
+    def _nearest(self, positions, x, y, radius, exclude_id=None):
+        """Brute-force nearest entity within radius, as (id, distance) or None."""
+        best = None
+        for entity_id, position in positions.items():
+            if entity_id == exclude_id:
+                continue
+            # Same float32 rounding as the index
+            dx = float(np.float32(position.x)) - x
+            dy = float(np.float32(position.y)) - y
+            distance = math.hypot(dx, dy)
+            if distance <= radius and (best is None or distance < best[1]):
+                best = (entity_id, distance)
+        return best
+
+    def _check_queries(self, rng, index, positions):
+        for _ in range(200):
+            x, y = (float(v) for v in rng.uniform(-45, 45, size=2))
+            radius = float(rng.choice([0.5, 3.0, 9.0, 30.0]))
+            exclude_id = int(rng.integers(0, 300)) if rng.random() < 0.5 else None
+
+            expected = self._nearest(positions, x, y, radius, exclude_id)
+            found = index.query_radius(x, y, radius, exclude_id=exclude_id)
+            if expected is None:
+                assert found is None
+            else:
+                assert found is not None
+                assert found[1] == pytest.approx(expected[1], abs=1e-4)
+
+    def test_query_radius_matches_brute_force(self, setup):
+        rng, index, positions = setup
+        self._check_queries(rng, index, positions)
+
+    def test_query_radius_after_moves_and_removals(self, setup):
+        rng, index, positions = setup
+        for entity_id in rng.choice(300, size=100, replace=False).tolist():
+            index.remove(entity_id)
+            del positions[entity_id]
+        for entity_id in list(positions)[::3]:
+            x, y = (float(v) for v in rng.uniform(-40, 40, size=2))
+            positions[entity_id].x = x
+            positions[entity_id].y = y
+            index.update(entity_id, x, y)
+        assert len(index) == len(positions)
+        self._check_queries(rng, index, positions)
+
+    def test_refresh_rereads_components(self, setup):
+        rng, index, positions = setup
+        for position in positions.values():
+            position.x += 10.0
+        index.refresh()
+        self._check_queries(rng, index, positions)
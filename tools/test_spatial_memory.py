@@ -0,0 +1,238 @@
+"""Tests for the array-backed SpatialMemory tables."""
+import os
+import random
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.ai import spatial_memory
+from engine.ai.spatial_memory import MemoryRecord, SpatialMemory
+
+class _Clock:
+    """Stand-in for time.time that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class _ReferenceMemory:
+    """The dict-of-records SpatialMemory the tables replaced, on an explicit clock."""
+
+    def __init__(self, clock, decay_rate, memory_limit):
+        self.clock = clock
+        self.decay_rate = decay_rate
+        self.memory_limit = memory_limit
+        self.memories = {}
+        self.points_of_interest = {}
+
+    def _record(self, position, entity_id, importance):
+        return MemoryRecord(position=position, entity_id=entity_id, timestamp=self.clock(),
+                            importance=importance, certainty=1.0)
+
+    def update_entity_memory(self, observer_id, target_id, position, importance=1.0):
+        memories = self.memories.setdefault(observer_id, {})
+        memories[target_id] = self._record(position, target_id, importance)
+        if len(memories) > self.memory_limit:
+            ranked = sorted(memories.items(), key=lambda item: item[1].importance * item[1].certainty)
+            for target_id, _ in ranked[:len(ranked) - self.memory_limit]:
+                del memories[target_id]
+
+    def add_point_of_interest(self, observer_id, poi_name, position, importance=1.0):
+        self.points_of_interest.setdefault(observer_id, {})[poi_name] = \
+            self._record(position, None, importance)
+
+    def get_recent_memories(self, observer_id, max_age=float('inf'), min_certainty=0.0):
+        now = self.clock()
+        result = []
+        for record in self.memories.get(observer_id, {}).values():
+            record.update_certainty(self.decay_rate, now)
+            if record.age(now) <= max_age and record.certainty >= min_certainty:
+                result.append(record)
+        return sorted(result, key=lambda record: record.importance * record.certainty, reverse=True)
+
+    def get_nearest_poi(self, observer_id, position, min_certainty=0.0):
+        now = self.clock()
+        nearest, best = None, float('inf')
+        for name, record in self.points_of_interest.get(observer_id, {}).items():
+            record.update_certainty(self.decay_rate, now)
+            if record.certainty < min_certainty:
+                continue
+            d2 = (position[0] - record.position[0]) ** 2 + (position[1] - record.position[1]) ** 2
+            if d2 < best:
+                nearest, best = (name, record), d2
+        return nearest
+
+    def forget_entity(self, observer_id, target_id):
+        self.memories.get(observer_id, {}).pop(target_id, None)
+
+    def forget_old_memories(self, max_age):
+        now = self.clock()
+        for observer_id, memories in self.memories.items():
+            self.memories[observer_id] = {target_id: record for target_id, record in memories.items()
+                                          if record.age(now) <= max_age}
+
+    def clear_entity_memory(self, observer_id):
+        self.memories.pop(observer_id, None)
+        self.points_of_interest.pop(observer_id, None)
+
+def _assert_records_equal(got, want):
+    assert got.entity_id == want.entity_id
+    assert got.position == want.position
+    assert got.timestamp == want.timestamp
+    assert got.importance == want.importance
+    assert got.certainty == pytest.approx(want.certainty, abs=1e-12)
+
+def _assert_recent_equal(got, want):
+    # Records with equal scores may come back in either order
+    assert [r.entity_id for r in sorted(got, key=lambda r: r.entity_id)] == \
+        [r.entity_id for r in sorted(want, key=lambda r: r.entity_id)]
+    scores = [r.importance * r.certainty for r in got]
+    assert scores == sorted(scores, reverse=True)
+    by_id = {record.entity_id: record for record in want}
+    for record in got:
+        _assert_records_equal(record, by_id[record.entity_id])
+
+def _assert_tables_consistent(memory):
+    for table in list(memory.memories.values()) + list(memory.points_of_interest.values()):
+        assert table.count == len(table.keys) == len(table.row_of)
+        assert all(table.keys[row] == key for key, row in table.row_of.items())
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(spatial_memory, "time", SimpleNamespace(time=clock))
+    return clock
+
+class TestSpatialMemoryTables:
+    """SpatialMemory checked against the dict-of-records implementation."""
+
+    def _position(self, rng):
+        return (rng.uniform(0, 100), rng.uniform(0, 100))
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_matches_reference(self, clock, seed):
+        rng = random.Random(seed)
+        memory = SpatialMemory(decay_rate=0.02, memory_limit=1000)
+        reference = _ReferenceMemory(clock, decay_rate=0.02, memory_limit=1000)
+        observers = range(4)
+
+        for _ in range(2000):
+            clock.now += rng.uniform(0.0, 0.5)
+            observer = rng.choice(observers)
+            roll = rng.random()
+            if roll < 0.4:
+                args = (observer, rng.randrange(60), self._position(rng), rng.uniform(0.1, 5.0))
+                memory.update_entity_memory(*args)
+                reference.update_entity_memory(*args)
+            elif roll < 0.55:
+                args = (observer, f"poi{rng.randrange(15)}", self._position(rng), rng.uniform(0.1, 5.0))
+                memory.add_point_of_interest(*args)
+                reference.add_point_of_interest(*args)
+            elif roll < 0.7:
+                target_id = rng.randrange(60)
+                memory.forget_entity(observer, target_id)
+                reference.forget_entity(observer, target_id)
+            elif roll < 0.85:
+                args = (observer, rng.choice([float('inf'), rng.uniform(0, 60)]), rng.uniform(0.0, 0.8))
+                _assert_recent_equal(memory.get_recent_memories(*args),
+                                     reference.get_recent_memories(*args))
+            elif roll < 0.99:
+                args = (observer, self._position(rng), rng.uniform(0.0, 0.8))
+                got = memory.get_nearest_poi(*args)
+                want = reference.get_nearest_poi(*args)
+                assert (got is None) == (want is None)
+                if got is not None:
+                    assert got[0] == want[0]
+                    _assert_records_equal(got[1], want[1])
+            else:
+                memory.clear_entity_memory(observer)
+                reference.clear_entity_memory(observer)
+        _assert_tables_consistent(memory)
+
+    def test_tables_grow_past_initial_capacity(self, clock):
+        memory = SpatialMemory(memory_limit=1000)
+        for target_id in range(100):
+            memory.update_entity_memory(0, target_id, (float(target_id), 0.0), importance=target_id)
+        recent = memory.get_recent_memories(0)
+        assert [record.entity_id for record in recent] == list(range(99, -1, -1))
+        assert recent[-1].position == (0.0, 0.0)
+        assert memory.get_recent_memories(1) == []
+        assert memory.get_nearest_poi(0, (0.0, 0.0)) is None
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_forget_old_memories_matches_reference(self, clock, seed):
+        rng = random.Random(seed)
+        memory = SpatialMemory(decay_rate=0.02, memory_limit=1000)
+        reference = _ReferenceMemory(clock, decay_rate=0.02, memory_limit=1000)
+
+        for step in range(1500):
+            clock.now += rng.uniform(0.0, 0.3)
+            observer = rng.randrange(3)
+            args = (observer, rng.randrange(80), self._position(rng), rng.uniform(0.1, 5.0))
+            memory.update_entity_memory(*args)
+            reference.update_entity_memory(*args)
+            if step % 50 == 49:
+                max_age = rng.uniform(0.0, 20.0)
+                memory.forget_old_memories(max_age)
+                reference.forget_old_memories(max_age)
+                _assert_tables_consistent(memory)
+                for observer in range(3):
+                    _assert_recent_equal(memory.get_recent_memories(observer),
+                                         reference.get_recent_memories(observer))
+
+    def test_forget_old_memories_keeps_row_order(self, clock):
+        memory = SpatialMemory(memory_limit=1000)
+        for target_id in range(10):
+            clock.now += 1.0
+            memory.update_entity_memory(0, target_id, (0.0, 0.0))
+        # Refresh every other memory, then drop the rest
+        clock.now += 1.0
+        for target_id in range(0, 10, 2):
+            memory.update_entity_memory(0, target_id, (1.0, 1.0))
+        memory.forget_old_memories(0.0)
+        table = memory.memories[0]
+        assert table.keys == [0, 2, 4, 6, 8]
+        assert list(table.xs[:table.count]) == [1.0] * 5
+        _assert_tables_consistent(memory)
+
+        # Nothing stale: the table is left as is
+        memory.forget_old_memories(10.0)
+        assert table.keys == [0, 2, 4, 6, 8]
+        memory.update_entity_memory(0, 99, (2.0, 2.0))
+        assert table.keys[-1] == 99 and table.row_of[99] == 5
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_memory_limit_evicts_like_reference(self, clock, seed):
+        rng = random.Random(seed)
+        memory = SpatialMemory(decay_rate=0.02, memory_limit=12)
+        reference = _ReferenceMemory(clock, decay_rate=0.02, memory_limit=12)
+
+        for step in range(1500):
+            clock.now += rng.uniform(0.0, 0.5)
+            args = (0, rng.randrange(40), self._position(rng), rng.uniform(0.1, 5.0))
+            memory.update_entity_memory(*args)
+            reference.update_entity_memory(*args)
+            assert set(memory.memories[0].keys) == set(reference.memories[0])
+            if step % 10 == 0:
+                # Decayed certainties feed into the next eviction's scores
+                _assert_recent_equal(memory.get_recent_memories(0),
+                                     reference.get_recent_memories(0))
+            if step % 300 == 299:
+                # Shrinking the limit overflows by more than one on the next insert
+                limit = rng.randrange(2, 12)
+                memory.memory_limit = reference.memory_limit = limit
+        _assert_tables_consistent(memory)
+
+    def test_single_overflow_drops_lowest_score(self, clock):
+        memory = SpatialMemory(memory_limit=3)
+        for target_id, importance in [(1, 2.0), (2, 0.5), (3, 3.0), (4, 1.0)]:
+            memory.update_entity_memory(0, target_id, (0.0, 0.0), importance)
+        assert sorted(memory.memories[0].keys) == [1, 3, 4]
+        memory.update_entity_memory(0, 5, (0.0, 0.0), 0.1)
+        assert sorted(memory.memories[0].keys) == [1, 3, 4]
+        _assert_tables_consistent(memory)
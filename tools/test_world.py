@@ -0,0 +1,129 @@
+"""Tests for World component queries."""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.ecs.component import Position, Physical, Health, Collider, Velocity
+from engine.ecs.world import World
+
+COMPONENT_TYPES = [Position, Physical, Health, Collider, Velocity]
+
+def _expected(world, component_types):
+    """Ids of the entities holding every type, by scanning the entities."""
+    return {entity_id for entity_id, entity in world.entities.items()
+            if all(entity.has_component(t) for t in component_types)}
+
+def _queried(world, component_types):
+    return {entity.id for entity in world.get_entities_with_components(*component_types)}
+
+class TestWorldQueries:
+    """World.get_entities_with_components checked against a scan of all entities."""
+
+    @pytest.fixture
+    def world(self):
+        return World()
+
+    def _check_all_queries(self, world):
+        for size in (1, 2, 3):
+            for component_types in random.Random(size).sample(
+                    [(a, b, c)[:size] for a in COMPONENT_TYPES for b in COMPONENT_TYPES
+                     for c in COMPONENT_TYPES if len({a, b, c}) == 3], 12):
+                assert _queried(world, component_types) == _expected(world, component_types)
+
+    def test_matches_scan(self, world):
+        rng = random.Random(1)
+        ids = [world.create_entity().id for _ in range(200)]
+        for entity_id in ids:
+            for component_type in COMPONENT_TYPES:
+                if rng.random() < 0.5:
+                    world.add_component(entity_id, component_type())
+        for entity_id in rng.sample(ids, 50):
+            world.remove_component(entity_id, rng.choice(COMPONENT_TYPES))
+        self._check_all_queries(world)
+
+    def test_unknown_type_and_empty_query(self, world):
+        entity = world.create_entity()
+        world.add_component(entity.id, Position())
+        assert world.get_entities_with_components(Health) == []
+        assert world.get_entities_with_components() == [entity]
+
+    def test_readding_a_component_keeps_membership(self, world):
+        entity = world.create_entity()
+        world.add_component(entity.id, Position())
+        world.add_component(entity.id, Position(x=2.0))
+        world.remove_component(entity.id, Position)
+        world.remove_component(entity.id, Position)
+        assert world.get_entities_with_components(Position) == []
+        world.add_component(entity.id, Position())
+        assert world.get_entities_with_components(Position) == [entity]
+
+    def test_cached_result_is_reused_until_membership_changes(self, world):
+        a, b = world.create_entity(), world.create_entity()
+        for entity in (a, b):
+            world.add_component(entity.id, Position())
+            world.add_component(entity.id, Health())
+        first = world.get_entities_with_components(Position, Health)
+        assert world.get_entities_with_components(Position, Health) is first
+
+        # Unrelated types and value changes leave the cached list alone
+        world.add_component(a.id, Velocity())
+        a.get_component(Position).x = 5.0
+        assert world.get_entities_with_components(Position, Health) is first
+
+        world.remove_component(b.id, Health)
+        assert _queried(world, (Position, Health)) == {a.id}
+        world.remove_entity(a.id)
+        assert world.get_entities_with_components(Position, Health) == []
+        c = world.create_entity()
+        world.add_component(c.id, Health())
+        world.add_component(c.id, Position())
+        assert _queried(world, (Position, Health)) == {c.id}
+
+    def test_result_does_not_depend_on_type_order(self, world):
+        rng = random.Random(2)
+        for _ in range(100):
+            entity = world.create_entity()
+            # Position is common, Collider rare, so the order matters for the intersection
+            if rng.random() < 0.9:
+                world.add_component(entity.id, Position())
+            if rng.random() < 0.5:
+                world.add_component(entity.id, Health())
+            if rng.random() < 0.05:
+                world.add_component(entity.id, Collider())
+        expected = _expected(world, (Position, Health, Collider))
+        for order in [(Position, Health, Collider), (Collider, Health, Position),
+                      (Health, Position, Collider)]:
+            assert _queried(world, order) == expected
+        # Velocity and Collider never meet, so the intersection empties early
+        lone = world.create_entity()
+        world.add_component(lone.id, Velocity())
+        world.add_component(lone.id, Position())
+        assert _queried(world, (Collider, Velocity, Position)) == set()
+
+    def test_churn_recycles_rows(self, world):
+        rng = random.Random(3)
+        live = []
+        peak = 0
+        for step in range(3000):
+            roll = rng.random()
+            if roll < 0.35 or not live:
+                live.append(world.create_entity().id)
+            elif roll < 0.6:
+                world.remove_entity(live.pop(rng.randrange(len(live))))
+            elif roll < 0.85:
+                world.add_component(rng.choice(live), rng.choice(COMPONENT_TYPES)())
+            else:
+                world.remove_component(rng.choice(live), rng.choice(COMPONENT_TYPES))
+            peak = max(peak, len(live))
+            if step % 100 == 0:
+                self._check_all_queries(world)
+        self._check_all_queries(world)
+
+        # Ids keep growing, but rows, and so the bitsets, only cover the peak population
+        assert max(world.entities) > peak
+        assert world._next_row == peak
+        assert sorted(world._entity_rows.values()) == sorted(set(world._entity_rows.values()))